@@ -3,4 +3,9 @@ from taskflow import create_app
 app = create_app()
 
 if __name__ == "__main__":
+    # 👇 en local, migrations appliquées au lancement (en prod : flask --app app db upgrade)
+    from flask_migrate import upgrade
+
+    with app.app_context():
+        upgrade()
     app.run(debug=True)
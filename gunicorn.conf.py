@@ -0,0 +1,43 @@
+# gunicorn.conf.py — lu automatiquement par "gunicorn app:app"
+import time
+
+# 🔥 create_app() une seule fois dans le master, puis fork des workers
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Les connexions éventuellement ouvertes par le master ne doivent pas être partagées
+    from taskflow import db
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+    worker.forked_at = time.perf_counter()
+    worker.first_request_logged = False
+
+
+def post_worker_init(worker):
+    # 🔥 Pool pré-chauffé : le 1er utilisateur du worker ne paie pas la connexion à Neon
+    from taskflow import db
+    from taskflow.pool import prewarm
+
+    app = worker.wsgi
+    with app.app_context():
+        opened = prewarm(db.engine, app.config.get("DB_POOL_PREWARM", 0))
+    worker.log.info(
+        "worker prêt en %.0f ms (pool pré-chauffé : %s connexion(s))",
+        (time.perf_counter() - worker.forked_at) * 1000, opened,
+    )
+
+
+def pre_request(worker, req):
+    worker.request_started = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    # 1re requête d'un worker : caches froids (Jinja, pool, snapshot user…)
+    if not worker.first_request_logged:
+        worker.first_request_logged = True
+        worker.log.info(
+            "1re requête du worker : %.0f ms (%s %s)",
+            (time.perf_counter() - worker.request_started) * 1000, req.method, req.path,
+        )
@@ -0,0 +1,75 @@
+"""initial schema (user, project, task)
+
+Revision ID: 1af9fa92384b
+Revises: 
+Create Date: 2026-10-18 17:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1af9fa92384b'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les bases existantes (Neon, taskflow.db) ont été créées par db.create_all() :
+    # on ne crée que les tables manquantes.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('name', sa.String(length=80), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('user_type', sa.String(length=20), nullable=False),
+            sa.Column('onboarding_done', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+        )
+
+    if 'project' not in existing:
+        op.create_table(
+            'project',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=150), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('owner_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['owner_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    if 'task' not in existing:
+        op.create_table(
+            'task',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('priority', sa.String(length=10), nullable=True),
+            sa.Column('task_type', sa.String(length=20), nullable=True),
+            sa.Column('platform', sa.String(length=20), nullable=True),
+            sa.Column('creator_stage', sa.String(length=20), nullable=True),
+            sa.Column('assigned_to', sa.Integer(), nullable=True),
+            sa.Column('due_date', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['assigned_to'], ['user.id']),
+            sa.ForeignKeyConstraint(['project_id'], ['project.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    op.drop_table('task')
+    op.drop_table('project')
+    op.drop_table('user')
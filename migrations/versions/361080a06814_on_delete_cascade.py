@@ -0,0 +1,95 @@
+"""ON DELETE CASCADE on user / project foreign keys
+
+Revision ID: 361080a06814
+Revises: 9ccb2be2a73e
+Create Date: 2026-10-18 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '361080a06814'
+down_revision = '9ccb2be2a73e'
+branch_labels = None
+depends_on = None
+
+
+# (table, colonne, table référencée, ON DELETE)
+FOREIGN_KEYS = [
+    ('project', 'owner_id', 'user', 'CASCADE'),
+    ('task', 'project_id', 'project', 'CASCADE'),
+    ('task', 'owner_id', 'user', 'CASCADE'),
+    ('task', 'assigned_to', 'user', 'SET NULL'),
+    ('user_daily_stats', 'user_id', 'user', 'CASCADE'),
+    ('task_event', 'owner_id', 'user', 'CASCADE'),
+]
+
+# Tables FTS5 de d157c9cffc97 : leurs triggers disparaissent quand SQLite recrée la table
+FTS_TABLES = {
+    'task': ('title', 'description'),
+    'project': ('name', 'description'),
+}
+
+
+def _recreate_fts_triggers(bind, table):
+    a, b = FTS_TABLES[table]
+    fts = f"{table}_fts"
+    if not sa.inspect(bind).has_table(fts):
+        return
+    op.execute(f"DROP TRIGGER IF EXISTS {fts}_ai")
+    op.execute(f"DROP TRIGGER IF EXISTS {fts}_ad")
+    op.execute(f"DROP TRIGGER IF EXISTS {fts}_au")
+    op.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {a}, {b}) "
+        f"VALUES ('delete', old.id, old.{a}, old.{b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {a}, {b} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {a}, {b}) "
+        f"VALUES ('delete', old.id, old.{a}, old.{b}); "
+        f"INSERT INTO {fts}(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+    )
+
+
+def _set_ondelete(cascade: bool):
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        # SQLite ne sait pas modifier une FK : table recréée à partir de son reflet
+        meta = sa.MetaData()
+        for table in dict.fromkeys(t for t, _, _, _ in FOREIGN_KEYS):
+            reflected = sa.Table(table, meta, autoload_with=bind)
+            for fk in reflected.foreign_key_constraints:
+                for t, column, _, ondelete in FOREIGN_KEYS:
+                    if t == table and fk.column_keys == [column]:
+                        fk.ondelete = ondelete if cascade else None
+            with op.batch_alter_table(table, copy_from=reflected, recreate='always'):
+                pass
+            if table in FTS_TABLES:
+                _recreate_fts_triggers(bind, table)
+        return
+
+    insp = sa.inspect(bind)
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        for fk in insp.get_foreign_keys(table):
+            if fk['constrained_columns'] == [column]:
+                op.drop_constraint(fk['name'], table, type_='foreignkey')
+        op.create_foreign_key(
+            f"{table}_{column}_fkey", table, referent, [column], ['id'],
+            ondelete=ondelete if cascade else None,
+        )
+
+
+def upgrade():
+    _set_ondelete(cascade=True)
+
+
+def downgrade():
+    _set_ondelete(cascade=False)
@@ -0,0 +1,38 @@
+"""composite indexes for hot task / project queries
+
+Revision ID: 3ffbeffb5656
+Revises: 1af9fa92384b
+Create Date: 2026-10-18 17:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3ffbeffb5656'
+down_revision = '1af9fa92384b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Projets d'un user, triés par date (dashboard, selects, calendrier)
+    op.create_index('ix_project_owner_created', 'project', ['owner_id', 'created_at'], if_not_exists=True)
+
+    # Kanban / aujourd'hui / calendrier : statut + échéance
+    op.create_index('ix_task_project_status_due', 'task', ['project_id', 'status', 'due_date'], if_not_exists=True)
+    # Dashboard créateur / pipeline : type + étape
+    op.create_index('ix_task_project_type_stage', 'task', ['project_id', 'task_type', 'creator_stage'], if_not_exists=True)
+    # Analytics : tâches terminées par date
+    op.create_index('ix_task_project_status_updated', 'task', ['project_id', 'status', 'updated_at'], if_not_exists=True)
+    # Recherche par échéance tous projets confondus
+    op.create_index('ix_task_due_date', 'task', ['due_date'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_task_due_date', table_name='task')
+    op.drop_index('ix_task_project_status_updated', table_name='task')
+    op.drop_index('ix_task_project_type_stage', table_name='task')
+    op.drop_index('ix_task_project_status_due', table_name='task')
+    op.drop_index('ix_project_owner_created', table_name='project')
@@ -0,0 +1,56 @@
+"""denormalized task.owner_id + per-owner indexes
+
+Revision ID: 4d78e3146141
+Revises: 3ffbeffb5656
+Create Date: 2026-10-18 17:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d78e3146141'
+down_revision = '3ffbeffb5656'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.add_column(sa.Column('owner_id', sa.Integer(), nullable=True))
+
+    # Backfill : owner_id = propriétaire du projet
+    op.execute(
+        'UPDATE task SET owner_id = '
+        '(SELECT project.owner_id FROM project WHERE project.id = task.project_id)'
+    )
+
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.alter_column('owner_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('task_owner_id_fkey', 'user', ['owner_id'], ['id'])
+
+    # Les index par projet sont remplacés par des index par propriétaire
+    op.drop_index('ix_task_project_type_stage', table_name='task', if_exists=True)
+    op.drop_index('ix_task_project_status_updated', table_name='task', if_exists=True)
+    op.drop_index('ix_task_due_date', table_name='task', if_exists=True)
+
+    op.create_index('ix_task_owner_status_due', 'task', ['owner_id', 'status', 'due_date'], if_not_exists=True)
+    op.create_index('ix_task_owner_type_stage', 'task', ['owner_id', 'task_type', 'creator_stage'], if_not_exists=True)
+    op.create_index('ix_task_owner_status_updated', 'task', ['owner_id', 'status', 'updated_at'], if_not_exists=True)
+    op.create_index('ix_task_owner_due', 'task', ['owner_id', 'due_date'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_task_owner_due', table_name='task')
+    op.drop_index('ix_task_owner_status_updated', table_name='task')
+    op.drop_index('ix_task_owner_type_stage', table_name='task')
+    op.drop_index('ix_task_owner_status_due', table_name='task')
+
+    op.create_index('ix_task_due_date', 'task', ['due_date'])
+    op.create_index('ix_task_project_status_updated', 'task', ['project_id', 'status', 'updated_at'])
+    op.create_index('ix_task_project_type_stage', 'task', ['project_id', 'task_type', 'creator_stage'])
+
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.drop_constraint('task_owner_id_fkey', type_='foreignkey')
+        batch_op.drop_column('owner_id')
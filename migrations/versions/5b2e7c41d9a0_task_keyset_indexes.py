@@ -0,0 +1,88 @@
+"""keyset indexes ending in (created_at, id) + task.created_at NOT NULL
+
+Revision ID: 5b2e7c41d9a0
+Revises: 93124b98cb0f
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e7c41d9a0'
+down_revision = '93124b98cb0f'
+branch_labels = None
+depends_on = None
+
+
+# Tables FTS5 de d157c9cffc97 : leurs triggers disparaissent quand SQLite recrée la table
+FTS_COLUMNS = ('title', 'description')
+
+
+def _recreate_fts_triggers(bind):
+    a, b = FTS_COLUMNS
+    if not sa.inspect(bind).has_table('task_fts'):
+        return
+    op.execute("DROP TRIGGER IF EXISTS task_fts_ai")
+    op.execute("DROP TRIGGER IF EXISTS task_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS task_fts_au")
+    op.execute(
+        f"CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN "
+        f"INSERT INTO task_fts(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN "
+        f"INSERT INTO task_fts(task_fts, rowid, {a}, {b}) "
+        f"VALUES ('delete', old.id, old.{a}, old.{b}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER task_fts_au AFTER UPDATE OF {a}, {b} ON task BEGIN "
+        f"INSERT INTO task_fts(task_fts, rowid, {a}, {b}) "
+        f"VALUES ('delete', old.id, old.{a}, old.{b}); "
+        f"INSERT INTO task_fts(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+    )
+
+
+def _set_created_at_nullable(nullable: bool):
+    bind = op.get_bind()
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=nullable)
+    if bind.dialect.name == 'sqlite':
+        _recreate_fts_triggers(bind)
+
+
+def upgrade():
+    # Clé de pagination (created_at, id) : un NULL sortirait silencieusement de
+    # toutes les pages (tuple < tuple est NULL) → date connue la plus proche
+    op.execute(
+        "UPDATE task SET created_at = coalesce(updated_at, completed_at, CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    )
+    _set_created_at_nullable(False)
+
+    # Listes paginées : l'index fournit l'ordre (created_at, id), plus de tri du lot filtré
+    # pipeline / boîte à idées (remplace ix_task_owner_type_stage, son préfixe)
+    op.drop_index('ix_task_owner_type_stage', table_name='task')
+    op.create_index(
+        'ix_task_owner_type_stage_created', 'task',
+        ['owner_id', 'task_type', 'creator_stage', 'created_at', 'id'],
+    )
+    # contenus sans date (due_date IS NULL)
+    op.create_index(
+        'ix_task_owner_type_due_created', 'task',
+        ['owner_id', 'task_type', 'due_date', 'created_at', 'id'],
+    )
+    # colonnes du Kanban projet
+    op.create_index(
+        'ix_task_project_status_created', 'task',
+        ['project_id', 'status', 'created_at', 'id'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_task_project_status_created', table_name='task')
+    op.drop_index('ix_task_owner_type_due_created', table_name='task')
+    op.drop_index('ix_task_owner_type_stage_created', table_name='task')
+    op.create_index('ix_task_owner_type_stage', 'task', ['owner_id', 'task_type', 'creator_stage'])
+    _set_created_at_nullable(True)
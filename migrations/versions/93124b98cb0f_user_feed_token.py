@@ -0,0 +1,28 @@
+"""user.feed_token for calendar (.ics) subscriptions
+
+Revision ID: 93124b98cb0f
+Revises: 361080a06814
+Create Date: 2026-10-18 21:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '93124b98cb0f'
+down_revision = '361080a06814'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('feed_token', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_user_feed_token'), ['feed_token'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_feed_token'))
+        batch_op.drop_column('feed_token')
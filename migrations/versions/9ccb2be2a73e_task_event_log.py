@@ -0,0 +1,44 @@
+"""append-only task_event log
+
+Revision ID: 9ccb2be2a73e
+Revises: bdab483f8c79
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9ccb2be2a73e'
+down_revision = 'bdab483f8c79'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_event',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('from_status', sa.String(length=20), nullable=True),
+        sa.Column('to_status', sa.String(length=20), nullable=True),
+        sa.Column('at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_event_owner_at', 'task_event', ['owner_id', 'at'])
+
+    # Historique : un passage en "done" par tâche déjà terminée
+    op.execute(
+        "INSERT INTO task_event (task_id, owner_id, kind, from_status, to_status, at) "
+        "SELECT id, owner_id, 'status', NULL, 'done', completed_at "
+        "FROM task WHERE status = 'done' AND completed_at IS NOT NULL"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_task_event_owner_at', table_name='task_event')
+    op.drop_table('task_event')
@@ -0,0 +1,54 @@
+"""user_daily_stats rollup + task.completed_at
+
+Revision ID: bdab483f8c79
+Revises: d157c9cffc97
+Create Date: 2026-10-18 18:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bdab483f8c79'
+down_revision = 'd157c9cffc97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ADD COLUMN simple (pas de batch : les triggers FTS5 de task restent en place)
+    op.add_column('task', sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'user_daily_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('done_general', sa.Integer(), nullable=False),
+        sa.Column('done_content', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+
+    # Backfill : updated_at faisait office de date de fin jusqu'ici
+    op.execute("UPDATE task SET completed_at = updated_at WHERE status = 'done'")
+
+    if op.get_bind().dialect.name == 'sqlite':
+        day = "date(completed_at)"
+    else:
+        day = "CAST(completed_at AS DATE)"
+
+    op.execute(
+        "INSERT INTO user_daily_stats (user_id, day, done_general, done_content) "
+        f"SELECT owner_id, {day}, "
+        "SUM(CASE WHEN task_type = 'content' THEN 0 ELSE 1 END), "
+        "SUM(CASE WHEN task_type = 'content' THEN 1 ELSE 0 END) "
+        "FROM task WHERE status = 'done' AND completed_at IS NOT NULL "
+        f"GROUP BY owner_id, {day}"
+    )
+
+
+def downgrade():
+    op.drop_table('user_daily_stats')
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.drop_column('completed_at')
@@ -0,0 +1,91 @@
+"""full-text search: tsvector + GIN on Postgres, FTS5 on SQLite
+
+Revision ID: d157c9cffc97
+Revises: 4d78e3146141
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd157c9cffc97'
+down_revision = '4d78e3146141'
+branch_labels = None
+depends_on = None
+
+
+# table → (colonne poids A, colonne poids B)
+FTS_TABLES = {
+    'task': ('title', 'description'),
+    'project': ('name', 'description'),
+}
+
+
+def _sqlite_has_fts5(bind):
+    try:
+        bind.exec_driver_sql("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        bind.exec_driver_sql("DROP TABLE temp._fts5_probe")
+        return True
+    except sa.exc.OperationalError:
+        return False
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        for table, (a, b) in FTS_TABLES.items():
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('simple', coalesce({a}, '')), 'A') || "
+                f"setweight(to_tsvector('simple', coalesce({b}, '')), 'B')"
+                f") STORED"
+            )
+            op.execute(
+                f"CREATE INDEX ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+            )
+
+    elif bind.dialect.name == 'sqlite' and _sqlite_has_fts5(bind):
+        # Tables FTS5 "external content" synchronisées par triggers
+        for table, (a, b) in FTS_TABLES.items():
+            fts = f"{table}_fts"
+            op.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                f"{a}, {b}, content='{table}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {a}, {b}) "
+                f"VALUES ('delete', old.id, old.{a}, old.{b}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {a}, {b} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {a}, {b}) "
+                f"VALUES ('delete', old.id, old.{a}, old.{b}); "
+                f"INSERT INTO {fts}(rowid, {a}, {b}) VALUES (new.id, new.{a}, new.{b}); END"
+            )
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        for table in FTS_TABLES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+    elif bind.dialect.name == 'sqlite':
+        for table in FTS_TABLES:
+            fts = f"{table}_fts"
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -1,10 +1,22 @@
 # taskflow/__init__.py
+import os
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from flask_migrate import Migrate
 from .config import Config
+from .cache import view_cache
+from .assets import assets
+from .compression import compress
+from .templating import configure_templates
+from .pool import engine_options, instrument, statement_timeout
+from .profiling import sql_profiler
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
 
 db = SQLAlchemy()
+migrate = Migrate(directory=MIGRATIONS_DIR, render_as_batch=True)
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"  # 👈 où rediriger si non connecté
 
@@ -13,21 +25,48 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # 👇 pool de connexions selon le profil (Neon, PgBouncer, Postgres dédié)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"],
+        app.config.get("DB_POOL_PROFILE"),
+    ))
+
     db.init_app(app)
+    migrate.init_app(app, db)
     login_manager.init_app(app)
+    view_cache.init_app(app)
+    sql_profiler.init_app(app)
+    assets.init_app(app)
+    compress.init_app(app)
 
-    # 👇 force le chargement des modèles (pour user_loader)
+    # 👇 force le chargement des modèles + du user_loader
     from .models import User, Project, Task  # noqa: F401
+    from . import users  # noqa: F401
 
     # 👇 importe les blueprints
     from .routes import main_bp
     from .auth import auth_bp
+    from .metrics import metrics_bp
 
     # 👇 enregistre les blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(metrics_bp)
+
+    # 👇 cache de bytecode Jinja + précompilation (avant le fork avec --preload)
+    configure_templates(app)
+
+    # 👇 commandes CLI (flask check-indexes, …)
+    from .cli import register_commands
+    register_commands(app)
 
+    # 👇 aucune requête SQL ici : l'app peut être chargée une fois (gunicorn --preload)
+    # puis forkée. Le schéma se met à jour à part : flask --app app db upgrade
     with app.app_context():
-        db.create_all()
+        instrument(db.engine, statement_timeout(
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            app.config.get("DB_POOL_PROFILE"),
+            app.config.get("DB_STATEMENT_TIMEOUT_MS"),
+        ))
 
     return app
@@ -0,0 +1,75 @@
+# taskflow/agenda.py
+from datetime import datetime, date, timedelta
+
+from .models import Task
+from .readmodels import card_query
+
+# Grille mensuelle classique : 6 semaines de 7 jours
+MONTH_GRID_DAYS = 42
+# Fenêtre max acceptée par l'API JSON (évite de recharger tout l'historique)
+MAX_RANGE_DAYS = 62
+
+
+def week_window(week_start: date):
+    """Fenêtre [lundi, lundi + 7j[ de la vue semaine."""
+    return week_start, week_start + timedelta(days=7)
+
+
+def month_window(year: int, month: int):
+    """Fenêtre de la grille mois : du lundi de la semaine du 1er, sur 6 semaines."""
+    first_day = date(year, month, 1)
+    start = first_day - timedelta(days=first_day.weekday())
+    return start, start + timedelta(days=MONTH_GRID_DAYS)
+
+
+def window_tasks_query(user_id: int, start: date, end: date, filters: dict):
+    """Cartes (readmodels.TaskCard) de l'utilisateur dont l'échéance tombe dans [start, end[."""
+    query = card_query().filter(
+        Task.owner_id == user_id,
+        Task.due_date >= datetime.combine(start, datetime.min.time()),
+        Task.due_date < datetime.combine(end, datetime.min.time()),
+    )
+
+    if filters.get("project_id"):
+        query = query.filter(Task.project_id == filters["project_id"])
+    if filters.get("priority"):
+        query = query.filter(Task.priority == filters["priority"])
+    if filters.get("status"):
+        query = query.filter(Task.status == filters["status"])
+    if filters.get("task_type"):
+        query = query.filter(Task.task_type == filters["task_type"])
+    if filters.get("platform"):
+        query = query.filter(Task.platform == filters["platform"])
+
+    return query.order_by(Task.due_date.asc(), Task.id.asc())
+
+
+def bucket_by_day(tasks, start: date, end: date):
+    """Range les tâches par jour en un seul passage : {date: [tâches]}."""
+    days = {}
+    d = start
+    while d < end:
+        days[d] = []
+        d += timedelta(days=1)
+
+    for t in tasks:
+        bucket = days.get(t.due_date.date())
+        if bucket is not None:
+            bucket.append(t)
+
+    return days
+
+
+def task_to_dict(task):
+    return {
+        "id": task.id,
+        "title": task.title,
+        "status": task.status,
+        "priority": task.priority,
+        "task_type": task.task_type,
+        "platform": task.platform,
+        "creator_stage": task.creator_stage,
+        "due_date": task.due_date.strftime("%Y-%m-%d"),
+        "project_id": task.project_id,
+        "project_name": task.project_name,
+    }
@@ -0,0 +1,143 @@
+# taskflow/assets.py
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : sans elle, pas de variante .br
+    brotli = None
+
+# static/src : sources éditées à la main ; static/dist : sortie de `flask assets-build`
+SOURCE_DIR = "src"
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+COMPRESSED_TYPES = (".css", ".js", ".svg", ".json", ".txt")
+
+# Le nom change avec le contenu : le navigateur peut garder le fichier un an
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+
+# ---------- BUILD ----------
+
+def _fingerprint(relpath: str, data: bytes) -> str:
+    """css/app.css → css/app.3f2a9c01b7.css"""
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, ext = os.path.splitext(relpath)
+    return f"{stem}.{digest}{ext}"
+
+
+def build_assets(static_folder: str, echo=print):
+    """
+    Copie static/src vers static/dist sous des noms hashés, avec variantes
+    .gz (et .br si le module brotli est installé), puis écrit le manifest.
+    Retourne {nom source: nom hashé}.
+    """
+    source_root = os.path.join(static_folder, SOURCE_DIR)
+    dist_root = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist_root, ignore_errors=True)
+
+    manifest = {}
+    for folder, _, files in os.walk(source_root):
+        for name in sorted(files):
+            source = os.path.join(folder, name)
+            relpath = os.path.relpath(source, source_root).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+
+            hashed = _fingerprint(relpath, data)
+            target = os.path.join(dist_root, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+
+            sizes = [f"{len(data)} o"]
+            if name.endswith(COMPRESSED_TYPES):
+                # mtime=0 : même entrée → même .gz, d'un build à l'autre
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                with open(target + ".gz", "wb") as f:
+                    f.write(compressed)
+                sizes.append(f"gz {len(compressed)} o")
+                if brotli is not None:
+                    compressed = brotli.compress(data, quality=11)
+                    with open(target + ".br", "wb") as f:
+                        f.write(compressed)
+                    sizes.append(f"br {len(compressed)} o")
+
+            manifest[relpath] = hashed
+            echo(f"  {hashed:<40} {' · '.join(sizes)}")
+
+    with open(os.path.join(dist_root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+# ---------- MANIFEST ----------
+
+class Assets:
+    """Helper Jinja asset_url('css/app.css') : version hashée si le build existe."""
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self.files = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        path = os.path.join(app.static_folder, DIST_DIR, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+            if not app.debug:
+                app.logger.warning("Pas de %s : assets servis sans hash (flask assets-build)", path)
+
+        self.files = set(self.manifest.values())
+        # en debug, les sources directement : pas besoin de rebuild à chaque retouche
+        self.use_manifest = bool(self.manifest) and not app.debug
+        app.jinja_env.globals["asset_url"] = self.url
+        app.register_blueprint(assets_bp)
+        app.extensions["assets"] = self
+
+    def url(self, name: str) -> str:
+        if self.use_manifest and name in self.manifest:
+            return url_for("assets.serve", filename=self.manifest[name])
+        return url_for("static", filename=f"{SOURCE_DIR}/{name}")
+
+
+assets = Assets()
+
+
+# ---------- SERVICE (immutable + précompressé) ----------
+
+@assets_bp.route("/<path:filename>")
+def serve(filename):
+    if filename not in assets.files:
+        abort(404)
+
+    directory = os.path.join(current_app.static_folder, DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accepted = request.accept_encodings
+
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if accepted[candidate] and os.path.exists(os.path.join(directory, filename + suffix)):
+            encoding, filename = candidate, filename + suffix
+            break
+
+    response = send_from_directory(directory, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,350 @@
+# taskflow/bench.py
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from flask import before_render_template, template_rendered
+from sqlalchemy import event, insert, literal, select
+from werkzeug.security import generate_password_hash
+
+from . import db
+from .cache import NullCache, view_cache
+from .compression import COMPRESSIBLE_MIMETYPES, brotli, compress_body
+from .models import Project, Task, TaskEvent, User
+from .rollup import backfill
+
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL = "bench{n}@example.test"
+
+
+# ---------- JEU DE DONNÉES SYNTHÉTIQUE ----------
+
+_VERBS = ["Préparer", "Filmer", "Monter", "Relire", "Envoyer", "Planifier", "Écrire", "Publier"]
+_THINGS = ["devis", "reel", "short", "newsletter", "facture", "script", "miniature", "rapport"]
+_PLATFORMS = ["tiktok", "instagram", "youtube", "other"]
+_STAGES = ["idea", "to_film", "to_edit", "scheduled", "published"]
+
+
+def _task_row(rng, owner_id, project_id, now, content_ratio, days):
+    created = now - timedelta(days=rng.random() * days)
+    status = rng.choices(["todo", "in_progress", "done"], weights=[5, 2, 3])[0]
+    is_content = rng.random() < content_ratio
+    due = None
+    if rng.random() < 0.8:
+        due = (created + timedelta(days=rng.randint(0, 30))).replace(hour=0, minute=0, second=0, microsecond=0)
+    completed = None
+    if status == "done":
+        completed = min(now, created + timedelta(hours=rng.randint(1, 24 * 14)))
+
+    return {
+        "project_id": project_id,
+        "owner_id": owner_id,
+        "title": f"{rng.choice(_VERBS)} {rng.choice(_THINGS)} #{rng.randint(1, 9999)}",
+        "description": rng.choice([None, "à revoir avec le client", "voir brief", "version longue"]),
+        "status": status,
+        "priority": rng.choices(["low", "medium", "high"], weights=[2, 5, 2])[0],
+        "task_type": "content" if is_content else "general",
+        "platform": rng.choice(_PLATFORMS) if is_content else None,
+        "creator_stage": rng.choice(_STAGES) if is_content else None,
+        "due_date": due,
+        "created_at": created,
+        "updated_at": completed or created,
+        "completed_at": completed,
+    }
+
+
+def generate_dataset(users: int, projects: int, tasks: int, seed: int = 42,
+                     content_ratio: float = 0.4, days: int = 365, batch: int = 10000, echo=print):
+    """
+    users × projects × tasks lignes, reproductibles (même seed = mêmes données).
+    INSERT groupés (executemany / insertmanyvalues) par lots de `batch` tâches,
+    journal + rollup recalculés en SQL ensembliste à la fin.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    password_hash = generate_password_hash(BENCH_PASSWORD)  # une seule fois : c'est lent
+    first = User.query.filter(User.email.like(BENCH_EMAIL.format(n="%"))).count() + 1
+
+    user_ids = db.session.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [
+            {
+                "email": BENCH_EMAIL.format(n=n),
+                "name": f"Bench {n}",
+                "password_hash": password_hash,
+                "user_type": "creator" if n % 2 else "standard",
+                "onboarding_done": True,
+                "created_at": now - timedelta(days=days),
+            }
+            for n in range(first, first + users)
+        ],
+    ).scalars().all()
+
+    total, pending = 0, []
+    for user_id in user_ids:
+        project_ids = db.session.execute(
+            insert(Project).returning(Project.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": f"Projet {rng.choice(_THINGS)} {p}",
+                    "description": rng.choice([None, "client récurrent", "perso"]),
+                    "owner_id": user_id,
+                    "created_at": now - timedelta(days=rng.random() * days),
+                }
+                for p in range(projects)
+            ],
+        ).scalars().all()
+
+        for project_id in project_ids:
+            pending.extend(
+                _task_row(rng, user_id, project_id, now, content_ratio, days)
+                for _ in range(tasks)
+            )
+            if len(pending) >= batch:
+                db.session.execute(insert(Task), pending)
+                total += len(pending)
+                pending = []
+                echo(f"  {total} tâches…")
+
+    if pending:
+        db.session.execute(insert(Task), pending)
+        total += len(pending)
+
+    # Journal : un passage en "done" par tâche terminée (lu par l'analytics)
+    done = select(
+        Task.id, Task.owner_id, literal("status"), literal("in_progress"),
+        literal("done"), Task.completed_at,
+    ).where(Task.owner_id.in_(user_ids), Task.status == "done")
+    db.session.execute(
+        insert(TaskEvent).from_select(
+            ["task_id", "owner_id", "kind", "from_status", "to_status", "at"], done
+        )
+    )
+    db.session.commit()
+
+    for user_id in user_ids:
+        backfill(user_id)
+    return user_ids, total
+
+
+# ---------- BENCHMARK DES ROUTES ----------
+
+# Valeurs des paramètres d'URL (les ids sont pris dans les données du user)
+_STATIC_ARGS = {"kind": "ideas"}
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        self._engine = engine
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def close(self):
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+
+
+def bench_urls(app, user_id: int):
+    """URLs GET de main_bp et auth_bp, paramètres remplis avec les données du user."""
+    project = Project.query.filter_by(owner_id=user_id).first()
+    task = Task.query.filter_by(owner_id=user_id).first()
+    values = dict(_STATIC_ARGS)
+    if project:
+        values["project_id"] = project.id
+    if task:
+        values["task_id"] = task.id
+
+    monday = date.today() - timedelta(days=date.today().weekday())
+    query_strings = {
+        "main.calendar_range": f"?start={monday}&end={monday + timedelta(days=7)}",
+        "main.search": "?q=reel",
+        "main.search_more": "?q=reel",
+        "main.project_tasks_more": "?status=todo",
+        "main.creator_pipeline_more": "?stage=idea",
+    }
+
+    urls = {}
+    for rule in app.url_map.iter_rules():
+        blueprint = rule.endpoint.split(".")[0]
+        if blueprint not in ("main", "auth") or "GET" not in rule.methods:
+            continue
+        if rule.endpoint == "auth.logout":
+            continue  # déconnecterait le client de bench
+        if not all(arg in values for arg in rule.arguments):
+            continue
+        path = rule.build({a: values[a] for a in rule.arguments}, append_unknown=False)[1]
+        urls[rule.endpoint] = path + query_strings.get(rule.endpoint, "")
+    return dict(sorted(urls.items()))
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(app, email: str, iterations: int = 20, use_cache: bool = False):
+    """{endpoint: {p50_ms, p95_ms, p99_ms, mean_ms, queries, status}} pour le user `email`."""
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise ValueError(f"utilisateur introuvable : {email}")
+
+    saved_backend = view_cache.backend
+    if not use_cache:
+        view_cache.backend = NullCache()
+
+    client = app.test_client()
+    client.post("/login", data={"email": email, "password": BENCH_PASSWORD})
+
+    counter = QueryCounter(db.engine)
+    results = {}
+    try:
+        for endpoint, url in bench_urls(app, user.id).items():
+            client.get(url)  # échauffement (templates, caches)
+            timings, queries, status = [], [], None
+            for _ in range(iterations):
+                counter.count = 0
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+                queries.append(counter.count)
+                status = response.status_code
+            timings.sort()
+            results[endpoint] = {
+                "url": url,
+                "status": status,
+                "p50_ms": round(_percentile(timings, 50), 2),
+                "p95_ms": round(_percentile(timings, 95), 2),
+                "p99_ms": round(_percentile(timings, 99), 2),
+                "mean_ms": round(statistics.fmean(timings), 2),
+                "queries": max(queries),
+            }
+    finally:
+        counter.close()
+        view_cache.backend = saved_backend
+    return results
+
+
+# ---------- RENDU DES TEMPLATES ----------
+
+def template_render_benchmark(app, email: str, iterations: int = 10):
+    """
+    Temps de rendu par template (signaux before_render_template / template_rendered)
+    sur les vraies pages du user `email`, cache de pages désactivé.
+    {template: {"renders", "p50_ms", "max_ms"}}
+    """
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise ValueError(f"utilisateur introuvable : {email}")
+
+    timings, started = {}, []
+
+    def _before(sender, template, context, **extra):
+        started.append(time.perf_counter())
+
+    def _after(sender, template, context, **extra):
+        timings.setdefault(template.name, []).append((time.perf_counter() - started.pop()) * 1000)
+
+    saved_backend = view_cache.backend
+    view_cache.backend = NullCache()
+    client = app.test_client()
+    client.post("/login", data={"email": email, "password": BENCH_PASSWORD})
+    try:
+        with before_render_template.connected_to(_before, app), template_rendered.connected_to(_after, app):
+            for url in bench_urls(app, user.id).values():
+                for _ in range(iterations):
+                    client.get(url)
+    finally:
+        view_cache.backend = saved_backend
+
+    report = {}
+    for name, values in timings.items():
+        values.sort()
+        report[name] = {
+            "renders": len(values),
+            "p50_ms": round(_percentile(values, 50), 2),
+            "max_ms": round(values[-1], 2),
+        }
+    return report
+
+
+# ---------- COMPRESSION : OCTETS / CPU ----------
+
+COMPRESSION_SETTINGS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 1), ("br", 4), ("br", 6), ("br", 11)]
+
+
+def compression_settings():
+    return [(enc, level) for enc, level in COMPRESSION_SETTINGS if enc == "gzip" or brotli is not None]
+
+
+def compression_benchmark(app, email: str, iterations: int = 20):
+    """
+    Pages réelles du user `email` (rendues sans compression), puis chaque réglage :
+    {endpoint: {"raw": octets, "gzip-6": {"bytes", "cpu_ms"}, …}}. cpu_ms = temps CPU moyen.
+    """
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise ValueError(f"utilisateur introuvable : {email}")
+
+    client = app.test_client()
+    client.post("/login", data={"email": email, "password": BENCH_PASSWORD})
+
+    results = {}
+    for endpoint, url in bench_urls(app, user.id).items():
+        response = client.get(url, headers={"Accept-Encoding": "identity"})
+        if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            continue
+        body = response.get_data()
+        row = {"url": url, "raw": len(body)}
+        for encoding, level in compression_settings():
+            started = time.process_time()
+            for _ in range(iterations):
+                compressed = compress_body(body, encoding, level)
+            row[f"{encoding}-{level}"] = {
+                "bytes": len(compressed),
+                "cpu_ms": round((time.process_time() - started) * 1000 / iterations, 3),
+            }
+        results[endpoint] = row
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = 0.25, floor_ms: float = 5.0):
+    """
+    Régressions : p50 au-delà de baseline × (1 + tolerance) (et d'au moins floor_ms),
+    ou plus de requêtes SQL qu'avant. Retourne [(endpoint, message)].
+    """
+    regressions = []
+    for endpoint, now in results.items():
+        before = baseline.get(endpoint)
+        if before is None:
+            continue
+        limit = max(before["p50_ms"] * (1 + tolerance), before["p50_ms"] + floor_ms)
+        if now["p50_ms"] > limit:
+            regressions.append((endpoint, f"p50 {before['p50_ms']} → {now['p50_ms']} ms"))
+        if now["queries"] > before["queries"]:
+            regressions.append((endpoint, f"requêtes {before['queries']} → {now['queries']}"))
+    return regressions
+
+
+def load_baseline(path: str, dialect: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(dialect, {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, dialect: str, results: dict):
+    """Une section par moteur (sqlite, postgresql) dans le même fichier."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    data[dialect] = results
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
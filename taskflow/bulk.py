@@ -0,0 +1,117 @@
+# taskflow/bulk.py
+from datetime import datetime
+
+from . import db
+from .models import Task
+from .events import forget_task_events, log_event
+from .rollup import forget_done_tasks, set_task_status
+
+# Garde-fou : une réorganisation de semaine / de board tient largement dedans
+MAX_BULK_OPS = 500
+
+STATUSES = ("todo", "in_progress", "done")
+STAGES = ("idea", "to_film", "to_edit", "scheduled", "published", "none")
+PRIORITIES = ("low", "medium", "high")
+
+
+class BulkError(ValueError):
+    """Lot refusé en entier (rien n'est appliqué)."""
+
+    def __init__(self, message: str, status: int = 400, index: int = None):
+        super().__init__(message)
+        self.status = status
+        self.index = index
+
+
+def _parse_value(op: str, value, index: int):
+    if op == "status" and value in STATUSES:
+        return value
+    if op == "creator_stage" and value in STAGES:
+        return value
+    if op == "priority" and value in PRIORITIES:
+        return value
+    if op == "due_date":
+        if value is None:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            pass
+    if op == "delete":
+        return None
+    raise BulkError(f"valeur invalide pour {op}", index=index)
+
+
+def parse_operations(payload):
+    """
+    {"ops": [{"id": 12, "op": "status", "value": "done"}, {"id": 13, "op": "delete"}, …]}
+    → [(index, task_id, op, valeur)] validés, dans l'ordre.
+    """
+    ops = payload.get("ops") if isinstance(payload, dict) else None
+    if not isinstance(ops, list) or not ops:
+        raise BulkError("ops manquant")
+    if len(ops) > MAX_BULK_OPS:
+        raise BulkError(f"{MAX_BULK_OPS} opérations maximum")
+
+    parsed = []
+    for index, item in enumerate(ops):
+        if not isinstance(item, dict):
+            raise BulkError("opération invalide", index=index)
+        task_id, op = item.get("id"), item.get("op")
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise BulkError("id invalide", index=index)
+        if op not in ("status", "creator_stage", "due_date", "priority", "delete"):
+            raise BulkError("op inconnue", index=index)
+        parsed.append((index, task_id, op, _parse_value(op, item.get("value"), index)))
+    return parsed
+
+
+def apply_operations(user_id: int, operations):
+    """
+    Applique le lot dans la transaction courante (le commit revient à l'appelant).
+    Une seule requête de chargement / contrôle d'accès ; les UPDATE / DELETE
+    partent groupés (executemany) au flush.
+    """
+    ids = {task_id for _, task_id, _, _ in operations}
+    tasks = {
+        t.id: t
+        for t in Task.query.filter(Task.id.in_(ids), Task.owner_id == user_id)
+    }
+    missing = ids - tasks.keys()
+    if missing:
+        raise BulkError(f"tâches introuvables : {sorted(missing)}", status=404)
+
+    updated, deleted = set(), set()
+    # pas d'autoflush entre deux upserts du rollup : les UPDATE task partent groupés
+    with db.session.no_autoflush:
+        for index, task_id, op, value in operations:
+            if task_id in deleted:
+                raise BulkError("tâche déjà supprimée dans ce lot", index=index)
+            task = tasks[task_id]
+
+            if op == "status":
+                set_task_status(task, value)
+            elif op == "creator_stage":
+                if task.task_type != "content":
+                    raise BulkError("cette tâche n’est pas un contenu", index=index)
+                log_event(task, "stage", task.creator_stage, value)
+                task.creator_stage = value
+            elif op == "due_date":
+                log_event(task, "due_date", task.due_date, value)
+                task.due_date = value
+            elif op == "priority":
+                task.priority = value
+            else:
+                deleted.add(task_id)
+                continue
+            updated.add(task_id)
+
+    if deleted:
+        # les statuts du lot doivent être à jour en base avant de lire le rollup
+        db.session.flush()
+        forget_done_tasks(Task.query.filter(Task.id.in_(deleted)))
+        forget_task_events(user_id, sorted(deleted))
+        for task_id in deleted:
+            db.session.delete(tasks[task_id])
+
+    return {"updated": len(updated - deleted), "deleted": len(deleted)}
@@ -0,0 +1,334 @@
+# taskflow/cache.py
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+
+# ---------- BACKENDS ----------
+
+class NullCache:
+    """Cache désactivé."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def incr(self, key):
+        return time.time_ns()
+
+    def clear(self):
+        pass
+
+
+class MemoryCache:
+    """LRU en mémoire avec TTL. Propre à chaque worker : à réserver au dev / 1 worker."""
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires = self._data.get(key, (time.time_ns(), None))
+            self._data[key] = (value + 1, expires)
+            self._data.move_to_end(key)
+            return value + 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# UPSERT … RETURNING : SQLite ≥ 3.35
+_SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+class SQLiteCache:
+    """Cache partagé entre workers gunicorn d'une même machine (fichier SQLite en WAL)."""
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path, ttl=300):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            # une connexion par thread et par process (pas de partage après fork)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else None
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, expires),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    def incr(self, key):
+        conn = self._conn()
+        # valeur initiale horodatée : un compteur perdu ne revient jamais à une ancienne version
+        upsert = (
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, NULL) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+        if _SQLITE_RETURNING:
+            # une seule instruction atomique : chaque appel lit sa propre valeur
+            return conn.execute(upsert + " RETURNING value", (key, time.time_ns())).fetchone()[0]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(upsert, (key, time.time_ns()))
+            value = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()[0]
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return value
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+
+# ---------- CACHE DE VUES ----------
+
+class ViewCache:
+    """
+    Cache des pages par utilisateur.
+    Chaque clé contient la "version de données" du user : toute écriture
+    (POST) incrémente la version, les anciennes pages ne sont plus jamais lues.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullCache()
+        self.build_id = ""
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get("VIEW_CACHE_BACKEND", "sqlite")
+        ttl = app.config.get("VIEW_CACHE_TTL", 300)
+
+        if kind == "memory":
+            self.backend = MemoryCache(app.config.get("VIEW_CACHE_MAX_ENTRIES", 2048), ttl)
+        elif kind == "sqlite":
+            path = app.config.get("VIEW_CACHE_PATH") or default_cache_path(
+                app.config["SQLALCHEMY_DATABASE_URI"]
+            )
+            self.backend = SQLiteCache(path, ttl)
+        else:
+            self.backend = NullCache()
+
+        self.build_id = build_id(app)
+        app.extensions["view_cache"] = self
+
+    def user_version(self, user_id: int):
+        version = self.backend.get(f"v:{user_id}")
+        if version is None:
+            version = self.bump(user_id)
+        return version
+
+    def bump(self, user_id: int):
+        return self.backend.incr(f"v:{user_id}")
+
+    # Version du compte (profil, mot de passe, type, suppression) : distincte de
+    # la version des données, qui bouge à chaque POST
+    def account_version(self, user_id: int):
+        version = self.backend.get(f"acct:{user_id}")
+        if version is None:
+            version = self.bump_account(user_id)
+        return version
+
+    def bump_account(self, user_id: int):
+        return self.backend.incr(f"acct:{user_id}")
+
+    def clear(self):
+        """
+        Tout invalider après une écriture hors requête (restore, rollup-backfill).
+        Les versions repartent de l'horodatage courant : jamais une version déjà servie.
+        """
+        self.backend.clear()
+
+    def page_key(self, user_id: int):
+        return (
+            f"page:{user_id}:{self.user_version(user_id)}:{date.today().isoformat()}:"
+            f"{request.endpoint}:{request.query_string.decode()}"
+        )
+
+
+view_cache = ViewCache()
+
+
+def default_cache_path(database_uri: str) -> str:
+    """Un fichier par base : deux apps (ou prod / staging) sur la même machine ne partagent rien."""
+    digest = hashlib.sha1(database_uri.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"taskflow-view-cache-{digest}.sqlite")
+
+
+def cached_view(view):
+    """
+    Sert la page depuis le cache si la version du user n'a pas bougé.
+    Jamais de cache quand des messages flash attendent d'être affichés.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if (
+            request.method != "GET"
+            or not current_user.is_authenticated
+            or session.get("_flashes")
+        ):
+            return view(*args, **kwargs)
+
+        key = view_cache.page_key(current_user.id)
+        html = view_cache.backend.get(key)
+        if html is not None:
+            return html
+
+        rv = view(*args, **kwargs)
+        if isinstance(rv, str):
+            view_cache.backend.set(key, rv)
+        return rv
+
+    return wrapper
+
+
+# ---------- GET CONDITIONNEL (ETag faible / 304) ----------
+
+# Fichiers dont dépend le HTML rendu (hors données) : templates, vues, manifest des assets
+_BUILD_SOURCES = (".py", ".html", ".json")
+
+
+def build_id(app) -> str:
+    """
+    Change à chaque déploiement : un nouveau HTML invalide les ETags déjà servis.
+    RENDER_GIT_COMMIT, sinon empreinte du code, des templates et du manifest des assets :
+    identique entre workers et entre redémarrages d'un même build.
+    """
+    commit = os.environ.get("RENDER_GIT_COMMIT")
+    if commit:
+        return commit
+
+    digest = hashlib.sha1()
+    for folder, dirs, files in os.walk(app.root_path):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(_BUILD_SOURCES):
+                path = os.path.join(folder, name)
+                digest.update(os.path.relpath(path, app.root_path).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def weak_etag(*parts) -> str:
+    return hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:20]
+
+
+def conditional_view(validator=None):
+    """
+    Répond 304 avant d'exécuter la vue si le navigateur a déjà la bonne version.
+    ETag = version de données du user (toute écriture la fait bouger), ou
+    validator(**view_args) pour une ressource précise (ex. updated_at d'une tâche).
+    Pas d'ETag si des flash attendent, ni sans version partagée (NullCache).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if (
+                request.method != "GET"
+                or not current_user.is_authenticated
+                or session.get("_flashes")
+            ):
+                return view(*args, **kwargs)
+
+            if validator is not None:
+                token = validator(**kwargs)
+            elif isinstance(view_cache.backend, NullCache):
+                token = None
+            else:
+                token = view_cache.user_version(current_user.id)
+            if token is None:
+                return view(*args, **kwargs)
+
+            etag = weak_etag(
+                view_cache.build_id, current_user.id, token, date.today().isoformat(),
+                request.endpoint, request.query_string.decode(),
+            )
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # le navigateur garde la page mais revalide à chaque fois
+            response.headers["Cache-Control"] = "private, no-cache"
+            response.vary.add("Cookie")
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,398 @@
+# taskflow/cli.py
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, date, timedelta
+
+import click
+from sqlalchemy import select
+
+from . import db
+from .cache import view_cache
+from .models import Project, Task, User
+from .stats import open_counts_query, stats_query
+from .rollup import backfill, completions_query
+from .events import completion_histogram_query
+from .agenda import month_window, window_tasks_query
+from .pagination import PAGE_SIZE, keyset_query
+from .readmodels import (
+    backlog_cards_query,
+    in_progress_cards_query,
+    pipeline_column_query,
+    pipeline_first_pages_query,
+    project_column_query,
+    today_cards_query,
+)
+from .bench import (
+    BENCH_EMAIL,
+    BENCH_PASSWORD,
+    compare_to_baseline,
+    compression_benchmark,
+    compression_settings,
+    generate_dataset,
+    load_baseline,
+    run_benchmark,
+    save_baseline as save_baseline_file,
+    template_render_benchmark,
+)
+from .restore import LOAD_ORDER, RestoreError, restore
+from .assets import build_assets
+from .templating import compile_report
+from .export import EXPORT_FORMATS, export_filename, export_stream, table_columns, table_rows
+
+
+# ---------- REQUÊTES CHAUDES (vérifiées par EXPLAIN) ----------
+
+def hot_queries(user_id: int):
+    """
+    Requêtes des routes les plus appelées, construites par les mêmes fonctions
+    que les routes (pas de copie à maintenir en parallèle).
+    """
+    today = date.today()
+    year_ago = today - timedelta(days=365)
+    by_created = (Task.created_at, Task.id)
+    project_id = db.session.scalar(select(Project.id).where(Project.owner_id == user_id).limit(1)) or 0
+
+    return {
+        "dashboard.stats": stats_query(user_id, today),
+        "dashboard.open_counts": open_counts_query(user_id),
+        "dashboard.projects": (
+            Project.query.filter_by(owner_id=user_id).order_by(Project.created_at.desc())
+        ),
+        "today.tasks_today": today_cards_query(user_id, today),
+        "today.in_progress": in_progress_cards_query(user_id),
+        "calendar.window": window_tasks_query(user_id, *month_window(today.year, today.month), {}),
+        "creator.backlog": keyset_query(backlog_cards_query(user_id, "ideas"), by_created),
+        "creator.backlog_no_date": keyset_query(backlog_cards_query(user_id, "no_date"), by_created),
+        "creator.pipeline": pipeline_first_pages_query(user_id, PAGE_SIZE + 1),
+        "creator.pipeline_more": keyset_query(pipeline_column_query(user_id, "to_film"), by_created),
+        "analytics.daily": completions_query(user_id, year_ago),
+        "analytics.histogram": completion_histogram_query(
+            user_id, datetime.combine(year_ago, datetime.min.time())
+        ),
+        "project_detail.tasks": keyset_query(
+            project_column_query(project_id, "todo"), by_created, descending=False
+        ),
+    }
+
+
+_SCANNED_TABLES = r"(task|project|task_event|user_daily_stats)"
+_SQLITE_SEQ_SCAN = re.compile(rf"^SCAN {_SCANNED_TABLES}\b(?!.*USING (COVERING )?INDEX)")
+_PG_SEQ_SCAN = re.compile(rf"Seq Scan on {_SCANNED_TABLES}\b")
+# Tri du lot filtré : interdit pour une page (LIMIT), l'ordre doit venir de l'index
+_SQLITE_SORT = re.compile(r"TEMP B-TREE FOR .*ORDER BY")
+_PG_SORT = re.compile(r"^(->\s*)?(Incremental )?Sort\b")
+
+
+def _sql(query):
+    statement = getattr(query, "statement", query)
+    return str(statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def is_paginated(query):
+    """Requête de page (keyset) : un LIMIT sur la requête externe."""
+    return bool(re.search(r"\bLIMIT\b[^)]*$", _sql(query)))
+
+
+def explain_plan(query):
+    """Retourne le plan d'exécution (liste de lignes) d'une requête ORM ou d'un select()."""
+    dialect = db.engine.dialect
+    sql = _sql(query)
+
+    if dialect.name == "postgresql":
+        # Petites tables → le planner préfère toujours un seq scan :
+        # on le désactive pour vérifier qu'un index est bien utilisable.
+        db.session.execute(db.text("SET LOCAL enable_seqscan = off"))
+        rows = db.session.execute(db.text("EXPLAIN " + sql)).all()
+        return [r[0] for r in rows]
+
+    rows = db.session.execute(db.text("EXPLAIN QUERY PLAN " + sql)).all()
+    return [r[-1] for r in rows]
+
+
+def find_seq_scans(plan_lines):
+    pattern = _PG_SEQ_SCAN if db.engine.dialect.name == "postgresql" else _SQLITE_SEQ_SCAN
+    return [line for line in plan_lines if pattern.search(line.strip())]
+
+
+def find_sorts(plan_lines):
+    pattern = _PG_SORT if db.engine.dialect.name == "postgresql" else _SQLITE_SORT
+    return [line for line in plan_lines if pattern.search(line.strip())]
+
+
+@click.command("check-indexes")
+@click.option("--user-id", default=1, show_default=True, type=int)
+@click.option("--verbose", "-v", is_flag=True, help="Affiche le plan complet.")
+def check_indexes_command(user_id, verbose):
+    """
+    Échoue si une requête chaude repasse en seq scan (task, project, task_event, rollup),
+    ou si une requête paginée trie tout le lot filtré au lieu de suivre un index.
+    """
+    failures = 0
+    for name, query in hot_queries(user_id).items():
+        plan = explain_plan(query)
+        scans = find_seq_scans(plan)
+        sorts = find_sorts(plan) if is_paginated(query) else []
+        status = "SEQ SCAN" if scans else "SORT" if sorts else "ok"
+        click.echo(f"{name:<24} {status}")
+        if verbose or scans or sorts:
+            for line in plan:
+                click.echo(f"    {line}")
+        failures += bool(scans or sorts)
+    db.session.rollback()
+
+    if failures:
+        click.echo(f"{failures} requête(s) sans index adapté.", err=True)
+        sys.exit(1)
+
+
+@click.command("rollup-backfill")
+@click.option("--user-id", type=int, default=None, help="Un seul utilisateur (sinon tous).")
+def rollup_backfill_command(user_id):
+    """Recalcule user_daily_stats depuis la table task."""
+    backfill(user_id)
+    # stats servies depuis le cache de vues (autre process) : versions à faire bouger
+    if user_id is not None:
+        view_cache.bump(user_id)
+    else:
+        view_cache.clear()
+    click.echo("user_daily_stats recalculé.")
+
+
+# ---------- DÉMARRAGE DES WORKERS ----------
+
+# Exécuté dans un process neuf, comme un worker gunicorn sans --preload
+_STARTUP_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import taskflow
+t1 = time.perf_counter()
+app = taskflow.create_app()
+t2 = time.perf_counter()
+status = app.test_client().get(sys.argv[1]).status_code
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "status": status,
+}))
+"""
+
+
+@click.command("startup-bench")
+@click.option("--workers", default=4, show_default=True, help="Nombre de démarrages mesurés.")
+@click.option("--url", default="/login", show_default=True, help="URL de la 1re requête.")
+def startup_bench_command(workers, url):
+    """Temps d'import, de create_app() et de 1re requête, par worker (process neuf)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    columns = ("import_ms", "create_app_ms", "first_request_ms")
+    runs = []
+
+    click.echo(f"{'worker':<8}" + "".join(f"{c:>18}" for c in columns))
+    for n in range(1, workers + 1):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE, url],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(run)
+        click.echo(f"{n:<8}" + "".join(f"{run[c]:>18.1f}" for c in columns)
+                   + ("" if run["status"] < 400 else f"   (HTTP {run['status']})"))
+
+    click.echo(f"{'médiane':<8}" + "".join(
+        f"{statistics.median(r[c] for r in runs):>18.1f}" for c in columns
+    ))
+
+
+# ---------- BENCHMARK ----------
+
+@click.command("bench-seed")
+@click.option("--users", default=10, show_default=True)
+@click.option("--projects", default=5, show_default=True, help="Projets par utilisateur.")
+@click.option("--tasks", default=200, show_default=True, help="Tâches par projet.")
+@click.option("--seed", default=42, show_default=True, help="Même seed = mêmes données.")
+@click.option("--content-ratio", default=0.4, show_default=True)
+@click.option("--batch", default=10000, show_default=True, help="Tâches par INSERT groupé.")
+def bench_seed_command(users, projects, tasks, seed, content_ratio, batch):
+    """Génère un jeu de données synthétique (users × projets × tâches)."""
+    started = time.perf_counter()
+    user_ids, total = generate_dataset(
+        users, projects, tasks, seed=seed, content_ratio=content_ratio, batch=batch,
+        echo=click.echo,
+    )
+    elapsed = time.perf_counter() - started
+    first = db.session.get(User, user_ids[0]).email if user_ids else "-"
+    click.echo(
+        f"{len(user_ids)} users, {len(user_ids) * projects} projets, {total} tâches "
+        f"en {elapsed:.1f} s ({total / max(elapsed, 1e-9):.0f} tâches/s)."
+    )
+    click.echo(f"Bench : flask bench-routes --email {first} (mot de passe : {BENCH_PASSWORD})")
+
+
+@click.command("bench-routes")
+@click.option("--email", default=BENCH_EMAIL.format(n=1), show_default=True)
+@click.option("--iterations", "-n", default=20, show_default=True)
+@click.option("--with-cache", is_flag=True, help="Garde le cache de pages (sinon désactivé).")
+@click.option("--baseline", "baseline_path", default="bench_baseline.json", show_default=True)
+@click.option("--save-baseline", is_flag=True, help="Enregistre ce run comme référence.")
+@click.option("--tolerance", default=0.25, show_default=True, help="Marge tolérée sur le p50.")
+@click.option("--floor-ms", default=5.0, show_default=True, help="Écart minimal signalé (bruit).")
+def bench_routes_command(email, iterations, with_cache, baseline_path, save_baseline, tolerance, floor_ms):
+    """Latences (p50/p95/p99) et requêtes SQL de chaque route GET, comparées à la référence."""
+    from flask import current_app
+
+    dialect = db.engine.dialect.name
+    results = run_benchmark(current_app, email, iterations, use_cache=with_cache)
+
+    click.echo(f"{'endpoint':<32}{'p50':>9}{'p95':>9}{'p99':>9}{'req.':>6}  statut")
+    for endpoint, r in results.items():
+        click.echo(
+            f"{endpoint:<32}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+            f"{r['queries']:>6}  {r['status']}"
+        )
+
+    if save_baseline:
+        save_baseline_file(baseline_path, dialect, results)
+        click.echo(f"Référence {dialect} enregistrée dans {baseline_path}.")
+        return
+
+    baseline = load_baseline(baseline_path, dialect)
+    if not baseline:
+        click.echo(f"Pas de référence {dialect} ({baseline_path}) : --save-baseline pour en créer une.")
+        return
+
+    regressions = compare_to_baseline(results, baseline, tolerance, floor_ms)
+    for endpoint, message in regressions:
+        click.echo(f"RÉGRESSION {endpoint} : {message}", err=True)
+    if regressions:
+        sys.exit(1)
+    click.echo(f"Aucune régression par rapport à {baseline_path} ({dialect}).")
+
+
+@click.command("bench-compression")
+@click.option("--email", default=BENCH_EMAIL.format(n=1), show_default=True)
+@click.option("--iterations", "-n", default=20, show_default=True, help="Compressions par mesure.")
+def bench_compression_command(email, iterations):
+    """Octets et temps CPU par page pour chaque niveau gzip / brotli (voir COMPRESSION_*)."""
+    from flask import current_app
+    try:
+        results = compression_benchmark(current_app, email, iterations)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    settings = [f"{enc}-{level}" for enc, level in compression_settings()]
+    click.echo(f"{'endpoint':<30}{'brut':>9}" + "".join(f"{s:>17}" for s in settings))
+    totals = {s: [0, 0.0] for s in settings}
+    raw_total = 0
+    for endpoint, row in results.items():
+        raw_total += row["raw"]
+        cells = []
+        for s in settings:
+            totals[s][0] += row[s]["bytes"]
+            totals[s][1] += row[s]["cpu_ms"]
+            cells.append(f"{row[s]['bytes']:>8} {row[s]['cpu_ms']:>6.2f}ms")
+        click.echo(f"{endpoint:<30}{row['raw']:>9}" + "".join(f"{c:>17}" for c in cells))
+
+    click.echo(f"{'total':<30}{raw_total:>9}" + "".join(
+        f"{totals[s][0]:>8} {totals[s][1]:>6.2f}ms".rjust(17) for s in settings
+    ))
+    click.echo(f"{'ratio':<30}{'':>9}" + "".join(
+        f"{raw_total / max(totals[s][0], 1):>16.1f}x" for s in settings
+    ))
+
+
+# ---------- RESTAURATION ----------
+
+@click.command("restore")
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--replace", is_flag=True, help="Vide les tables cibles avant de charger.")
+@click.option("--batch", default=5000, show_default=True, help="Lignes par INSERT groupé (hors Postgres).")
+def restore_command(path, replace, batch):
+    """Charge un pg_dump (.sql), des CSV / JSONL par table ou un JSON dans la base configurée."""
+    started = time.perf_counter()
+    try:
+        loaded = restore(path, replace=replace, batch=batch, echo=click.echo)
+    except RestoreError as e:
+        db.session.rollback()
+        raise click.ClickException(str(e))
+
+    # pages / snapshots de comptes mis en cache avant la restauration
+    view_cache.clear()
+    click.echo(f"{sum(loaded.values())} ligne(s) chargée(s) en {time.perf_counter() - started:.1f} s.")
+
+
+# ---------- EXPORT / SAUVEGARDE ----------
+
+@click.command("export")
+@click.option("--output", "-o", default="export", show_default=True, help="Dossier de sortie.")
+@click.option("--user-id", type=int, default=None, help="Un seul utilisateur (sinon toute la base).")
+@click.option("--format", "fmt", type=click.Choice(EXPORT_FORMATS), default="csv", show_default=True)
+@click.option("--gzip", "compress", is_flag=True, help="Compresse chaque fichier (.gz).")
+def export_command(output, user_id, fmt, compress):
+    """Un fichier par table, streamé (rechargeable avec `flask restore DOSSIER`)."""
+    os.makedirs(output, exist_ok=True)
+    started = time.perf_counter()
+    for name in LOAD_ORDER:
+        path = os.path.join(output, export_filename(name, fmt, compress))
+        with open(path, "wb") as f:
+            for chunk in export_stream(fmt, table_columns(name), table_rows(name, user_id), compress):
+                f.write(chunk)
+        click.echo(f"  {path:<40} {os.path.getsize(path):>12} octets")
+    click.echo(f"Export terminé en {time.perf_counter() - started:.1f} s.")
+
+
+# ---------- ASSETS STATIQUES ----------
+
+@click.command("assets-build")
+def assets_build_command():
+    """static/src → static/dist : noms hashés, variantes .gz / .br, manifest.json."""
+    from flask import current_app
+    manifest = build_assets(current_app.static_folder, echo=click.echo)
+    click.echo(f"{len(manifest)} fichier(s) dans le manifest.")
+
+
+# ---------- TEMPLATES ----------
+
+@click.command("templates-report")
+@click.option("--email", default=BENCH_EMAIL.format(n=1), show_default=True,
+              help="User dont les pages sont rendues (temps de rendu).")
+@click.option("--iterations", "-n", default=10, show_default=True)
+def templates_report_command(email, iterations):
+    """Par template : compilation depuis la source, chargement du bytecode, rendu réel."""
+    from flask import current_app
+    rows = compile_report(current_app.jinja_env)
+    try:
+        renders = template_render_benchmark(current_app._get_current_object(), email, iterations)
+    except ValueError as e:
+        click.echo(f"Pas de temps de rendu ({e}) : flask bench-seed pour créer un jeu de données.", err=True)
+        renders = {}
+
+    click.echo(f"{'template':<40}{'Ko':>7}{'compile':>10}{'bytecode':>10}{'rendu p50':>11}{'max':>9}{'rendus':>8}")
+    for name, size, compile_ms, bytecode_ms in sorted(rows, key=lambda r: -r[2]):
+        render = renders.get(name)
+        click.echo(
+            f"{name:<40}{size / 1024:>7.1f}{compile_ms:>8.2f}ms"
+            + (f"{bytecode_ms:>8.2f}ms" if bytecode_ms is not None else f"{'—':>10}")
+            + (f"{render['p50_ms']:>9.2f}ms{render['max_ms']:>7.2f}ms{render['renders']:>8}" if render else f"{'—':>11}")
+        )
+    total_compile = sum(r[2] for r in rows)
+    click.echo(f"{len(rows)} templates, compilation totale {total_compile:.1f} ms "
+               "(payée une fois au boot avec TEMPLATE_WARMUP=1).")
+
+
+def register_commands(app):
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(rollup_backfill_command)
+    app.cli.add_command(startup_bench_command)
+    app.cli.add_command(bench_seed_command)
+    app.cli.add_command(bench_routes_command)
+    app.cli.add_command(bench_compression_command)
+    app.cli.add_command(restore_command)
+    app.cli.add_command(export_command)
+    app.cli.add_command(assets_build_command)
+    app.cli.add_command(templates_report_command)
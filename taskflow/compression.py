@@ -0,0 +1,139 @@
+# taskflow/compression.py
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : gzip seulement
+    brotli = None
+
+# Types qui se compressent bien (le reste : images, .gz, PDF… est déjà compressé)
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "text/calendar",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+# ---------- ENCODEURS ----------
+
+def compress_body(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    # mtime=0 : même page → mêmes octets (pas d'horodatage dans l'en-tête gzip)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding: str, level: int):
+    """
+    Compression chunk par chunk : chaque chunk est vidé (sync flush) pour que
+    le client reçoive les lignes au fil de l'eau, comme sans compression.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+        finish = compressor.flush
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if not chunk:
+                continue
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+# ---------- MIDDLEWARE ----------
+
+class Compress:
+    """
+    Compression des réponses (after_request) : brotli si le client l'accepte
+    et que le module est installé, sinon gzip.
+    Ignore : petits corps, types déjà compressés, fichiers (assets précompressés),
+    réponses déjà encodées, 304 / HEAD, Cache-Control: no-transform.
+    Les réponses streamées (exports, flux .ics) sont compressées à la volée.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESSION", True)
+        self.gzip_level = app.config.get("COMPRESSION_GZIP_LEVEL", 6)
+        self.br_level = app.config.get("COMPRESSION_BR_LEVEL", 4)
+        self.min_size = app.config.get("COMPRESSION_MIN_SIZE", 500)
+        if self.enabled:
+            app.after_request(self._compress)
+        app.extensions["compress"] = self
+
+    def negotiate(self, accept_encodings):
+        if brotli is not None and self.br_level is not None and accept_encodings["br"]:
+            return "br", self.br_level
+        if accept_encodings["gzip"]:
+            return "gzip", self.gzip_level
+        return None, None
+
+    def _compress(self, response):
+        if (
+            response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.cache_control.no_transform
+        ):
+            return response
+        # le corps dépend d'Accept-Encoding, même quand on ne compresse pas celui-ci
+        response.vary.add("Accept-Encoding")
+        encoding, level = self.negotiate(request.accept_encodings)
+        if response.status_code == 304:
+            # même validateur que la 200 compressée qu'elle remplace
+            if encoding is not None:
+                _weaken_etag(response)
+            return response
+        if request.method == "HEAD" or response.status_code < 200 or response.status_code == 204:
+            return response
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compress_body(data, encoding, level))
+
+        response.headers["Content-Encoding"] = encoding
+        _weaken_etag(response)
+        return response
+
+
+def _weaken_etag(response):
+    # Un ETag fort désigne des octets précis : il devient faible une fois compressé
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+compress = Compress()
@@ -11,4 +11,36 @@ class Config:
         db_url = db_url.replace("postgres://", "postgresql://", 1)
 
     SQLALCHEMY_DATABASE_URI = db_url if db_url else "sqlite:///taskflow.db"
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Cache des pages par utilisateur : "sqlite" (partagé entre workers), "memory", "none"
+    VIEW_CACHE_BACKEND = os.environ.get("VIEW_CACHE_BACKEND", "sqlite")
+    VIEW_CACHE_TTL = int(os.environ.get("VIEW_CACHE_TTL", "300"))
+    VIEW_CACHE_PATH = os.environ.get("VIEW_CACHE_PATH")  # défaut : dossier temporaire
+
+    # Snapshot de l'utilisateur connecté (évite un SELECT user par requête)
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", "60"))
+
+    # Pool Postgres : "neon-serverless" (défaut), "pgbouncer-transaction", "dedicated"
+    DB_POOL_PROFILE = os.environ.get("DB_POOL_PROFILE")
+    DB_STATEMENT_TIMEOUT_MS = (
+        int(os.environ["DB_STATEMENT_TIMEOUT_MS"]) if os.environ.get("DB_STATEMENT_TIMEOUT_MS") else None
+    )
+    DB_POOL_PREWARM = int(os.environ.get("DB_POOL_PREWARM", "2"))
+
+    # Jeton des endpoints /metrics/* (désactivés si vide)
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+    # Instrumentation SQL par requête (Server-Timing + log JSON "taskflow.sql")
+    SQL_PROFILING = os.environ.get("SQL_PROFILING", "0") == "1"
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # Compression des réponses HTML / JSON / CSV / .ics (brotli si installé, sinon gzip)
+    COMPRESSION = os.environ.get("COMPRESSION", "1") == "1"
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BR_LEVEL = int(os.environ.get("COMPRESSION_BR_LEVEL", "4"))
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "500"))
+
+    # Templates Jinja : bytecode sur disque ("none" = désactivé) + précompilation au boot
+    TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR")  # défaut : dossier temporaire
+    TEMPLATE_WARMUP = os.environ.get("TEMPLATE_WARMUP", "1") == "1"
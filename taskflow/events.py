@@ -0,0 +1,113 @@
+# taskflow/events.py
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import Integer, cast, extract, func, select, text
+
+from . import db
+from .models import Task, TaskEvent
+
+
+def _as_text(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+# Historique reconstruit : un passage en "done" par tâche terminée, daté de completed_at
+# (même requête que la migration 9ccb2be2a73e, qui garde sa propre copie figée)
+_SEED_DONE_EVENTS = text(
+    "INSERT INTO task_event (task_id, owner_id, kind, from_status, to_status, at) "
+    "SELECT id, owner_id, 'status', NULL, 'done', completed_at "
+    "FROM task WHERE status = 'done' AND completed_at IS NOT NULL"
+)
+
+
+def seed_done_events(bind):
+    """Remplit task_event depuis task (restauration d'un ancien dump ; journal des comptes vidé avant)."""
+    return bind.execute(_SEED_DONE_EVENTS).rowcount
+
+
+def forget_task_events(owner_id: int, task_ids):
+    """
+    À appeler avec la suppression des tâches : retire leurs lignes du journal.
+    `task_ids` : liste ou select() d'ids ; owner_id borne le DELETE à l'index (owner_id, at).
+    """
+    TaskEvent.query.filter(
+        TaskEvent.owner_id == owner_id, TaskEvent.task_id.in_(task_ids)
+    ).delete(synchronize_session=False)
+
+
+def log_event(task, kind: str, old, new, at: datetime = None):
+    """Ajoute une ligne au journal task_event (rien si la valeur ne change pas)."""
+    old, new = _as_text(old), _as_text(new)
+    if old == new:
+        return
+
+    db.session.add(
+        TaskEvent(
+            task_id=task.id,
+            owner_id=task.owner_id,
+            kind=kind,
+            from_status=old,
+            to_status=new,
+            at=at or datetime.utcnow(),
+        )
+    )
+
+
+def _weekday_hour(column):
+    """(jour de semaine 0 = dimanche, heure 0–23) d'une colonne DateTime, selon le moteur."""
+    if db.engine.dialect.name == "sqlite":
+        return (
+            cast(func.strftime("%w", column), Integer),
+            cast(func.strftime("%H", column), Integer),
+        )
+    return (
+        cast(extract("dow", column), Integer),
+        cast(extract("hour", column), Integer),
+    )
+
+
+def completion_histogram_query(user_id: int, since: datetime):
+    """
+    GROUP BY (jour de semaine, heure) des tâches terminées : au plus 7 × 24 lignes.
+    Une tâche compte une fois, à son dernier passage en "done", et seulement si elle
+    est encore terminée (ni rouverte ni supprimée) — comme user_daily_stats.
+    """
+    latest = (
+        select(TaskEvent.task_id, func.max(TaskEvent.at).label("at"))
+        .where(
+            TaskEvent.owner_id == user_id,
+            TaskEvent.at >= since,
+            TaskEvent.kind == "status",
+            TaskEvent.to_status == "done",
+        )
+        .group_by(TaskEvent.task_id)
+        .subquery()
+    )
+    dow, hour = _weekday_hour(latest.c.at)
+    return (
+        select(dow, hour, func.count(), func.min(latest.c.at).label("first_at"))
+        .select_from(latest)
+        .join(Task, (Task.id == latest.c.task_id) & (Task.status == "done"))
+        .group_by(dow, hour)
+        .order_by("first_at")
+    )
+
+
+def completion_histogram(user_id: int, since: datetime):
+    """
+    Tâches terminées depuis `since` (dernier passage en "done"), comptées par la base.
+    Retourne (Counter {0 = lundi: n}, Counter {heure: n}), clés dans l'ordre de
+    première occurrence (même départage des ex aequo qu'un Counter sur la liste triée).
+    """
+    rows = db.session.execute(completion_histogram_query(user_id, since)).all()
+
+    by_day, by_hour = Counter(), Counter()
+    for day, hour_, count, _ in rows:
+        by_day[(day + 6) % 7] += count  # dimanche = 0 en SQL, 6 en Python
+        by_hour[hour_] += count
+    return by_day, by_hour
@@ -0,0 +1,134 @@
+# taskflow/export.py
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from . import db
+from .models import Project, Task
+
+EXPORT_FORMATS = ("csv", "jsonl")
+MIMETYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+# Lignes lues par aller-retour (curseur serveur sur Postgres) et écrites par chunk HTTP
+EXPORT_CHUNK_ROWS = 1000
+
+# Colonnes de l'export utilisateur (jointure projet → tâches)
+TASK_EXPORT_COLUMNS = [
+    "project_id", "project_name", "project_description", "project_created_at",
+    "task_id", "title", "description", "status", "priority", "task_type",
+    "platform", "creator_stage", "due_date", "created_at", "updated_at", "completed_at",
+]
+
+# Sauvegarde par table : colonne qui rattache une ligne à un utilisateur
+_OWNER_COLUMNS = {
+    "user": "id",
+    "project": "owner_id",
+    "task": "owner_id",
+    "user_daily_stats": "user_id",
+    "task_event": "owner_id",
+}
+
+
+# ---------- LECTURE EN FLUX ----------
+
+def _stream(statement):
+    # yield_per → stream_results : lignes lues par paquets, jamais toutes en mémoire
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+    for row in result:
+        yield row._mapping
+
+
+def task_rows(user_id: int):
+    """Projets du user et leurs tâches (un projet vide = une ligne sans tâche)."""
+    statement = (
+        select(
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            Project.description.label("project_description"),
+            Project.created_at.label("project_created_at"),
+            Task.id.label("task_id"),
+            Task.title, Task.description, Task.status, Task.priority, Task.task_type,
+            Task.platform, Task.creator_stage, Task.due_date,
+            Task.created_at, Task.updated_at, Task.completed_at,
+        )
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .where(Project.owner_id == user_id)
+        .order_by(Project.id, Task.id)
+    )
+    return _stream(statement)
+
+
+def table_columns(name: str):
+    return [column.name for column in db.metadata.tables[name].columns]
+
+
+def table_rows(name: str, user_id: int = None):
+    """Lignes brutes d'une table (toutes, ou celles d'un user), dans l'ordre de la clé primaire."""
+    table = db.metadata.tables[name]
+    statement = select(table).order_by(*table.primary_key.columns)
+    if user_id is not None:
+        statement = statement.where(table.c[_OWNER_COLUMNS[name]] == user_id)
+    return _stream(statement)
+
+
+# ---------- ENCODAGE ----------
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(columns, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    """En-tête puis un chunk de texte toutes les `chunk_rows` lignes (None → cellule vide)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for n, row in enumerate(rows, 1):
+        writer.writerow([_plain(row[c]) for c in columns])
+        if n % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_jsonl(columns, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Un objet JSON par ligne, mêmes chunks que le CSV."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({c: _plain(row[c]) for c in columns}, ensure_ascii=False))
+        if len(lines) >= chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks, level=6):
+    """Compression gzip à la volée : on n'accumule que le tampon de zlib."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(fmt, columns, rows, compress=False):
+    """Itérateur de bytes (CSV ou JSON Lines, gzip optionnel), mémoire constante."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format d'export inconnu : {fmt!r} (choix : {', '.join(EXPORT_FORMATS)})")
+    encode = encode_csv if fmt == "csv" else encode_jsonl
+    chunks = (text.encode("utf-8") for text in encode(columns, rows))
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(stem, fmt, compress=False):
+    return f"{stem}.{fmt}" + (".gz" if compress else "")
+
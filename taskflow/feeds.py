@@ -0,0 +1,154 @@
+# taskflow/feeds.py
+import hashlib
+import secrets
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from . import db
+from .models import Project, Task
+
+# Fenêtre publiée dans le flux : un peu d'historique, surtout le planning à venir
+FEED_PAST_DAYS = 30
+FEED_FUTURE_DAYS = 365
+FEED_CHUNK_ROWS = 500
+
+PLATFORM_LABELS = {"tiktok": "TikTok", "instagram": "Instagram", "youtube": "YouTube", "other": "Autre"}
+STAGE_LABELS = {
+    "idea": "Idée",
+    "to_film": "À filmer",
+    "to_edit": "À monter",
+    "scheduled": "Programmé",
+    "published": "Publié",
+}
+
+
+def new_feed_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def feed_window(today: date = None):
+    today = today or date.today()
+    return today - timedelta(days=FEED_PAST_DAYS), today + timedelta(days=FEED_FUTURE_DAYS)
+
+
+# ---------- VALIDATEURS (GET conditionnel) ----------
+
+def feed_validators(user_id: int, project_id: int = None):
+    """
+    (etag, last_modified) du flux, sans lire une seule ligne de task :
+    max(updated_at) + count(*) sur l'index (owner_id, status, updated_at).
+    Le count couvre les suppressions, la date la fenêtre qui glisse chaque jour.
+    Les flux projet réutilisent les validateurs du user (plus large, mais toujours juste).
+    """
+    newest, total = db.session.execute(
+        select(func.max(Task.updated_at), func.count()).where(Task.owner_id == user_id)
+    ).one()
+    start, _ = feed_window()
+    raw = f"{user_id}:{project_id}:{start.isoformat()}:{newest}:{total}"
+    etag = hashlib.sha1(raw.encode()).hexdigest()[:20]
+    return etag, newest
+
+
+# ---------- FORMAT ICALENDAR (RFC 5545) ----------
+
+def _escape(text) -> str:
+    return (
+        str(text)
+        .replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Lignes de 75 octets max, suite préfixée d'un espace."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, current = [], b""
+    for char in line:
+        encoded = char.encode("utf-8")
+        if len(current) + len(encoded) > (75 if not parts else 74):
+            parts.append(current)
+            current = b""
+        current += encoded
+    parts.append(current)
+    return "\r\n ".join(p.decode("utf-8") for p in parts) + "\r\n"
+
+
+def _stamp(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event(row, host: str):
+    due = row.due_date.date()
+    platform = PLATFORM_LABELS.get(row.platform)
+    summary = f"[{platform}] {row.title}" if platform else row.title
+    if row.status == "done":
+        summary = f"✓ {summary}"
+
+    details = [f"Projet : {row.project_name}"]
+    if row.creator_stage:
+        details.append(f"Étape : {STAGE_LABELS.get(row.creator_stage, row.creator_stage)}")
+    details.append(f"Priorité : {row.priority}")
+    if row.description:
+        details.append("")
+        details.append(row.description)
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:task-{row.id}@{host}",
+        f"DTSTAMP:{_stamp(row.updated_at or row.created_at)}",
+        f"DTSTART;VALUE=DATE:{due.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(due + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(summary)}",
+        f"DESCRIPTION:{_escape(chr(10).join(details))}",
+        "TRANSP:TRANSPARENT",
+    ]
+    if platform:
+        lines.append(f"CATEGORIES:{_escape(platform)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def feed_rows(user_id: int, project_id: int = None):
+    """Tâches datées de la fenêtre, colonnes utiles uniquement, lues par paquets."""
+    start, end = feed_window()
+    statement = (
+        select(
+            Task.id, Task.title, Task.description, Task.status, Task.priority,
+            Task.platform, Task.creator_stage, Task.due_date,
+            Task.created_at, Task.updated_at, Project.name.label("project_name"),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(
+            Task.owner_id == user_id,
+            Task.due_date >= datetime.combine(start, datetime.min.time()),
+            Task.due_date < datetime.combine(end, datetime.min.time()),
+        )
+        .order_by(Task.due_date, Task.id)
+    )
+    if project_id is not None:
+        statement = statement.where(Task.project_id == project_id)
+    return db.session.execute(statement.execution_options(yield_per=FEED_CHUNK_ROWS))
+
+
+def ics_stream(rows, name: str, host: str):
+    """VCALENDAR en chunks de texte (un chunk par paquet de FEED_CHUNK_ROWS événements)."""
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//TaskFlow//Calendrier//FR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+        "X-PUBLISHED-TTL:PT15M",
+    ))
+    events = []
+    for row in rows:
+        events.append(_event(row, host))
+        if len(events) >= FEED_CHUNK_ROWS:
+            yield "".join(events)
+            events = []
+    yield "".join(events) + _fold("END:VCALENDAR")
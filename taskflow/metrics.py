@@ -0,0 +1,34 @@
+# taskflow/metrics.py
+import hmac
+from functools import wraps
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from . import db
+from .pool import pool_status
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+
+
+def metrics_token_required(view):
+    """
+    Endpoints d'exploitation : jeton METRICS_TOKEN en "Authorization: Bearer …".
+    Sans jeton configuré, l'endpoint n'existe pas (404).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get("METRICS_TOKEN")
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        # en octets : compare_digest refuse les str non ASCII (TypeError → 500)
+        if not token or not hmac.compare_digest(sent.encode(), token.encode()):
+            abort(404)
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+@metrics_bp.route("/pool")
+@metrics_token_required
+def pool():
+    """État du pool de connexions de CE worker."""
+    return jsonify(pool_status(db.engine))
@@ -2,7 +2,7 @@ from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from . import db, login_manager
+from . import db
 
 
 class User(UserMixin, db.Model):
@@ -18,6 +18,9 @@ class User(UserMixin, db.Model):
     # 🔥 Indique si l'utilisateur a terminé l'onboarding
     onboarding_done = db.Column(db.Boolean, default=False)
 
+    # 🔥 Jeton secret des abonnements calendrier (.ics) ; None = pas de flux
+    feed_token = db.Column(db.String(64), nullable=True, unique=True, index=True)
+
     def set_password(self, password: str):
         self.password_hash = generate_password_hash(password)
 
@@ -29,31 +32,54 @@ class User(UserMixin, db.Model):
         return self.user_type == "creator"
 
 
-@login_manager.user_loader
-def load_user(user_id: str):
-    return User.query.get(int(user_id))
-
-
 class Project(db.Model):
+    __table_args__ = (
+        db.Index("ix_project_owner_created", "owner_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # 🔥 Chaque projet appartient à un utilisateur
-    owner_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    owner = db.relationship("User", backref="projects")
+    owner_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    owner = db.relationship(
+        "User",
+        backref=db.backref("projects", cascade="all, delete-orphan", passive_deletes=True),
+    )
 
-    tasks = db.relationship("Task", backref="project", lazy=True)
+    # 🔥 ON DELETE CASCADE côté base : supprimer un projet ne charge pas ses tâches
+    tasks = db.relationship(
+        "Task", backref="project", lazy=True,
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
 
 
 class Task(db.Model):
+    # 🔥 Index composites pour les requêtes chaudes (voir migrations/)
+    __table_args__ = (
+        db.Index("ix_task_project_status_due", "project_id", "status", "due_date"),
+        db.Index("ix_task_owner_status_due", "owner_id", "status", "due_date"),
+        # 🔥 Listes paginées (keyset) : l'index se termine par la clé (created_at, id)
+        db.Index("ix_task_owner_type_stage_created", "owner_id", "task_type", "creator_stage", "created_at", "id"),
+        db.Index("ix_task_owner_type_due_created", "owner_id", "task_type", "due_date", "created_at", "id"),
+        db.Index("ix_task_project_status_created", "project_id", "status", "created_at", "id"),
+        db.Index("ix_task_owner_status_updated", "owner_id", "status", "updated_at"),
+        db.Index("ix_task_owner_due", "owner_id", "due_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("project.id"), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
+
+    # 🔥 Copie de Project.owner_id : évite la jointure sur project
+    # pour toutes les requêtes "tâches de l'utilisateur"
+    owner_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
 
     # Tâche de base
     title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text, nullable=True)
+    # 🔥 Texte libre, non borné : chargé à la demande (undefer dans task_detail / drawer / edit)
+    description = db.deferred(db.Column(db.Text, nullable=True))
 
     # Workflow général
     status = db.Column(db.String(20), default="todo")  # todo / in_progress / done
@@ -67,9 +93,43 @@ class Task(db.Model):
     platform = db.Column(db.String(20), nullable=True)
     creator_stage = db.Column(db.String(20), nullable=True)
 
-    assigned_to = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    assigned_to = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
     due_date = db.Column(db.DateTime, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # NOT NULL : clé de pagination (created_at, id)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # 🔥 Date de passage en "done" (None si la tâche n'est pas terminée)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+
+class UserDailyStats(db.Model):
+    """Rollup : tâches terminées par utilisateur et par jour (heatmap, analytics)."""
+    __tablename__ = "user_daily_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    done_general = db.Column(db.Integer, nullable=False, default=0)
+    done_content = db.Column(db.Integer, nullable=False, default=0)
+
+
+class TaskEvent(db.Model):
+    """
+    Journal append-only des changements d'une tâche.
+    kind = "status" | "stage" | "due_date" ; from_status / to_status = anciennes / nouvelles valeurs.
+    Pas de FK sur task_id : les suppressions de tâches (projet, compte, lot) purgent
+    leurs lignes explicitement (events.forget_task_events).
+    """
+    __tablename__ = "task_event"
+    __table_args__ = (
+        db.Index("ix_task_event_owner_at", "owner_id", "at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    kind = db.Column(db.String(10), nullable=False, default="status")
+    from_status = db.Column(db.String(20), nullable=True)
+    to_status = db.Column(db.String(20), nullable=True)
+    at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
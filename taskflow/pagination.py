@@ -0,0 +1,96 @@
+# taskflow/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+PAGE_SIZE = 50
+
+
+def encode_cursor(values):
+    """Curseur opaque (base64 url-safe) à partir des valeurs de tri de la dernière ligne."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _coerce(column, value):
+    """Valeur du curseur au type Python de la colonne ; ValueError si elle ne colle pas."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        python_type = None  # expression sans type connu (ex. rang plein texte)
+
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value)
+    # bool est un int pour Python, jamais une valeur de tri valable ici
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(value)
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if python_type is not None and not isinstance(value, python_type):
+        raise ValueError(value)
+    return value
+
+
+def decode_cursor(cursor: str, columns):
+    """
+    Inverse de encode_cursor ; None si le curseur est absent ou invalide
+    (forgé : chaque valeur doit avoir le type de sa colonne, sinon la base lèverait).
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != len(columns):
+        return None
+
+    try:
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_query(query, columns, cursor=None, limit=PAGE_SIZE, descending=True):
+    """
+    Pagination par clé (keyset) : WHERE (a, b) < (:a, :b) ORDER BY a, b LIMIT n + 1.
+    `columns` doit se terminer par une colonne unique (ex. Task.id).
+    """
+    after = decode_cursor(cursor, columns)
+    if after is not None:
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(None).order_by(*order).limit(limit + 1)
+
+
+def keyset_page(query, columns, cursor=None, limit=PAGE_SIZE, descending=True):
+    """Exécute keyset_query ; retourne (lignes, curseur_suivant ou None)."""
+    rows = keyset_query(query, columns, cursor, limit, descending).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([_value(rows[-1], c) for c in columns])
+    return rows, next_cursor
+
+
+def _value(row, column):
+    # Row(Task, rang) → par expression ; instance ORM → par attribut
+    if hasattr(row, "_mapping"):
+        try:
+            return row._mapping[column]
+        except KeyError:
+            row = row[0]
+    return getattr(row, column.key)
@@ -0,0 +1,234 @@
+# taskflow/pool.py
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+# ---------- PROFILS DE POOL ----------
+
+# Options d'engine par type d'hébergement Postgres (DB_POOL_PROFILE)
+POOL_PROFILES = {
+    # Neon coupe les connexions inactives (~5 min) et réveille le compute à la demande :
+    # petit pool, recyclage avant la coupure, ping avant chaque emprunt.
+    # Endpoint poolé (hôte en -pooler) = PgBouncer en mode transaction, cf. ci-dessous
+    "neon-serverless": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 240,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 15000,
+    },
+    # PgBouncer en mode transaction : le vrai pool est côté PgBouncer.
+    # Pas de statement_timeout côté app : un SET de session ne suit pas la connexion
+    # serveur → le régler sur le rôle (ALTER ROLE … SET statement_timeout = …)
+    "pgbouncer-transaction": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": None,
+    },
+    # Postgres dédié, connexions stables
+    "dedicated": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+}
+
+DEFAULT_POSTGRES_PROFILE = "neon-serverless"
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool qui mesure l'attente pour obtenir une connexion (pool plein, connexion lente)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.incr("timeouts")
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - started)
+
+
+def _profile(profile: str = None):
+    name = profile or DEFAULT_POSTGRES_PROFILE
+    if name not in POOL_PROFILES:
+        raise ValueError(
+            f"DB_POOL_PROFILE inconnu : {name!r} (choix : {', '.join(POOL_PROFILES)})"
+        )
+    return POOL_PROFILES[name]
+
+
+def is_transaction_pooled(uri: str, profile: str = None) -> bool:
+    """PgBouncer en mode transaction : profil dédié ou endpoint poolé de Neon (-pooler)."""
+    host = make_url(uri).host or ""
+    return profile == "pgbouncer-transaction" or "-pooler" in host
+
+
+def engine_options(uri: str, profile: str = None):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS pour le profil demandé.
+    SQLite (dev) : options par défaut de SQLAlchemy.
+    Aucun paramètre de démarrage (options=-c …) : PgBouncer / Neon poolé les refusent,
+    le statement_timeout passe par instrument() → cf. statement_timeout().
+    """
+    if not uri.startswith("postgresql"):
+        return {}
+
+    options = dict(_profile(profile))
+    options.pop("statement_timeout_ms")
+    options["poolclass"] = TimedQueuePool
+    options["connect_args"] = {"application_name": "taskflow", "connect_timeout": 10}
+    return options
+
+
+def statement_timeout(uri: str, profile: str = None, statement_timeout_ms: int = None):
+    """
+    statement_timeout (ms) à poser à la connexion, ou None.
+    None derrière un pooler en mode transaction : le SET resterait sur une connexion
+    serveur partagée par d'autres clients (ou serait perdu) → réglage sur le rôle.
+    """
+    if not uri.startswith("postgresql") or is_transaction_pooled(uri, profile):
+        return None
+    timeout = _profile(profile)["statement_timeout_ms"]
+    if statement_timeout_ms is not None:
+        timeout = statement_timeout_ms or None
+    return int(timeout) if timeout else None
+
+
+def set_statement_timeout(dbapi_conn, timeout_ms: int):
+    """SET statement_timeout sur une connexion DBAPI neuve (commit : sinon annulé au rollback)."""
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+    finally:
+        cursor.close()
+    dbapi_conn.commit()
+
+
+# ---------- MÉTRIQUES ----------
+
+class PoolStats:
+    """Compteurs du pool du process courant (un jeu par worker gunicorn)."""
+
+    WINDOW = 1000  # dernières attentes gardées pour les percentiles
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.invalidated = 0
+            self.timeouts = 0
+            self._waits = deque(maxlen=self.WINDOW)
+            self._wait_max = 0.0
+
+    def incr(self, counter: str):
+        # `+= 1` n'est pas atomique entre threads (workers à threads, pré-chauffage)
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self._waits.append(seconds)
+            self._wait_max = max(self._wait_max, seconds)
+
+    def wait_summary(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            wait_max = self._wait_max
+        if not waits:
+            return {"samples": 0}
+        return {
+            "samples": len(waits),
+            "avg_ms": round(sum(waits) / len(waits) * 1000, 2),
+            "p95_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2),
+            "max_ms": round(wait_max * 1000, 2),
+        }
+
+
+pool_stats = PoolStats()
+
+
+def instrument(engine, statement_timeout_ms: int = None):
+    """
+    Branche les compteurs sur les événements du pool (une fois par engine)
+    et pose le statement_timeout sur chaque nouvelle connexion.
+    """
+    if getattr(engine, "_taskflow_pool_events", False):
+        return
+    engine._taskflow_pool_events = True
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        pool_stats.incr("connects")
+        if statement_timeout_ms:
+            set_statement_timeout(dbapi_conn, statement_timeout_ms)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        pool_stats.incr("checkouts")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, error):
+        pool_stats.incr("invalidated")
+
+
+def pool_status(engine):
+    """Photo du pool : connexions empruntées, libres, en débordement + attentes."""
+    pool = engine.pool
+    status = {
+        "pool": type(pool).__name__,
+        "connects": pool_stats.connects,
+        "checkouts": pool_stats.checkouts,
+        "invalidated": pool_stats.invalidated,
+        "timeouts": pool_stats.timeouts,
+        "wait": pool_stats.wait_summary(),
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # overflow() est négatif tant que le pool n'est pas rempli
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    return status
+
+
+def prewarm(engine, connections: int):
+    """
+    Ouvre `connections` connexions d'avance (au démarrage du worker) :
+    le premier utilisateur ne paie ni le réveil de Neon ni le handshake TLS.
+    """
+    if not isinstance(engine.pool, QueuePool) or connections <= 0:
+        return 0
+
+    connections = min(connections, engine.pool.size())
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.exec_driver_sql("SELECT 1")
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()  # retour au pool, la connexion reste ouverte
+    return len(opened)
@@ -0,0 +1,122 @@
+# taskflow/profiling.py
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger("taskflow.sql")
+
+# Normalisation des requêtes : littéraux et listes IN → "?"
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Forme normalisée d'une requête (même forme = même requête aux paramètres près)."""
+    sql = _LITERAL_RE.sub("?", statement)
+    sql = _IN_LIST_RE.sub("(?)", sql)
+    return _SPACES_RE.sub(" ", sql).strip()
+
+
+def _shorten(sql: str, size: int = 240) -> str:
+    # début (SELECT …) + fin (WHERE …) : c'est la fin qui identifie le N+1
+    if len(sql) <= size:
+        return sql
+    return f"{sql[:size // 2]} … {sql[-size // 2:]}"
+
+
+class SQLProfiler:
+    """
+    Instrumentation par requête HTTP (opt-in : SQL_PROFILING=1) :
+    nombre de requêtes, temps SQL, requêtes répétées (N+1),
+    en-tête Server-Timing et une ligne de log JSON (logger "taskflow.sql").
+    """
+
+    def __init__(self, app=None):
+        self.threshold = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get("SQL_PROFILING"):
+            return
+        self.threshold = app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 5)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(levelname)s %(name)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+        from . import db
+        with app.app_context():
+            self._listen(db.engine)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.extensions["sql_profiler"] = self
+
+    # ---------- Événements SQLAlchemy ----------
+
+    def _listen(self, engine):
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("tf_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["tf_started"].pop()
+            if has_request_context() and "sql_stats" in g:
+                stats = g.sql_stats
+                stats["count"] += 1
+                stats["seconds"] += elapsed
+                stats["statements"][fingerprint(statement)] += 1
+
+    # ---------- Hooks Flask ----------
+
+    def _start(self):
+        g.sql_stats = {"count": 0, "seconds": 0.0, "statements": Counter()}
+        g.request_started = time.perf_counter()
+
+    def _finish(self, response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - g.request_started) * 1000
+        db_ms = stats["seconds"] * 1000
+        repeated = [
+            {"statement": _shorten(sql), "count": n}
+            for sql, n in stats["statements"].most_common()
+            if n >= self.threshold
+        ]
+
+        response.headers.add(
+            "Server-Timing", f'db;dur={db_ms:.1f};desc="{stats["count"]} queries"'
+        )
+        response.headers.add("Server-Timing", f"app;dur={total_ms:.1f}")
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "queries": stats["count"],
+            "db_ms": round(db_ms, 1),
+            "total_ms": round(total_ms, 1),
+        }
+        if repeated:
+            record["n_plus_one"] = repeated
+        logger.log(
+            logging.WARNING if repeated else logging.INFO,
+            json.dumps(record, ensure_ascii=False),
+        )
+        return response
+
+
+sql_profiler = SQLProfiler()
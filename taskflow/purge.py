@@ -0,0 +1,36 @@
+# taskflow/purge.py
+from sqlalchemy import select
+
+from . import db
+from .events import forget_task_events
+from .models import Project, Task, TaskEvent, User, UserDailyStats
+from .rollup import forget_done_tasks
+
+# Suppressions "ensemblistes" : un DELETE … WHERE par table, quel que soit le volume.
+# Les FK sont en ON DELETE CASCADE (Postgres) ; les DELETE explicites couvrent
+# SQLite, qui n'applique pas les FK sans PRAGMA foreign_keys.
+
+
+def delete_project(project_id: int):
+    """Supprime un projet et ses tâches (rollup analytics et journal mis à jour)."""
+    tasks = Task.query.filter(Task.project_id == project_id)
+    forget_done_tasks(tasks)
+    owner_id = db.session.scalar(select(Project.owner_id).where(Project.id == project_id))
+    forget_task_events(owner_id, select(Task.id).where(Task.project_id == project_id))
+    tasks.delete(synchronize_session=False)
+    Project.query.filter(Project.id == project_id).delete(synchronize_session=False)
+
+
+def delete_account(user_id: int):
+    """Supprime un utilisateur et tout ce qui lui appartient."""
+    Task.query.filter(Task.assigned_to == user_id).update(
+        {Task.assigned_to: None}, synchronize_session=False
+    )
+    for model, column in (
+        (TaskEvent, TaskEvent.owner_id),
+        (UserDailyStats, UserDailyStats.user_id),
+        (Task, Task.owner_id),
+        (Project, Project.owner_id),
+        (User, User.id),
+    ):
+        model.query.filter(column == user_id).delete(synchronize_session=False)
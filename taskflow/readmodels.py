@@ -0,0 +1,161 @@
+# taskflow/readmodels.py
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+
+from sqlalchemy import case, func, or_, select
+
+from . import db
+from .models import Project, Task
+
+# Étapes du pipeline créateur (colonne "none" : étape vide ou inconnue)
+PIPELINE_STAGES = ("idea", "to_film", "to_edit", "scheduled", "published")
+
+# Longueur de l'aperçu de description dans les cartes (texte complet :
+# task_detail, task_drawer, edit_task seulement)
+EXCERPT_LENGTH = 160
+
+
+@dataclass(frozen=True, slots=True)
+class TaskCard:
+    """
+    Tâche telle qu'affichée dans une liste (today, pipeline, backlog, recherche,
+    calendrier, kanban projet) : lecture seule, sans instance ORM ni identity map.
+    """
+
+    id: int
+    project_id: int
+    project_name: str
+    title: str
+    excerpt: str | None
+    status: str
+    priority: str
+    task_type: str
+    platform: str | None
+    creator_stage: str | None
+    due_date: datetime | None
+    created_at: datetime
+
+
+_FIELDS = tuple(f.name for f in fields(TaskCard))
+
+# 🔥 Projection : seules les colonnes affichées, description tronquée côté SQL,
+# nom du projet joint (plus de t.project chargé tâche par tâche)
+CARD_COLUMNS = (
+    Task.id,
+    Task.project_id,
+    Project.name.label("project_name"),
+    Task.title,
+    func.substr(Task.description, 1, EXCERPT_LENGTH + 1).label("excerpt"),
+    Task.status,
+    Task.priority,
+    Task.task_type,
+    Task.platform,
+    Task.creator_stage,
+    Task.due_date,
+    Task.created_at,
+)
+
+
+def card_query():
+    """Query des cartes (filtres / tri / pagination comme Task.query)."""
+    return db.session.query(*CARD_COLUMNS).join(Project, Project.id == Task.project_id)
+
+
+def to_card(row):
+    """Row de card_query() (éventuellement suivie d'autres colonnes, ex. rang) → TaskCard."""
+    if row is None:
+        return None
+    values = row._mapping
+    excerpt = values["excerpt"]
+    if excerpt and len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rstrip() + "…"
+    return TaskCard(**{name: values[name] for name in _FIELDS if name != "excerpt"}, excerpt=excerpt)
+
+
+def to_cards(rows):
+    return [to_card(row) for row in rows]
+
+
+# ---------- REQUÊTES DES LISTES (routes + flask check-indexes) ----------
+
+def today_cards_query(user_id: int, day: date):
+    """Tâches non terminées dont l'échéance tombe le jour `day`."""
+    return (
+        card_query()
+        .filter(
+            Task.owner_id == user_id,
+            Task.due_date.isnot(None),
+            Task.due_date >= datetime.combine(day, datetime.min.time()),
+            Task.due_date <= datetime.combine(day, datetime.max.time()),
+            Task.status != "done",
+        )
+        .order_by(Task.priority.desc(), Task.created_at.desc())
+    )
+
+
+def in_progress_cards_query(user_id: int):
+    return (
+        card_query()
+        .filter(Task.owner_id == user_id, Task.status == "in_progress")
+        .order_by(Task.priority.desc(), Task.created_at.desc())
+    )
+
+
+def pipeline_criteria(user_id: int):
+    # toutes les tâches de contenu du user (non terminées)
+    return (
+        Task.owner_id == user_id,
+        Task.task_type == "content",
+        Task.status != "done",
+    )
+
+
+def pipeline_column_query(user_id: int, stage: str):
+    """Une colonne du pipeline (pages suivantes, "Charger plus")."""
+    query = card_query().filter(*pipeline_criteria(user_id))
+    if stage == "none":
+        return query.filter(or_(
+            Task.creator_stage.is_(None),
+            Task.creator_stage.notin_(PIPELINE_STAGES),
+        ))
+    return query.filter(Task.creator_stage == stage)
+
+
+def pipeline_first_pages_query(user_id: int, per_column: int):
+    """
+    Première page de chaque colonne du pipeline + effectif de la colonne, en une requête :
+    row_number() / count() OVER (PARTITION BY étape), au plus `per_column` cartes par colonne.
+    """
+    stage = case(
+        (Task.creator_stage.in_(PIPELINE_STAGES), Task.creator_stage), else_="none"
+    ).label("stage_key")
+    ranked = (
+        card_query()
+        .add_columns(
+            stage,
+            func.row_number().over(
+                partition_by=stage, order_by=(Task.created_at.desc(), Task.id.desc())
+            ).label("stage_rank"),
+            func.count().over(partition_by=stage).label("stage_count"),
+        )
+        .filter(*pipeline_criteria(user_id))
+        .subquery()
+    )
+    return (
+        select(ranked)
+        .where(ranked.c.stage_rank <= per_column)
+        .order_by(ranked.c.stage_key, ranked.c.stage_rank)
+    )
+
+
+def backlog_cards_query(user_id: int, kind: str):
+    """Boîte à idées (kind="ideas") ou contenus sans date (kind="no_date")."""
+    query = card_query().filter(Task.owner_id == user_id, Task.task_type == "content")
+    if kind == "ideas":
+        return query.filter(Task.creator_stage == "idea")
+    return query.filter(Task.due_date.is_(None), Task.status != "done")
+
+
+def project_column_query(project_id: int, status: str):
+    """Une colonne du Kanban projet."""
+    return card_query().filter(Task.project_id == project_id, Task.status == status)
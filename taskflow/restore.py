@@ -0,0 +1,369 @@
+# taskflow/restore.py
+import csv
+import gzip
+import json
+import os
+import re
+import tempfile
+from datetime import date, datetime
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, bindparam, func, select, text
+
+from . import db
+from .events import seed_done_events
+from .models import Project, Task, TaskEvent
+from .rollup import backfill
+
+# Ordre de chargement (clés étrangères) ; les autres tables (alembic_version…) sont ignorées
+LOAD_ORDER = ["user", "project", "task", "user_daily_stats", "task_event"]
+
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+
+class RestoreError(ValueError):
+    pass
+
+
+# ---------- FORMAT TEXTE DE COPY ----------
+
+_COPY_RE = re.compile(r'^COPY\s+(?:"?\w+"?\.)?"?(\w+)"?\s+\((.*)\)\s+FROM stdin;')
+_COPY_ESCAPE_RE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9a-fA-F]{1,2})|(.))")
+_COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def _copy_unescape(match):
+    octal, hexa, char = match.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    return _COPY_ESCAPES.get(char, char)
+
+
+def decode_copy_line(line: str):
+    """Une ligne COPY (texte) → liste de valeurs (None pour \\N)."""
+    return [
+        None if field == r"\N" else _COPY_ESCAPE_RE.sub(_copy_unescape, field)
+        for field in line.rstrip("\n").split("\t")
+    ]
+
+
+def encode_copy_value(value) -> str:
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return (
+        str(value)
+        .replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    )
+
+
+# ---------- SOURCES ----------
+
+class TableData:
+    """Lignes d'une table à charger : COPY brut (spool disque) ou dicts (CSV / JSON)."""
+
+    def __init__(self, name, columns, spool=None, rows=None):
+        self.name = name
+        self.columns = columns
+        self.spool = spool
+        self._rows = rows
+
+    def rows(self):
+        if self.spool is not None:
+            self.spool.seek(0)
+            for raw in self.spool:
+                yield dict(zip(self.columns, decode_copy_line(raw.decode("utf-8"))))
+        else:
+            yield from self._rows()
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _stem(path):
+    name = os.path.basename(path)
+    for suffix in (".gz", ".csv", ".jsonl", ".json"):
+        name = name.removesuffix(suffix)
+    return name
+
+
+def read_pg_dump(path):
+    """Blocs COPY … FROM stdin d'un pg_dump (format texte), lus en flux ; le DDL est ignoré."""
+    tables, current, spool = {}, None, None
+    with _open(path) as f:
+        for line in f:
+            if spool is None:
+                match = _COPY_RE.match(line)
+                if match:
+                    columns = [c.strip().strip('"') for c in match.group(2).split(",")]
+                    current = (match.group(1), columns)
+                    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            elif line.rstrip("\r\n") == "\\.":
+                name, columns = current
+                tables[name] = TableData(name, columns, spool=spool)
+                spool = None
+            else:
+                spool.write(line.encode("utf-8"))
+    return tables
+
+
+def _csv_table(path):
+    with _open(path) as f:
+        columns = next(csv.reader(f), [])
+
+    def rows():
+        with _open(path) as f:
+            for row in csv.DictReader(f):
+                yield {k: (v if v != "" else None) for k, v in row.items()}
+
+    return TableData(_stem(path), columns, rows=rows)
+
+
+def _jsonl_table(path):
+    with _open(path) as f:
+        first = f.readline()
+    columns = list(json.loads(first)) if first.strip() else []
+
+    def rows():
+        with _open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return TableData(_stem(path), columns, rows=rows)
+
+
+def _json_tables(path):
+    # {"user": [{…}, …], "task": [...]}
+    with _open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise RestoreError(f"{path} : objet JSON {{table: [lignes]}} attendu")
+    return {
+        name: TableData(name, list(rows[0]) if rows else [], rows=lambda rows=rows: iter(rows))
+        for name, rows in data.items()
+    }
+
+
+def read_source(path):
+    """{table: TableData} pour un pg_dump (.sql), un CSV / JSONL par table, un JSON ou un dossier."""
+    if os.path.isdir(path):
+        tables = {}
+        for name in sorted(os.listdir(path)):
+            full = os.path.join(path, name)
+            if os.path.isfile(full) and _stem(name) != name:
+                tables.update(read_source(full))
+        return tables
+
+    plain = path.removesuffix(".gz")
+    if plain.endswith(".sql"):
+        return read_pg_dump(path)
+    if plain.endswith(".csv"):
+        table = _csv_table(path)
+        return {table.name: table}
+    if plain.endswith(".jsonl"):
+        table = _jsonl_table(path)
+        return {table.name: table}
+    if plain.endswith(".json"):
+        return _json_tables(path)
+    raise RestoreError(f"format non reconnu : {path} (.sql, .csv, .jsonl, .json, éventuellement .gz)")
+
+
+# ---------- CONVERSIONS ----------
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("t", "true", "1", "yes", "on")
+
+
+def _to_datetime(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _converter(column_type):
+    """Texte (COPY / CSV) → valeur Python attendue par la colonne (moteurs hors COPY)."""
+    if isinstance(column_type, Boolean):
+        convert = _to_bool
+    elif isinstance(column_type, DateTime):
+        convert = _to_datetime
+    elif isinstance(column_type, Date):
+        convert = _to_date
+    elif isinstance(column_type, Integer):
+        convert = int
+    elif isinstance(column_type, Float):
+        convert = float
+    else:
+        return lambda value: value
+    return lambda value: None if value is None else convert(value)
+
+
+def _derived_columns(table, columns):
+    """Colonnes absentes des anciens dumps mais obligatoires aujourd'hui."""
+    derived = {}
+    if table.name == "task" and "owner_id" not in columns:
+        # task.owner_id (4d78e3146141) = propriétaire du projet, déjà chargé
+        owners = dict(db.session.execute(select(Project.id, Project.owner_id)).all())
+        derived["owner_id"] = lambda row: owners.get(int(row["project_id"]))
+    if table.name == "task" and "created_at" in columns:
+        # task.created_at NOT NULL (5b2e7c41d9a0) : même repli que la migration
+        derived["created_at"] = lambda row: _to_datetime(
+            row["created_at"] or row.get("updated_at") or row.get("completed_at")
+            or datetime.utcnow()
+        )
+    return derived
+
+
+# ---------- CHARGEMENT ----------
+
+def _copy_postgres(table, columns, data, derived):
+    """COPY … FROM STDIN : le dump brut est rejoué tel quel quand les colonnes collent."""
+    if data.spool is not None and not derived and columns == data.columns:
+        source = data.spool
+        source.seek(0)
+    else:
+        source = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        for row in data.rows():
+            values = [row.get(c) for c in columns] + [fn(row) for fn in derived.values()]
+            source.write(("\t".join(encode_copy_value(v) for v in values) + "\n").encode("utf-8"))
+        source.seek(0)
+
+    quote = db.engine.dialect.identifier_preparer.quote
+    names = ", ".join(quote(c) for c in [*columns, *derived])
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {quote(table.name)} ({names}) FROM STDIN", source)
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _insert_batches(table, columns, data, derived, batch):
+    """INSERT groupés (executemany) par lots de `batch` lignes."""
+    converters = {c: _converter(table.c[c].type) for c in columns}
+    total, pending = 0, []
+    for row in data.rows():
+        values = {c: converters[c](row.get(c)) for c in columns}
+        for column, fn in derived.items():
+            values[column] = fn(row)
+        pending.append(values)
+        if len(pending) >= batch:
+            db.session.execute(table.insert(), pending)
+            total += len(pending)
+            pending = []
+    if pending:
+        db.session.execute(table.insert(), pending)
+        total += len(pending)
+    return total
+
+
+def _sqlite_triggers(names):
+    rows = db.session.execute(
+        text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN :names")
+        .bindparams(bindparam("names", expanding=True)),
+        {"names": list(names)},
+    ).all()
+    return [(name, sql) for name, sql in rows]
+
+
+def restore(path, replace=False, batch=5000, echo=print):
+    """
+    Charge `path` dans la base configurée, en une transaction.
+    Index secondaires (et triggers FTS sur SQLite) supprimés pendant le chargement,
+    puis recréés ; séquences Postgres recalées ; tables dérivées absentes de la
+    source (anciens dumps) reconstruites depuis task ; ANALYZE.
+    Retourne {table: lignes chargées}.
+    """
+    sources = read_source(path)
+    metadata = db.metadata.tables
+    names = [n for n in LOAD_ORDER if n in sources]
+    for skipped in sorted(set(sources) - set(names)):
+        echo(f"  table ignorée : {skipped}")
+    if not names:
+        raise RestoreError("aucune table connue dans la source")
+
+    dialect = db.engine.dialect.name
+    conn = db.session.connection()
+
+    # Tables cibles vides, ou vidées avec --replace (ordre inverse des FK)
+    for name in reversed(names):
+        table = metadata[name]
+        if db.session.execute(select(func.count()).select_from(table)).scalar():
+            if not replace:
+                raise RestoreError(f"la table {name} n'est pas vide (utiliser --replace)")
+            db.session.execute(table.delete())
+
+    # Index + triggers retirés pendant le chargement (recréés en une passe à la fin)
+    indexes = [index for n in names for index in metadata[n].indexes]
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    triggers = _sqlite_triggers(names) if dialect == "sqlite" else []
+    for trigger, _ in triggers:
+        db.session.execute(text(f'DROP TRIGGER "{trigger}"'))
+
+    loaded = {}
+    for name in names:
+        table, data = metadata[name], sources[name]
+        columns = [c for c in data.columns if c in table.c]
+        derived = _derived_columns(table, columns)
+        columns = [c for c in columns if c not in derived]
+        if dialect == "postgresql":
+            loaded[name] = _copy_postgres(table, columns, data, derived)
+        else:
+            loaded[name] = _insert_batches(table, columns, data, derived, batch)
+        echo(f"  {name:<18} {loaded[name]} ligne(s)")
+
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+    for _, sql in triggers:
+        db.session.execute(text(sql))
+
+    if dialect == "sqlite":
+        for name in names:
+            fts = f"{name}_fts"
+            if db.inspect(conn).has_table(fts):
+                db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for name in names:
+            if "id" in metadata[name].c and metadata[name].c.id.autoincrement is not False:
+                quoted = db.engine.dialect.identifier_preparer.quote(name)
+                db.session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{quoted}', 'id'), "
+                    f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {quoted}"
+                ))
+
+    db.session.commit()
+
+    # Anciens dumps : rollup (et completed_at) d'abord, puis journal daté de completed_at
+    if "task" in loaded:
+        if "user_daily_stats" not in loaded:
+            backfill()
+            echo("  user_daily_stats recalculé.")
+        if "task_event" not in loaded:
+            # journal des mêmes comptes (restauration précédente, --replace) : remplacé, pas doublé
+            db.session.execute(
+                TaskEvent.__table__.delete().where(
+                    TaskEvent.owner_id.in_(select(Task.owner_id).distinct())
+                )
+            )
+            seeded = seed_done_events(db.session)
+            db.session.commit()
+            echo(f"  task_event : {seeded} passage(s) en done reconstruit(s).")
+
+    # hors transaction (VACUUM / ANALYZE)
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+    return loaded
@@ -0,0 +1,162 @@
+# taskflow/rollup.py
+from datetime import datetime, date
+
+from sqlalchemy import Date, case, cast, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import Task, UserDailyStats
+from .events import log_event
+
+
+def day_of(column):
+    """Expression SQL "date du jour" d'une colonne DateTime, selon le moteur."""
+    if db.engine.dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+def _split(task_type, n):
+    """(done_general, done_content) pour n tâches du type donné."""
+    return (0, n) if task_type == "content" else (n, 0)
+
+
+def _bump(user_id: int, day: date, general: int = 0, content: int = 0):
+    """Ajoute (ou retire) des tâches terminées au rollup du jour, en upsert."""
+    if not general and not content:
+        return
+
+    dialect = db.engine.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(UserDailyStats).values(
+            user_id=user_id, day=day, done_general=general, done_content=content
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day"],
+            set_={
+                "done_general": UserDailyStats.done_general + general,
+                "done_content": UserDailyStats.done_content + content,
+            },
+        )
+        db.session.execute(stmt)
+        return
+
+    row = db.session.get(UserDailyStats, (user_id, day))
+    if row is None:
+        row = UserDailyStats(user_id=user_id, day=day, done_general=0, done_content=0)
+        db.session.add(row)
+    row.done_general += general
+    row.done_content += content
+
+
+def _completion_day(task):
+    return (task.completed_at or task.updated_at or datetime.utcnow()).date()
+
+
+# ---------- Mises à jour (appelées par les routes) ----------
+
+def set_task_status(task, new_status: str):
+    """Change le statut d'une tâche : completed_at, rollup et journal task_event."""
+    was_done = task.status == "done"
+    is_done = new_status == "done"
+    now = datetime.utcnow()
+
+    log_event(task, "status", task.status, new_status, at=now)
+
+    if is_done and not was_done:
+        task.completed_at = now
+        _bump(task.owner_id, task.completed_at.date(), *_split(task.task_type, 1))
+    elif was_done and not is_done:
+        _bump(task.owner_id, _completion_day(task), *_split(task.task_type, -1))
+        task.completed_at = None
+
+    task.status = new_status
+
+
+def set_task_type(task, new_type: str):
+    """Change le type d'une tâche ; une tâche terminée change de colonne dans le rollup."""
+    if task.status == "done" and (task.task_type == "content") != (new_type == "content"):
+        day = _completion_day(task)
+        _bump(task.owner_id, day, *_split(task.task_type, -1))
+        _bump(task.owner_id, day, *_split(new_type, 1))
+
+    task.task_type = new_type
+
+
+def forget_done_tasks(task_query):
+    """À appeler AVANT de supprimer des tâches : les retire du rollup."""
+    is_content = case((Task.task_type == "content", 1), else_=0)
+    day = day_of(func.coalesce(Task.completed_at, Task.updated_at))
+    rows = (
+        task_query
+        .filter(Task.status == "done")
+        .with_entities(
+            Task.owner_id,
+            day.label("day"),
+            func.count().label("total"),
+            func.sum(is_content).label("content"),
+        )
+        .group_by(Task.owner_id, day)
+        .all()
+    )
+    for owner_id, d, total, content in rows:
+        if isinstance(d, str):
+            d = date.fromisoformat(d)
+        _bump(owner_id, d, -(total - (content or 0)), -(content or 0))
+
+
+# ---------- Lecture ----------
+
+def completions_query(user_id: int, since: date):
+    return UserDailyStats.query.filter(UserDailyStats.user_id == user_id, UserDailyStats.day >= since)
+
+
+def completions_since(user_id: int, since: date):
+    """{jour: (général, contenu)} depuis `since` (au plus quelques centaines de lignes)."""
+    rows = completions_query(user_id, since).all()
+    return {r.day: (r.done_general, r.done_content) for r in rows}
+
+
+# ---------- Backfill ----------
+
+def backfill(user_id: int = None):
+    """Recalcule le rollup depuis la table task (tous les users ou un seul)."""
+    # Tâches terminées avant l'existence de completed_at : updated_at fait foi
+    missing = Task.query.filter(Task.status == "done", Task.completed_at.is_(None))
+    if user_id is not None:
+        missing = missing.filter(Task.owner_id == user_id)
+    missing.update(
+        # updated_at réécrit tel quel : sinon son onupdate le remettrait à maintenant
+        {Task.completed_at: Task.updated_at, Task.updated_at: Task.updated_at},
+        synchronize_session=False,
+    )
+
+    existing = UserDailyStats.query
+    if user_id is not None:
+        existing = existing.filter(UserDailyStats.user_id == user_id)
+    existing.delete(synchronize_session=False)
+
+    is_content = case((Task.task_type == "content", 1), else_=0)
+    is_general = case((Task.task_type == "content", 0), else_=1)
+    day = day_of(Task.completed_at)
+    select = (
+        db.select(
+            Task.owner_id,
+            day,
+            func.sum(is_general),
+            func.sum(is_content),
+        )
+        .where(Task.status == "done", Task.completed_at.isnot(None))
+        .group_by(Task.owner_id, day)
+    )
+    if user_id is not None:
+        select = select.where(Task.owner_id == user_id)
+
+    db.session.execute(
+        db.insert(UserDailyStats).from_select(
+            ["user_id", "day", "done_general", "done_content"], select
+        )
+    )
+    db.session.commit()
@@ -2,17 +2,72 @@
 
 import calendar
 from datetime import datetime, date, timedelta
-import calendar as pycal
-from sqlalchemy import or_
 
-from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash
-from flask_login import login_required, current_user
+from flask import (
+    Blueprint, Response, abort, flash, jsonify, redirect, render_template, request,
+    stream_with_context, url_for,
+)
+from flask_login import login_required, current_user, logout_user
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
+from werkzeug.http import is_resource_modified
 from .models import User, Project, Task, db
-from flask import jsonify
+from .stats import get_task_stats, open_counts_by_project
+from .cache import cached_view, conditional_view, view_cache
+from .search import search_projects, search_tasks
+from .events import completion_histogram, forget_task_events, log_event
+from .rollup import completions_since, forget_done_tasks, set_task_status, set_task_type
+from .agenda import (
+    MAX_RANGE_DAYS,
+    bucket_by_day,
+    month_window,
+    task_to_dict,
+    week_window,
+    window_tasks_query,
+)
+from .pagination import PAGE_SIZE, encode_cursor, keyset_page
+from .readmodels import (
+    PIPELINE_STAGES,
+    backlog_cards_query,
+    card_query,
+    in_progress_cards_query,
+    pipeline_column_query,
+    pipeline_first_pages_query,
+    project_column_query,
+    to_card,
+    to_cards,
+    today_cards_query,
+)
+from .users import forget_user
+from .bulk import BulkError, apply_operations, parse_operations
+from .purge import delete_account as delete_account_rows, delete_project as delete_project_rows
+from .feeds import feed_rows, feed_validators, ics_stream, new_feed_token
+from .export import EXPORT_FORMATS, MIMETYPES, TASK_EXPORT_COLUMNS, export_filename, export_stream, task_rows
 
 
 main_bp = Blueprint("main", __name__)
 
+# Colonnes du Kanban projet / du pipeline créateur
+PROJECT_STATUSES = ("todo", "in_progress", "done")
+# Taille des listes du dashboard créateur (le reste via "Charger plus")
+BACKLOG_PAGE_SIZE = 20
+
+
+def _more_url(endpoint, cursor, **values):
+    """URL du bouton "Charger plus", ou None s'il n'y a plus rien à charger."""
+    if cursor is None:
+        return None
+    return url_for(endpoint, cursor=cursor, **values)
+
+
+# 🔥 Toute écriture (POST) invalide les pages en cache de l'utilisateur
+@main_bp.after_request
+def bump_data_version(response):
+    if request.method == "POST" and current_user.is_authenticated:
+        view_cache.bump(current_user.id)
+    return response
+
+
 # 🔥 Modèles de contenus pour créateurs
 CONTENT_TEMPLATES = {
     "tiktok_tip": {
@@ -100,9 +155,11 @@ def onboarding():
             return redirect(url_for("main.onboarding"))
 
         # Mise à jour de l'utilisateur
-        current_user.user_type = user_type
-        current_user.onboarding_done = True
+        user = db.session.get(User, current_user.id)
+        user.user_type = user_type
+        user.onboarding_done = True
         db.session.commit()
+        forget_user(user.id)
 
         flash("Bienvenue dans TaskFlow !", "success")
 
@@ -118,6 +175,8 @@ def onboarding():
 
 @main_bp.route("/creator")
 @login_required
+@conditional_view()
+@cached_view
 def creator_dashboard():
     if not current_user.is_creator:
         flash("Accès réservé aux créateurs.", "error")
@@ -127,37 +186,20 @@ def creator_dashboard():
     start_today = datetime.combine(today, datetime.min.time())
     end_today = datetime.combine(today, datetime.max.time())
 
-    # Base : toutes les tâches "contenu" de l'utilisateur
+    # Base : toutes les tâches "contenu" de l'utilisateur (cartes, sans description complète)
     base_query = (
-        Task.query
-        .join(Project)
+        card_query()
         .filter(
-            Project.owner_id == current_user.id,
+            Task.owner_id == current_user.id,
             Task.task_type == "content",
         )
     )
 
-    contents_all = base_query.all()
-
-    # Stats globales
-    total_contents = len(contents_all)
-    contents_to_film = sum(1 for t in contents_all if t.creator_stage == "to_film")
-    contents_to_edit = sum(1 for t in contents_all if t.creator_stage == "to_edit")
-    contents_scheduled = sum(1 for t in contents_all if t.creator_stage == "scheduled")
-
-    contents_scheduled_today = (
-        base_query
-        .filter(
-            Task.creator_stage == "scheduled",
-            Task.due_date.isnot(None),
-            Task.due_date >= start_today,
-            Task.due_date <= end_today,
-        )
-        .count()
-    )
+    # Stats globales (une seule requête agrégée)
+    stats = get_task_stats(current_user.id, today)
 
     # Prochains contenus (7 jours)
-    upcoming_contents = (
+    upcoming_contents = to_cards(
         base_query
         .filter(
             Task.status != "done",
@@ -169,24 +211,13 @@ def creator_dashboard():
         .all()
     )
 
-    # Boîte à idées
-    backlog_ideas = (
-        base_query
-        .filter(Task.creator_stage == "idea")
-        .order_by(Task.created_at.desc())
-        .all()
-    )
-
-    # Backlog sans date
-    backlog_no_date = (
-        base_query
-        .filter(
-            Task.due_date.is_(None),
-            Task.status != "done",
-        )
-        .order_by(Task.created_at.desc())
-        .all()
-    )
+    # Boîte à idées + backlog sans date : premières cartes, le reste à la demande
+    backlog_ideas, ideas_cursor = _backlog_page("ideas")
+    backlog_no_date, no_date_cursor = _backlog_page("no_date")
+    next_urls = {
+        "ideas": _more_url("main.creator_backlog_more", ideas_cursor, kind="ideas"),
+        "no_date": _more_url("main.creator_backlog_more", no_date_cursor, kind="no_date"),
+    }
 
     # ---------- FOCUS DU JOUR ----------
     focus_query = (
@@ -198,7 +229,7 @@ def creator_dashboard():
     )
 
     # 1) priorité : contenus à filmer/éditer DU JOUR
-    focus_content = (
+    focus_content = to_card(
         focus_query
         .filter(
             Task.due_date.isnot(None),
@@ -215,7 +246,7 @@ def creator_dashboard():
 
     # 2) sinon : prochain contenu à filmer/éditer (peu importe la date)
     if focus_content is None:
-        focus_content = (
+        focus_content = to_card(
             focus_query
             .order_by(
                 Task.due_date.asc(),
@@ -228,17 +259,39 @@ def creator_dashboard():
     return render_template(
         "creator_dashboard.html",
         today=today,
-        total_contents=total_contents,
-        contents_to_film=contents_to_film,
-        contents_to_edit=contents_to_edit,
-        contents_scheduled=contents_scheduled,
-        contents_scheduled_today=contents_scheduled_today,
+        total_contents=stats.content_total,
+        contents_to_film=stats.content_to_film,
+        contents_to_edit=stats.content_to_edit,
+        contents_scheduled=stats.content_scheduled,
+        contents_scheduled_today=stats.content_scheduled_today,
         upcoming_contents=upcoming_contents,
         backlog_ideas=backlog_ideas,
         backlog_no_date=backlog_no_date,
+        next_urls=next_urls,
         focus_content=focus_content,
     )
 
+
+@main_bp.route("/creator/backlog/<string:kind>")
+@login_required
+def creator_backlog_more(kind):
+    """Page suivante de la boîte à idées / du backlog sans date."""
+    if not current_user.is_creator or kind not in ("ideas", "no_date"):
+        return jsonify({"error": "forbidden"}), 403
+
+    tasks, cursor = _backlog_page(kind, request.args.get("cursor"))
+    return jsonify({
+        "html": render_template("partials/backlog_cards.html", tasks=tasks, kind=kind),
+        "next_url": _more_url("main.creator_backlog_more", cursor, kind=kind),
+    })
+
+
+def _backlog_page(kind, cursor=None):
+    rows, next_cursor = keyset_page(
+        backlog_cards_query(current_user.id, kind), (Task.created_at, Task.id), cursor, BACKLOG_PAGE_SIZE
+    )
+    return to_cards(rows), next_cursor
+
 @main_bp.route("/search")
 @login_required
 def search():
@@ -249,50 +302,70 @@ def search():
         flash("Entre un mot-clé pour lancer une recherche.", "info")
         return redirect(url_for("main.dashboard"))
 
-    # Recherche dans les projets de l’utilisateur
-    projects = (
-        Project.query
-        .filter(
-            Project.owner_id == current_user.id,
-            or_(
-                Project.name.ilike(f"%{q}%"),
-                Project.description.ilike(f"%{q}%")
-            )
-        )
-        .order_by(Project.created_at.desc())
-        .all()
-    )
-
-    # Recherche dans les tâches de ses projets
-    tasks = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            or_(
-                Task.title.ilike(f"%{q}%"),
-                Task.description.ilike(f"%q%")
-            )
-        )
-        .order_by(Task.created_at.desc())
-        .all()
-    )
-
-    # On peut séparer un peu pour l’affichage
-    general_tasks = [t for t in tasks if t.task_type != "content"]
-    content_tasks = [t for t in tasks if t.task_type == "content"]
+    # Recherche plein texte (tsvector / FTS5), classée par pertinence
+    projects, total_projects, projects_cursor = search_projects(current_user.id, q)
+    tasks, total_tasks, cursor = search_tasks(current_user.id, q)
+    general_tasks, content_tasks = _split_search_results(tasks)
 
     return render_template(
         "search.html",
         q=q,
         projects=projects,
+        open_counts=open_counts_by_project(current_user.id) if projects else {},
         general_tasks=general_tasks,
         content_tasks=content_tasks,
-        total_projects=len(projects),
-        total_tasks=len(tasks),
+        total_projects=total_projects,
+        total_tasks=total_tasks,
+        projects_next_url=_more_url("main.search_projects_more", projects_cursor, q=q),
+        next_url=_more_url("main.search_more", cursor, q=q),
     )
 
 
+@main_bp.route("/search/projects/more")
+@login_required
+def search_projects_more():
+    """Page suivante des projets trouvés."""
+    q = (request.args.get("q") or "").strip()
+    projects, _, cursor = search_projects(current_user.id, q, request.args.get("cursor"))
+
+    return jsonify({
+        "html": render_template(
+            "partials/search_project_cards.html",
+            projects=projects,
+            open_counts=open_counts_by_project(current_user.id) if projects else {},
+        ),
+        "next_url": _more_url("main.search_projects_more", cursor, q=q),
+    })
+
+
+@main_bp.route("/search/more")
+@login_required
+def search_more():
+    """Page suivante des tâches trouvées : un fragment HTML par section."""
+    q = (request.args.get("q") or "").strip()
+    tasks, _, cursor = search_tasks(current_user.id, q, request.args.get("cursor"))
+    general_tasks, content_tasks = _split_search_results(tasks)
+
+    return jsonify({
+        "html": {
+            "search-general": render_template(
+                "partials/search_task_cards.html", tasks=general_tasks, kind="general"
+            ),
+            "search-content": render_template(
+                "partials/search_task_cards.html", tasks=content_tasks, kind="content"
+            ),
+        },
+        "next_url": _more_url("main.search_more", cursor, q=q),
+    })
+
+
+def _split_search_results(tasks):
+    # On peut séparer un peu pour l’affichage
+    general_tasks = [t for t in tasks if t.task_type != "content"]
+    content_tasks = [t for t in tasks if t.task_type == "content"]
+    return general_tasks, content_tasks
+
+
 @main_bp.route("/creator/pipeline")
 @login_required
 def creator_pipeline():
@@ -301,34 +374,24 @@ def creator_pipeline():
         flash("Accès réservé aux créateurs.", "error")
         return redirect(url_for("main.dashboard"))
 
-    # toutes les tâches de contenu du user (non terminées)
-    tasks = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.task_type == "content",
-            Task.status != "done",
-        )
-        .order_by(Task.created_at.desc())
-        .all()
-    )
-
-    # colonnes du pipeline
-    columns = {
-        "idea": [],
-        "to_film": [],
-        "to_edit": [],
-        "scheduled": [],
-        "published": [],
-        "none": [],
-    }
-
-    for t in tasks:
-        key = t.creator_stage or "none"
-        if key not in columns:
-            key = "none"
-        columns[key].append(t)
+    # 🔥 une seule requête : première page + effectif de chaque colonne (fenêtre par étape)
+    keys = PIPELINE_STAGES + ("none",)
+    columns = {key: [] for key in keys}
+    counts = dict.fromkeys(keys, 0)
+    rows = db.session.execute(pipeline_first_pages_query(current_user.id, PAGE_SIZE + 1))
+    for row in rows:
+        columns[row.stage_key].append(row)
+        counts[row.stage_key] = row.stage_count
+
+    next_urls = {}
+    for key in keys:
+        cursor = None
+        if len(columns[key]) > PAGE_SIZE:
+            del columns[key][PAGE_SIZE:]
+            last = columns[key][-1]
+            cursor = encode_cursor([last.created_at, last.id])
+        columns[key] = to_cards(columns[key])
+        next_urls[key] = _more_url("main.creator_pipeline_more", cursor, stage=key)
 
     # meta pour affichage dans le template
     columns_meta = [
@@ -344,9 +407,33 @@ def creator_pipeline():
         "creator_pipeline.html",
         columns=columns,
         columns_meta=columns_meta,
+        counts=counts,
+        next_urls=next_urls,
     )
 
 
+@main_bp.route("/creator/pipeline/more")
+@login_required
+def creator_pipeline_more():
+    """Page suivante d'une colonne du pipeline (bouton "Charger plus")."""
+    stage = request.args.get("stage")
+    if not current_user.is_creator or stage not in PIPELINE_STAGES + ("none",):
+        return jsonify({"error": "forbidden"}), 403
+
+    tasks, cursor = _pipeline_page(stage, request.args.get("cursor"))
+    return jsonify({
+        "html": render_template("partials/pipeline_cards.html", tasks=tasks),
+        "next_url": _more_url("main.creator_pipeline_more", cursor, stage=stage),
+    })
+
+
+def _pipeline_page(stage, cursor=None):
+    rows, next_cursor = keyset_page(
+        pipeline_column_query(current_user.id, stage), (Task.created_at, Task.id), cursor
+    )
+    return to_cards(rows), next_cursor
+
+
 @main_bp.route("/creator/content/new", methods=["GET", "POST"])
 @login_required
 def creator_new_content():
@@ -406,6 +493,7 @@ def creator_new_content():
         # création de la tâche de contenu
         task = Task(
             project_id=project.id,
+            owner_id=project.owner_id,
             title=title,
             description=description,
             status="todo",
@@ -438,152 +526,47 @@ def home():
 # ---------- DASHBOARD ----------
 @main_bp.route("/dashboard")
 @login_required
+@conditional_view()
+@cached_view
 def dashboard():
     # Tous les projets de l'utilisateur
     projects = Project.query.filter_by(owner_id=current_user.id).all()
 
-    # Base : toutes les tâches liées à ses projets
-    base_tasks_query = (
-        Task.query
-        .join(Project)
-        .filter(Project.owner_id == current_user.id)
-    )
-
-    # --- Compteurs globaux ---
-    total_projects = len(projects)
-    total_tasks_open = base_tasks_query.filter(Task.status != "done").count()
-    total_general_open = (
-        base_tasks_query
-        .filter(Task.status != "done", Task.task_type != "content")
-        .count()
-    )
-    total_content_open = (
-        base_tasks_query
-        .filter(Task.status != "done", Task.task_type == "content")
-        .count()
-    )
-
-    # --- Aujourd'hui ---
+    # --- Tous les compteurs en une seule requête ---
     today = date.today()
-    start_today = datetime.combine(today, datetime.min.time())
-    end_today = datetime.combine(today, datetime.max.time())
-
-    todays_contents = (
-        base_tasks_query
-        .filter(
-            Task.task_type == "content",
-            Task.due_date.isnot(None),
-            Task.due_date >= start_today,
-            Task.due_date <= end_today,
-            Task.status != "done",
-        )
-        .count()
-    )
-
-    # --- Pipeline créateur (si user créateur) ---
-    contents_to_film = (
-        base_tasks_query
-        .filter(
-            Task.task_type == "content",
-            Task.creator_stage == "to_film",
-            Task.status != "done",
-        )
-        .count()
-    )
-    contents_to_edit = (
-        base_tasks_query
-        .filter(
-            Task.task_type == "content",
-            Task.creator_stage == "to_edit",
-            Task.status != "done",
-        )
-        .count()
-    )
-    contents_scheduled = (
-        base_tasks_query
-        .filter(
-            Task.task_type == "content",
-            Task.creator_stage == "scheduled",
-            Task.status != "done",
-        )
-        .count()
-    )
-
-    # --- Stats de productivité : semaine + mois ---
-    # Lundi de la semaine actuelle
-    start_week = today - timedelta(days=today.weekday())
-    # 1er jour du mois
-    start_month = today.replace(day=1)
-
-    tasks_done_week = (
-        base_tasks_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= datetime.combine(start_week, datetime.min.time()),
-            Task.updated_at <= end_today,
-        )
-        .count()
-    )
-
-    tasks_done_month = (
-        base_tasks_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= datetime.combine(start_month, datetime.min.time()),
-            Task.updated_at <= end_today,
-        )
-        .count()
-    )
+    stats = get_task_stats(current_user.id, today)
 
     return render_template(
         "dashboard.html",
         projects=projects,
-        total_projects=total_projects,
-        total_tasks_open=total_tasks_open,
-        total_general_open=total_general_open,
-        total_content_open=total_content_open,
-        todays_contents=todays_contents,
-        contents_to_film=contents_to_film,
-        contents_to_edit=contents_to_edit,
-        contents_scheduled=contents_scheduled,
+        open_counts=open_counts_by_project(current_user.id),
+        total_projects=len(projects),
+        total_tasks_open=stats.open_total,
+        total_general_open=stats.open_general,
+        total_content_open=stats.open_content,
+        todays_contents=stats.content_open_today,
+        contents_to_film=stats.content_open_to_film,
+        contents_to_edit=stats.content_open_to_edit,
+        contents_scheduled=stats.content_open_scheduled,
         today=today,
-        tasks_done_week=tasks_done_week,
-        tasks_done_month=tasks_done_month,
+        tasks_done_week=stats.done_week,
+        tasks_done_month=stats.done_month,
     )
 
 
 # ---------- VUE "AUJOURD'HUI" ----------
 @main_bp.route("/today")
 @login_required
+@conditional_view()
+@cached_view
 def today():
     today_date = date.today()
 
     # --- TÂCHES DU JOUR (non terminées) ---
-    tasks_today = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.due_date.isnot(None),
-            Task.due_date >= datetime.combine(today_date, datetime.min.time()),
-            Task.due_date <= datetime.combine(today_date, datetime.max.time()),
-            Task.status != "done",
-        )
-        .order_by(Task.priority.desc(), Task.created_at.desc())
-        .all()
-    )
+    tasks_today = to_cards(today_cards_query(current_user.id, today_date))
 
     # --- TÂCHES EN COURS (toutes dates) ---
-    tasks_in_progress = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.status == "in_progress",
-        )
-        .order_by(Task.priority.desc(), Task.created_at.desc())
-        .all()
-    )
+    tasks_in_progress = to_cards(in_progress_cards_query(current_user.id))
 
     # --- Séparation Général / Contenu pour les tâches du jour ---
     general_tasks = [t for t in tasks_today if t.task_type != "content"]
@@ -632,39 +615,24 @@ def today():
     )
 
 # ---------- CALENDRIER (mois / semaine) ----------
+def _calendar_filters():
+    return {
+        "project_id": request.args.get("project_id", type=int),
+        "priority": request.args.get("priority") or None,
+        "status": request.args.get("status") or None,
+        "task_type": request.args.get("task_type") or None,
+        "platform": request.args.get("platform") or None,
+    }
+
+
 @main_bp.route("/calendar")
 @login_required
+@conditional_view()
 def calendar_view():
     view = request.args.get("view", "week")
+    filters = _calendar_filters()
 
-    project_id = request.args.get("project_id", type=int)
-    priority = request.args.get("priority") or None
-    status = request.args.get("status") or None
-    task_type = request.args.get("task_type") or None
-    platform = request.args.get("platform") or None
-
-    # Tâches de l'utilisateur avec une date (calendrier éditorial)
-    base_query = (
-        Task.query.join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.due_date.isnot(None),
-        )
-    )
-
-    if project_id:
-        base_query = base_query.filter(Task.project_id == project_id)
-    if priority:
-        base_query = base_query.filter(Task.priority == priority)
-    if status:
-        base_query = base_query.filter(Task.status == status)
-    if task_type:
-        base_query = base_query.filter(Task.task_type == task_type)
-    if platform:
-        base_query = base_query.filter(Task.platform == platform)
-
-    tasks = base_query.all()
-
+    # Projets du filtre (le nom du projet de chaque tâche vient avec la carte)
     projects = (
         Project.query.filter_by(owner_id=current_user.id)
         .order_by(Project.created_at.desc())
@@ -687,14 +655,11 @@ def calendar_view():
             # Lundi de la semaine actuelle
             week_start = today - timedelta(days=today.weekday())
 
-        week_days = []
-        for i in range(7):
-            d = week_start + timedelta(days=i)
-            day_tasks = [
-                t for t in tasks
-                if t.due_date is not None and t.due_date.date() == d
-            ]
-            week_days.append({"date": d, "tasks": day_tasks})
+        # Seulement les tâches de la semaine affichée, rangées en un passage
+        start, end = week_window(week_start)
+        tasks = to_cards(window_tasks_query(current_user.id, start, end, filters))
+        days = bucket_by_day(tasks, start, end)
+        week_days = [{"date": d, "tasks": day_tasks} for d, day_tasks in days.items()]
 
         prev_week_start = week_start - timedelta(days=7)
         next_week_start = week_start + timedelta(days=7)
@@ -707,13 +672,7 @@ def calendar_view():
             week_start=week_start,
             prev_week_start=prev_week_start,
             next_week_start=next_week_start,
-            current_filters={
-                "project_id": project_id,
-                "priority": priority,
-                "status": status,
-                "task_type": task_type,
-                "platform": platform,
-            },
+            current_filters=filters,
         )
 
     # -----------------------
@@ -722,33 +681,22 @@ def calendar_view():
     year = request.args.get("year", type=int) or today.year
     month = request.args.get("month", type=int) or today.month
 
-    first_day = date(year, month, 1)
-    _, days_in_month = pycal.monthrange(year, month)
-    last_day = date(year, month, days_in_month)
-
-    # On commence le calendrier le lundi de la semaine du 1er
-    start = first_day - timedelta(days=first_day.weekday())
-
-    weeks = []
-    current = start
-    # 6 lignes max (classique calendrier)
-    for _ in range(6):
-        week = []
-        for _ in range(7):
-            d = current
-            day_tasks = [
-                t for t in tasks
-                if t.due_date is not None and t.due_date.date() == d
-            ]
-            week.append(
-                {
-                    "date": d,
-                    "tasks": day_tasks,
-                    "is_current_month": (d.month == month),
-                }
-            )
-            current += timedelta(days=1)
-        weeks.append(week)
+    # On commence le calendrier le lundi de la semaine du 1er (6 lignes max)
+    start, end = month_window(year, month)
+    tasks = to_cards(window_tasks_query(current_user.id, start, end, filters))
+    days = list(bucket_by_day(tasks, start, end).items())
+
+    weeks = [
+        [
+            {
+                "date": d,
+                "tasks": day_tasks,
+                "is_current_month": (d.month == month),
+            }
+            for d, day_tasks in days[i:i + 7]
+        ]
+        for i in range(0, len(days), 7)
+    ]
 
     # Mois précédent / suivant
     if month == 1:
@@ -776,16 +724,93 @@ def calendar_view():
         prev_month_year=prev_month_year,
         next_month=next_month,
         next_month_year=next_month_year,
-        current_filters={
-            "project_id": project_id,
-            "priority": priority,
-            "status": status,
-            "task_type": task_type,
-            "platform": platform,
-        },
+        current_filters=filters,
     )
 
 
+# ----- API JSON : tâches d'une plage de dates (navigation sans rechargement)
+@main_bp.route("/calendar/range")
+@login_required
+def calendar_range():
+    try:
+        start = datetime.strptime(request.args.get("start", ""), "%Y-%m-%d").date()
+        end = datetime.strptime(request.args.get("end", ""), "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"error": "bad date"}), 400
+
+    if end <= start or (end - start).days > MAX_RANGE_DAYS:
+        return jsonify({"error": "bad range"}), 400
+
+    tasks = to_cards(window_tasks_query(current_user.id, start, end, _calendar_filters()))
+    days = bucket_by_day(tasks, start, end)
+
+    return jsonify({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": [
+            {
+                "date": d.isoformat(),
+                "weekday": d.strftime("%a"),
+                "day": d.day,
+                "tasks": [task_to_dict(t) for t in day_tasks],
+            }
+            for d, day_tasks in days.items()
+        ],
+    })
+
+
+# ---------- ABONNEMENT CALENDRIER (.ics) ----------
+# Pas de session : le jeton secret de l'URL authentifie le calendrier du téléphone
+@main_bp.route("/calendar/feed/<string:token>.ics")
+@main_bp.route("/calendar/feed/<string:token>/project/<int:project_id>.ics")
+def calendar_feed(token, project_id=None):
+    user_id = db.session.scalar(select(User.id).where(User.feed_token == token))
+    if user_id is None:
+        abort(404)
+
+    name = "TaskFlow"
+    if project_id is not None:
+        project_name = db.session.scalar(
+            select(Project.name).where(Project.id == project_id, Project.owner_id == user_id)
+        )
+        if project_name is None:
+            abort(404)
+        name = f"TaskFlow · {project_name}"
+
+    # 🔥 Les apps calendrier repassent toutes les quelques minutes : 304 sans lire de tâche
+    etag, last_modified = feed_validators(user_id, project_id)
+    headers = {"Cache-Control": "private, max-age=300"}
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304, headers=headers)
+    else:
+        rows = feed_rows(user_id, project_id)
+        response = Response(
+            stream_with_context(ics_stream(rows, name, request.host)),
+            mimetype="text/calendar",
+            headers=headers,
+        )
+    # faible : le validateur décrit le contenu, pas les octets (compressés ou non)
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    return response
+
+
+@main_bp.route("/profile/calendar-feed", methods=["POST"])
+@login_required
+def calendar_feed_token():
+    user = db.session.get(User, current_user.id)
+    if request.form.get("action") == "disable":
+        user.feed_token = None
+        flash("Abonnement calendrier désactivé.", "success")
+    else:
+        # un nouveau jeton révoque l'ancien lien
+        user.feed_token = new_feed_token()
+        flash("Lien d’abonnement calendrier généré.", "success")
+    db.session.commit()
+    forget_user(user.id)
+    return redirect(url_for("main.profile"))
+
+
 # ---------- PROFIL ----------
 @main_bp.route("/profile", methods=["GET", "POST"])
 @login_required
@@ -807,9 +832,11 @@ def profile():
             flash("Cette adresse e-mail est déjà utilisée par un autre compte.", "error")
             return redirect(url_for("main.profile"))
 
-        current_user.name = name
-        current_user.email = email
+        user = db.session.get(User, current_user.id)
+        user.name = name
+        user.email = email
         db.session.commit()
+        forget_user(user.id)
 
         flash("Profil mis à jour avec succès.", "success")
         return redirect(url_for("main.profile"))
@@ -830,7 +857,8 @@ def change_password():
             flash("Tous les champs sont obligatoires.", "error")
             return redirect(url_for("main.change_password"))
 
-        if not current_user.check_password(current_password):
+        user = db.session.get(User, current_user.id)
+        if not user.check_password(current_password):
             flash("Le mot de passe actuel est incorrect.", "error")
             return redirect(url_for("main.change_password"))
 
@@ -842,14 +870,57 @@ def change_password():
             flash("Le nouveau mot de passe doit contenir au moins 6 caractères.", "error")
             return redirect(url_for("main.change_password"))
 
-        current_user.set_password(new_password)
+        user.set_password(new_password)
         db.session.commit()
+        forget_user(user.id)
         flash("Mot de passe modifié avec succès.", "success")
         return redirect(url_for("main.profile"))
 
     return render_template("change_password.html")
 
 
+# ---------- SUPPRIMER LE COMPTE ----------
+@main_bp.route("/profile/delete", methods=["POST"])
+@login_required
+def delete_account():
+    user = db.session.get(User, current_user.id)
+    if not user.check_password(request.form.get("password", "")):
+        flash("Mot de passe incorrect : compte non supprimé.", "error")
+        return redirect(url_for("main.profile"))
+
+    user_id = user.id
+    logout_user()
+    delete_account_rows(user_id)
+    db.session.commit()
+    forget_user(user_id)
+
+    flash("Ton compte et toutes tes données ont été supprimés.", "success")
+    return redirect(url_for("auth.login"))
+
+
+# ---------- EXPORT DES DONNÉES ----------
+@main_bp.route("/export/tasks.<string:fmt>")
+@login_required
+def export_tasks(fmt):
+    """Projets + tâches en CSV / JSON Lines, streamés par chunks (?gzip=1 pour compresser)."""
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    compress = request.args.get("gzip") == "1"
+    filename = export_filename(f"taskflow-{date.today().isoformat()}", fmt, compress)
+
+    rows = task_rows(current_user.id)
+    body = export_stream(fmt, TASK_EXPORT_COLUMNS, rows, compress=compress)
+    return Response(
+        stream_with_context(body),
+        mimetype="application/gzip" if compress else MIMETYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 # ---------- CRÉER UN PROJET ----------
 @main_bp.route("/project/new", methods=["GET", "POST"])
 @login_required
@@ -887,19 +958,64 @@ def project_detail(project_id):
         flash("Accès non autorisé à ce projet.", "error")
         return redirect(url_for("main.dashboard"))
 
-    tasks_todo = [t for t in project.tasks if t.status == "todo"]
-    tasks_in_progress = [t for t in project.tasks if t.status == "in_progress"]
-    tasks_done = [t for t in project.tasks if t.status == "done"]
+    # Compteurs par colonne : une seule requête groupée
+    counts = dict.fromkeys(PROJECT_STATUSES, 0)
+    counts.update(
+        db.session.query(Task.status, func.count())
+        .filter(Task.project_id == project.id)
+        .group_by(Task.status)
+        .all()
+    )
+
+    # Chaque colonne est paginée séparément (les plus anciennes d'abord)
+    columns, next_urls = {}, {}
+    for status in PROJECT_STATUSES:
+        columns[status], cursor = _project_tasks_page(project.id, status)
+        next_urls[status] = _more_url(
+            "main.project_tasks_more", cursor, project_id=project.id, status=status
+        )
 
     return render_template(
         "project_detail.html",
         project=project,
-        tasks_todo=tasks_todo,
-        tasks_in_progress=tasks_in_progress,
-        tasks_done=tasks_done,
+        tasks_todo=columns["todo"],
+        tasks_in_progress=columns["in_progress"],
+        tasks_done=columns["done"],
+        counts=counts,
+        next_urls=next_urls,
     )
 
 
+@main_bp.route("/project/<int:project_id>/tasks")
+@login_required
+def project_tasks_more(project_id):
+    """Page suivante d'une colonne du Kanban projet (bouton "Charger plus")."""
+    project = Project.query.get_or_404(project_id)
+    status = request.args.get("status")
+    if project.owner_id != current_user.id or status not in PROJECT_STATUSES:
+        return jsonify({"error": "forbidden"}), 403
+
+    tasks, cursor = _project_tasks_page(project.id, status, request.args.get("cursor"))
+    return jsonify({
+        "html": render_template(
+            "partials/project_task_items.html", tasks=tasks, status=status
+        ),
+        "next_url": _more_url(
+            "main.project_tasks_more", cursor, project_id=project.id, status=status
+        ),
+    })
+
+
+def _project_tasks_page(project_id, status, cursor=None):
+    rows, next_cursor = keyset_page(
+        project_column_query(project_id, status),
+        (Task.created_at, Task.id),
+        cursor,
+        descending=False,
+    )
+    return to_cards(rows), next_cursor
+
+
 # ---------- AJOUTER UNE TÂCHE ----------
 @main_bp.route("/project/<int:project_id>/task/add", methods=["POST"])
 @login_required
@@ -938,6 +1054,7 @@ def add_task(project_id):
 
     task = Task(
         project_id=project_id,
+        owner_id=project.owner_id,
         title=title,
         description=description,
         status="todo",
@@ -958,17 +1075,16 @@ def add_task(project_id):
 @login_required
 def update_task_status(task_id, new_status):
     task = Task.query.get_or_404(task_id)
-    project = task.project
 
-    if project.owner_id != current_user.id:
+    if task.owner_id != current_user.id:
         flash("Accès non autorisé à ce projet.", "error")
         return redirect(url_for("main.dashboard"))
 
     if new_status not in ["todo", "in_progress", "done"]:
         flash("Statut invalide.", "error")
-        return redirect(url_for("main.project_detail", project_id=project.id))
+        return redirect(url_for("main.project_detail", project_id=task.project_id))
 
-    task.status = new_status
+    set_task_status(task, new_status)
     db.session.commit()
 
     if new_status == "done":
@@ -992,10 +1108,9 @@ def update_creator_stage(task_id, new_stage):
         return redirect(request.referrer or url_for("main.creator_dashboard"))
 
     task = Task.query.get_or_404(task_id)
-    project = task.project
 
-    # sécurité : le projet doit t'appartenir
-    if project.owner_id != current_user.id:
+    # sécurité : la tâche doit t'appartenir
+    if task.owner_id != current_user.id:
         flash("Accès non autorisé à cette tâche.", "error")
         return redirect(url_for("main.dashboard"))
 
@@ -1003,6 +1118,7 @@ def update_creator_stage(task_id, new_stage):
         flash("Cette tâche n’est pas un contenu.", "error")
         return redirect(request.referrer or url_for("main.creator_dashboard"))
 
+    log_event(task, "stage", task.creator_stage, new_stage)
     task.creator_stage = new_stage
     db.session.commit()
 
@@ -1016,16 +1132,19 @@ def update_creator_stage(task_id, new_stage):
 @login_required
 def delete_task(task_id):
     task = Task.query.get_or_404(task_id)
-    project = task.project
 
-    if project.owner_id != current_user.id:
+    if task.owner_id != current_user.id:
         flash("Accès non autorisé à ce projet.", "error")
         return redirect(url_for("main.dashboard"))
 
+    project_id = task.project_id
+    if task.status == "done":
+        forget_done_tasks(Task.query.filter_by(id=task.id))
+    forget_task_events(task.owner_id, [task.id])
     db.session.delete(task)
     db.session.commit()
     flash("Tâche supprimée.", "success")
-    return redirect(url_for("main.project_detail", project_id=project.id))
+    return redirect(url_for("main.project_detail", project_id=project_id))
 
 
 # ---------- SUPPRIMER UN PROJET ----------
@@ -1034,11 +1153,8 @@ def delete_task(task_id):
 def delete_project(project_id):
     project = Project.query.filter_by(id=project_id, owner_id=current_user.id).first_or_404()
 
-    # On supprime d’abord les tâches liées (au cas où la cascade n’est pas config)
-    for task in project.tasks:
-        db.session.delete(task)
-
-    db.session.delete(project)
+    # DELETE ensemblistes : aucune tâche chargée, même pour un gros projet
+    delete_project_rows(project.id)
     db.session.commit()
     flash("Projet supprimé avec toutes ses tâches.", "success")
     return redirect(url_for("main.dashboard"))
@@ -1048,13 +1164,14 @@ def delete_project(project_id):
 @main_bp.route("/task/<int:task_id>/edit", methods=["GET", "POST"])
 @login_required
 def edit_task(task_id):
-    task = Task.query.get_or_404(task_id)
-    project = task.project
+    task = Task.query.options(undefer(Task.description)).get_or_404(task_id)
 
-    if project.owner_id != current_user.id:
+    if task.owner_id != current_user.id:
         flash("Accès non autorisé à ce projet.", "error")
         return redirect(url_for("main.dashboard"))
 
+    project = task.project
+
     if request.method == "POST":
         title = request.form.get("title")
         description = request.form.get("description")
@@ -1083,8 +1200,10 @@ def edit_task(task_id):
         task.title = title
         task.description = description
         task.priority = priority
+        log_event(task, "due_date", task.due_date, due_date)
+        log_event(task, "stage", task.creator_stage, creator_stage)
         task.due_date = due_date
-        task.task_type = task_type
+        set_task_type(task, task_type)
         task.platform = platform
         task.creator_stage = creator_stage
 
@@ -1104,8 +1223,10 @@ def pricing():
 @login_required
 def upgrade_creator():
     # Plus tard : ici tu brancheras Stripe / paiement réel.
-    current_user.user_type = "creator"
+    user = db.session.get(User, current_user.id)
+    user.user_type = "creator"
     db.session.commit()
+    forget_user(user.id)
 
     flash("Ton compte est maintenant en mode Créateur 🚀", "success")
     return redirect(url_for("main.creator_dashboard"))
@@ -1115,78 +1236,20 @@ def upgrade_creator():
 
 @main_bp.route("/analytics", methods=["GET"])
 @login_required
+@conditional_view()
+@cached_view
 def analytics():
     from datetime import date, timedelta
 
     today = date.today()
 
-    # ----- Base query : tâches de l'utilisateur -----
-    base_query = (
-        Task.query
-        .join(Project)
-        .filter(Project.owner_id == current_user.id)
-    )
-
-    # ----- Stats semaine / mois -----
-    # Début de la semaine (lundi)
+    # ----- Heatmap 12 derniers mois (rollup user_daily_stats) -----
+    start_date = today - timedelta(days=364)
     start_week = today - timedelta(days=today.weekday())
-    # Début du mois
     start_month = today.replace(day=1)
+    start_prev_month = (start_month - timedelta(days=1)).replace(day=1)
 
-    week_completed = (
-        base_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= start_week,
-        )
-        .count()
-    )
-
-    month_completed = (
-        base_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= start_month,
-        )
-        .count()
-    )
-
-    week_general = (
-        base_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= start_week,
-            Task.task_type != "content",
-        )
-        .count()
-    )
-
-    week_content = (
-        base_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= start_week,
-            Task.task_type == "content",
-        )
-        .count()
-    )
-
-    # ----- Heatmap 12 derniers mois -----
-    start_date = today - timedelta(days=364)
-
-    completed_tasks = (
-        base_query
-        .filter(
-            Task.status == "done",
-            Task.updated_at >= start_date,
-        )
-        .all()
-    )
-
-    heatmap_dict = {}
-    for t in completed_tasks:
-        d = t.updated_at.date()
-        heatmap_dict[d] = heatmap_dict.get(d, 0) + 1
+    daily = completions_since(current_user.id, min(start_date, start_prev_month))
 
     ordered_days = []
     for i in range(365):
@@ -1194,95 +1257,46 @@ def analytics():
         ordered_days.append(
             {
                 "date": d,
-                "count": heatmap_dict.get(d, 0, ),
+                "count": sum(daily.get(d, (0, 0))),
             }
         )
 
+    week_general = sum(g for d, (g, c) in daily.items() if d >= start_week)
+    week_content = sum(c for d, (g, c) in daily.items() if d >= start_week)
+    month_completed = sum(g + c for d, (g, c) in daily.items() if d >= start_month)
+    prev_month_completed = sum(
+        g + c for d, (g, c) in daily.items() if start_prev_month <= d < start_month
+    )
+
         # ---------- INSIGHT ENGINE (12 derniers mois) ----------
     today = date.today()
     one_year_ago = today - timedelta(days=365)
 
-    # Toutes les tâches terminées du user sur les 12 derniers mois
-    done_tasks = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.status == "done",
-            Task.updated_at.isnot(None),
-            Task.updated_at >= datetime.combine(one_year_ago, datetime.min.time()),
-        )
-        .all()
+    # Tâches terminées des 12 derniers mois (dernier passage en "done"), par jour de semaine / heure côté SQL
+    day_counter, hour_counter = completion_histogram(
+        current_user.id, datetime.combine(one_year_ago, datetime.min.time())
     )
 
-    from collections import Counter
-
     best_day_name = None
     best_day_count = 0
     most_active_hour = None
     most_active_hour_count = 0
 
-    if done_tasks:
-        day_counter = Counter()
-        hour_counter = Counter()
-
-        for t in done_tasks:
-            d = t.updated_at
-            if not d:
-                continue
-            day_counter[d.weekday()] += 1      # 0 = lundi, 6 = dimanche
-            hour_counter[d.hour] += 1          # 0–23
-
-        if day_counter:
-            best_day_idx, best_day_count = max(day_counter.items(), key=lambda x: x[1])
-            day_labels = [
-                "lundi", "mardi", "mercredi",
-                "jeudi", "vendredi", "samedi", "dimanche"
-            ]
-            best_day_name = day_labels[best_day_idx]
-
-        if hour_counter:
-            best_hour, most_active_hour_count = max(hour_counter.items(), key=lambda x: x[1])
-            most_active_hour = best_hour
+    if day_counter:
+        best_day_idx, best_day_count = max(day_counter.items(), key=lambda x: x[1])
+        day_labels = [
+            "lundi", "mardi", "mercredi",
+            "jeudi", "vendredi", "samedi", "dimanche"
+        ]
+        best_day_name = day_labels[best_day_idx]
 
-    # Performance mois courant vs mois précédent
-    this_month_start = date(today.year, today.month, 1)
-    this_month_start_dt = datetime.combine(this_month_start, datetime.min.time())
-
-    if today.month == 1:
-        prev_month = 12
-        prev_year = today.year - 1
-    else:
-        prev_month = today.month - 1
-        prev_year = today.year
-
-    prev_month_start = date(prev_year, prev_month, 1)
-    # fin du mois précédent = début du mois courant
-    prev_month_start_dt = datetime.combine(prev_month_start, datetime.min.time())
-    prev_month_end_dt = this_month_start_dt
-
-    this_month_done = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.status == "done",
-            Task.updated_at >= this_month_start_dt,
-        )
-        .count()
-    )
+    if hour_counter:
+        best_hour, most_active_hour_count = max(hour_counter.items(), key=lambda x: x[1])
+        most_active_hour = best_hour
 
-    prev_month_done = (
-        Task.query
-        .join(Project)
-        .filter(
-            Project.owner_id == current_user.id,
-            Task.status == "done",
-            Task.updated_at >= prev_month_start_dt,
-            Task.updated_at < this_month_start_dt,
-        )
-        .count()
-    )
+    # Performance mois courant vs mois précédent
+    this_month_done = month_completed
+    prev_month_done = prev_month_completed
 
     # Messages d'insight
     if best_day_name:
@@ -1342,7 +1356,7 @@ def analytics():
     return render_template(
         "analytics.html",
         today=today,
-        week_completed=week_completed,
+        week_completed=week_general + week_content,
         month_completed=month_completed,
         week_general=week_general,
         week_content=week_content,
@@ -1354,12 +1368,22 @@ def analytics():
         prev_month_done=prev_month_done,
     )
 
+def _task_validator(task_id):
+    """updated_at de la tâche (si elle est au user) : seule donnée affichée qui bouge."""
+    updated_at = db.session.scalar(
+        select(Task.updated_at).where(Task.id == task_id, Task.owner_id == current_user.id)
+    )
+    return updated_at.isoformat() if updated_at else None
+
+
 @main_bp.route("/task/<int:task_id>/drawer")
 @login_required
+@conditional_view(validator=_task_validator)
 def task_drawer(task_id):
     task = (
-        Task.query.join(Project)
-        .filter(Task.id == task_id, Project.owner_id == current_user.id)
+        Task.query
+        .options(undefer(Task.description))
+        .filter(Task.id == task_id, Task.owner_id == current_user.id)
         .first_or_404()
     )
 
@@ -1371,8 +1395,8 @@ def task_drawer(task_id):
 @login_required
 def move_task_date(task_id):
     task = (
-        Task.query.join(Project)
-        .filter(Task.id == task_id, Project.owner_id == current_user.id)
+        Task.query
+        .filter(Task.id == task_id, Task.owner_id == current_user.id)
         .first_or_404()
     )
 
@@ -1384,6 +1408,7 @@ def move_task_date(task_id):
     try:
         # task.due_date est probablement un DateTime → on set à midi pour éviter les timezone issues
         d = datetime.strptime(due_date_str, "%Y-%m-%d")
+        log_event(task, "due_date", task.due_date, d)
         task.due_date = d
         db.session.commit()
         return jsonify({"ok": True})
@@ -1391,13 +1416,31 @@ def move_task_date(task_id):
         return jsonify({"error":"bad date"}), 400
 
 
+# ---------- MODIFICATIONS EN LOT (calendrier, pipeline) ----------
+@main_bp.route("/api/tasks/bulk", methods=["POST"])
+@login_required
+def bulk_update_tasks():
+    """Plusieurs changements (statut, étape, date, priorité, suppression) en une transaction."""
+    try:
+        operations = parse_operations(request.get_json(silent=True))
+        result = apply_operations(current_user.id, operations)
+    except BulkError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "index": e.index}), e.status
+
+    db.session.commit()
+    return jsonify({"ok": True, **result})
+
+
 
 @main_bp.route("/task/<int:task_id>")
 @login_required
+@conditional_view()
 def task_detail(task_id):
     task = (
-        Task.query.join(Project)
-        .filter(Task.id == task_id, Project.owner_id == current_user.id)
+        Task.query
+        .options(undefer(Task.description))
+        .filter(Task.id == task_id, Task.owner_id == current_user.id)
         .first_or_404()
     )
 
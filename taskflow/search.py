@@ -0,0 +1,127 @@
+# taskflow/search.py
+import re
+
+from sqlalchemy import Float, Integer, func, inspect, literal_column, or_, text
+
+from . import db
+from .models import Project, Task
+from .pagination import keyset_page
+from .readmodels import card_query, to_cards
+
+SEARCH_PER_PAGE = 30
+
+# Index plein texte détectés, par moteur. Seule leur présence est mémorisée :
+# "like" est revérifié à chaque recherche (migration appliquée pendant que l'app tourne)
+_backend_cache = {}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_backend():
+    """
+    "postgres" : colonnes tsvector + index GIN
+    "fts5"     : tables virtuelles SQLite FTS5
+    "like"     : repli ILIKE (migration non appliquée)
+    """
+    engine = db.engine
+    if engine in _backend_cache:
+        return _backend_cache[engine]
+
+    insp = inspect(engine)
+    backend = "like"
+    if engine.dialect.name == "postgresql":
+        columns = {c["name"] for c in insp.get_columns("task")}
+        if "search_vector" in columns:
+            backend = "postgres"
+    elif engine.dialect.name == "sqlite" and insp.has_table("task_fts"):
+        backend = "fts5"
+    if backend != "like":
+        _backend_cache[engine] = backend
+    return backend
+
+
+def _terms(q: str):
+    return _WORD_RE.findall(q.lower())
+
+
+def _pg_tsquery(terms):
+    # chaque mot en préfixe : "vid mont" → vid:* & mont:*
+    return func.to_tsquery("simple", " & ".join(f"{t}:*" for t in terms))
+
+
+def _fts5_match(terms):
+    # mots entre guillemets (pas d'opérateurs FTS injectés) + préfixe
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _ranked(model, fts_table, q, base=None):
+    """
+    Requête ORM filtrée pour `model` + clé de tri (pertinence, id).
+    Les lignes sont des Row(instance, rang) — ou Row(colonnes de `base`…, rang) ;
+    retourne (requête, colonnes de tri, descendant).
+    """
+    terms = _terms(q)
+    backend = search_backend()
+    if base is None:
+        base = model.query
+
+    if not terms:
+        return base.add_columns(model.id).filter(db.false()), (model.id,), True
+
+    if backend == "postgres":
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        tsq = _pg_tsquery(terms)
+        rank = func.ts_rank(vector, tsq)
+        query = base.add_columns(rank).filter(vector.op("@@")(tsq))
+        return query, (rank, model.id), True
+
+    if backend == "fts5":
+        # poids 10 / 1 : titre (nom) avant description, comme setweight A / B côté Postgres
+        matches = (
+            text(f"SELECT rowid, bm25({fts_table}, 10.0, 1.0) AS rank FROM {fts_table} "
+                 f"WHERE {fts_table} MATCH :match")
+            .bindparams(match=_fts5_match(terms))
+            .columns(rowid=Integer, rank=Float)
+            .subquery()
+        )
+        query = (
+            base
+            .add_columns(matches.c.rank)
+            .join(matches, model.id == matches.c.rowid)
+        )
+        # bm25 : plus petit = plus pertinent
+        return query, (matches.c.rank, model.id), False
+
+    # Repli : ILIKE (sans index)
+    if model is Task:
+        fields = (Task.title, Task.description)
+    else:
+        fields = (Project.name, Project.description)
+    query = (
+        base
+        .add_columns(model.created_at)
+        .filter(or_(*[f.ilike(f"%{q}%") for f in fields]))
+    )
+    return query, (model.created_at, model.id), True
+
+
+def search_projects(user_id: int, q: str, cursor: str = None, per_page: int = SEARCH_PER_PAGE):
+    """Retourne (projets de la page, total, curseur de la page suivante)."""
+    query, columns, descending = _ranked(Project, "project_fts", q)
+    query = query.filter(Project.owner_id == user_id)
+
+    total = query.order_by(None).count() if not cursor else None
+    rows, next_cursor = keyset_page(query, columns, cursor, per_page, descending)
+
+    return [row[0] for row in rows], total, next_cursor
+
+
+def search_tasks(user_id: int, q: str, cursor: str = None, per_page: int = SEARCH_PER_PAGE):
+    """Retourne (cartes de la page, total, curseur de la page suivante)."""
+    query, columns, descending = _ranked(Task, "task_fts", q, card_query())
+    query = query.filter(Task.owner_id == user_id)
+
+    total = query.order_by(None).count() if not cursor else None
+    rows, next_cursor = keyset_page(query, columns, cursor, per_page, descending)
+
+    return to_cards(rows), total, next_cursor
@@ -0,0 +1,177 @@
+// Toast auto-hide
+window.addEventListener("load", () => {
+  const toasts = document.querySelectorAll("#toast-container .toast");
+  toasts.forEach((toast, index) => {
+    setTimeout(() => {
+      toast.style.opacity = "0";
+      toast.style.transform = "translateX(10px)";
+      setTimeout(() => toast.remove(), 250);
+    }, 3500 + index * 300);
+  });
+});
+
+// Bouton ✕ des toasts
+document.addEventListener("click", (e) => {
+  const btn = e.target.closest("#toast-container .toast-close");
+  if (!btn) return;
+  const toast = btn.parentElement;
+  toast.style.opacity = "0";
+  toast.style.transform = "translateX(10px)";
+  setTimeout(() => toast.remove(), 200);
+});
+
+// Header scrolled
+document.addEventListener("scroll", () => {
+  const header = document.querySelector(".app-header");
+  if (!header) return;
+  if (window.scrollY > 20) header.classList.add("scrolled");
+  else header.classList.remove("scrolled");
+});
+
+// Burger + drawer (safe)
+document.addEventListener("DOMContentLoaded", () => {
+  const burgerBtn = document.getElementById("burgerBtn");
+  const drawer = document.getElementById("drawer");
+  const backdrop = document.getElementById("drawerBackdrop");
+  const closeBtn = document.getElementById("drawerClose");
+
+  if (!burgerBtn || !drawer || !backdrop || !closeBtn) {
+    console.warn("Burger menu: élément manquant", { burgerBtn, drawer, backdrop, closeBtn });
+    return;
+  }
+
+  function openDrawer(){
+    drawer.classList.add("open");
+    backdrop.classList.add("open");
+    burgerBtn.setAttribute("aria-expanded", "true");
+    document.body.style.overflow = "hidden";
+  }
+
+  function closeDrawer(){
+    drawer.classList.remove("open");
+    backdrop.classList.remove("open");
+    burgerBtn.setAttribute("aria-expanded", "false");
+    document.body.style.overflow = "";
+  }
+
+  burgerBtn.addEventListener("click", openDrawer);
+  closeBtn.addEventListener("click", closeDrawer);
+  backdrop.addEventListener("click", closeDrawer);
+
+  document.addEventListener("keydown", (e) => {
+    if (e.key === "Escape") closeDrawer();
+  });
+});
+
+(function(){
+  const drawer = document.getElementById("taskDrawer");
+  const backdrop = document.getElementById("taskDrawerBackdrop");
+  const closeBtn = document.getElementById("taskDrawerClose");
+  const content = document.getElementById("taskDrawerContent");
+
+  let __isDragging = false;
+
+  document.addEventListener("dragstart", (e)=>{
+    if(e.target.closest(".task-card[draggable='true']")) __isDragging = true;
+  });
+  document.addEventListener("dragend", ()=>{
+    setTimeout(()=>{ __isDragging = false; }, 60);
+  });
+
+  function openDrawer(html){
+    content.innerHTML = html;
+    drawer.style.transform = "translateX(0)";
+    backdrop.style.opacity = "1";
+    backdrop.style.pointerEvents = "auto";
+    drawer.setAttribute("aria-hidden","false");
+    document.body.style.overflow = "hidden";
+  }
+
+  function closeDrawer(){
+    drawer.style.transform = "translateX(105%)";
+    backdrop.style.opacity = "0";
+    backdrop.style.pointerEvents = "none";
+    drawer.setAttribute("aria-hidden","true");
+    document.body.style.overflow = "";
+  }
+
+  closeBtn.addEventListener("click", closeDrawer);
+  backdrop.addEventListener("click", closeDrawer);
+  document.addEventListener("keydown", (e)=>{ if(e.key==="Escape") closeDrawer(); });
+
+  // Fiches déjà ouvertes sur cette page : affichées tout de suite, puis revalidées
+  // (ETag → 304 : le navigateur ressert sa copie, le serveur ne refait pas le rendu)
+  const drawerCache = new Map();
+  let currentTaskId = null;
+
+  async function loadTask(taskId){
+    currentTaskId = taskId;
+    const cached = drawerCache.get(taskId);
+    openDrawer(cached || `<div class="muted">Chargement…</div>`);
+
+    const res = await fetch(`/task/${taskId}/drawer`, {
+      headers: { "X-Requested-With": "XMLHttpRequest" },
+      cache: "no-cache"
+    });
+    if(currentTaskId !== taskId) return; // une autre tâche a été ouverte entre-temps
+
+    if(!res.ok){
+      drawerCache.delete(taskId);
+      openDrawer(`<div class="muted">Erreur chargement (${res.status})</div>`);
+      return;
+    }
+
+    const html = await res.text();
+    drawerCache.set(taskId, html);
+    if(html !== cached) openDrawer(html);
+  }
+
+  // ✅ CLICK TASK → OPEN DRAWER
+  document.addEventListener("click", (e)=>{
+    if(__isDragging) return; // 🔥 ICI
+    const el = e.target.closest(".js-task-open");
+    if(!el) return;
+    e.preventDefault();
+    const taskId = el.getAttribute("data-task-id");
+    if(taskId) loadTask(taskId);
+  });
+
+  window.__taskDrawerClose = closeDrawer;
+})();
+
+// "Charger plus" (pagination par curseur) : {html, next_url}
+// html = fragment pour data-target, ou {id_cible: fragment}
+document.addEventListener("click", async (e)=>{
+  const btn = e.target.closest(".js-load-more");
+  if(!btn || btn.disabled) return;
+  e.preventDefault();
+
+  btn.disabled = true;
+  const res = await fetch(btn.dataset.url, {
+    headers: { "X-Requested-With": "XMLHttpRequest" }
+  });
+  if(!res.ok){
+    btn.disabled = false;
+    return;
+  }
+
+  const data = await res.json();
+  const parts = typeof data.html === "string"
+    ? { [btn.dataset.target]: data.html }
+    : data.html;
+
+  Object.entries(parts).forEach(([id, html])=>{
+    const target = document.getElementById(id);
+    if(!target || !html.trim()) return;
+    target.insertAdjacentHTML("beforeend", html);
+    const hiddenParent = target.closest("[hidden]");
+    if(hiddenParent) hiddenParent.hidden = false;
+  });
+
+  if(data.next_url){
+    btn.dataset.url = data.next_url;
+    btn.disabled = false;
+  } else {
+    btn.remove();
+  }
+});
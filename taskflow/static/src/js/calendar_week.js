@@ -0,0 +1,197 @@
+(function(){
+  const grid = document.getElementById("weekGrid");
+  const label = document.getElementById("weekLabel");
+  const filters = new URLSearchParams(window.location.search);
+  ["view", "week_start"].forEach((k)=> filters.delete(k));
+
+  let draggedTaskId = null;
+  let weekStart = grid.getAttribute("data-week-start");
+  const weekCache = new Map();  // week_start → JSON /calendar/range
+
+  // ----- Dates (YYYY-MM-DD, sans souci de fuseau)
+  function addDays(iso, n){
+    const d = new Date(iso + "T00:00:00Z");
+    d.setUTCDate(d.getUTCDate() + n);
+    return d.toISOString().slice(0, 10);
+  }
+
+  function frDate(iso){
+    const [y, m, d] = iso.split("-");
+    return `${d}.${m}.${y}`;
+  }
+
+  function esc(value){
+    const div = document.createElement("div");
+    div.textContent = value == null ? "" : String(value);
+    return div.innerHTML;
+  }
+
+  // ----- Rendu d'une carte (même markup que le template)
+  const PLATFORM_PILLS = {
+    tiktok: ["pill-red", "TikTok"],
+    instagram: ["pill-pink", "Instagram"],
+    youtube: ["pill-red-strong", "YouTube"],
+  };
+  const PRIORITY_PILLS = {
+    low: ["pill-low", "Basse"],
+    high: ["pill-high", "Haute"],
+  };
+
+  function renderCard(t){
+    const type = t.task_type === "content"
+      ? `<span class="pill pill-pink">Contenu</span>`
+      : `<span class="pill pill-slate">Général</span>`;
+
+    let platform = "";
+    if(t.task_type === "content" && t.platform){
+      const [pillClass, name] = PLATFORM_PILLS[t.platform] || ["pill-blue", "Multi"];
+      platform = `<span class="pill ${pillClass}">${name}</span>`;
+    }
+
+    const [prioClass, prioLabel] = PRIORITY_PILLS[t.priority] || ["pill-medium", "Moyenne"];
+
+    return `
+      <div class="task-card js-task-open cal-task" data-task-id="${t.id}" draggable="true">
+        <div class="task-title cal-task-title">${esc(t.title)}</div>
+        <div class="task-meta cal-task-meta">
+          <div class="pill-row">
+            ${type}${platform}<span class="pill ${prioClass}">${prioLabel}</span>
+          </div>
+          <div class="muted cal-more">${esc(t.project_name)}</div>
+        </div>
+      </div>`;
+  }
+
+  function renderWeek(data){
+    const columns = grid.querySelectorAll("[data-drop-date]");
+    data.days.forEach((day, i)=>{
+      const col = columns[i];
+      if(!col) return;
+      col.setAttribute("data-drop-date", day.date);
+      col.querySelector(".js-day-name").textContent = day.weekday;
+      col.querySelector(".js-day-num").textContent = day.day;
+      col.querySelectorAll(".task-card, .js-day-empty").forEach((el)=> el.remove());
+      col.insertAdjacentHTML("beforeend", day.tasks.length
+        ? day.tasks.map(renderCard).join("")
+        : `<p class="muted js-day-empty text-xs">Aucune tâche ce jour.</p>`);
+      refreshCount(col);
+    });
+  }
+
+  function refreshCount(col){
+    const n = col.querySelectorAll(".task-card").length;
+    const count = col.querySelector(".js-day-count");
+    if(count) count.textContent = n > 0 ? `${n} tâche${n > 1 ? "s" : ""}` : "";
+    const empty = col.querySelector(".js-day-empty");
+    if(n > 0 && empty) empty.remove();
+    if(n === 0 && !empty){
+      col.insertAdjacentHTML("beforeend", `<p class="muted js-day-empty text-xs">Aucune tâche ce jour.</p>`);
+    }
+  }
+
+  // ----- Chargement incrémental d'une semaine (avec cache)
+  async function fetchWeek(start){
+    if(weekCache.has(start)) return weekCache.get(start);
+    const params = new URLSearchParams(filters);
+    params.set("start", start);
+    params.set("end", addDays(start, 7));
+    const res = await fetch(`/calendar/range?${params}`, {
+      headers: { "X-Requested-With": "XMLHttpRequest" }
+    });
+    if(!res.ok) throw new Error(`range ${res.status}`);
+    const data = await res.json();
+    weekCache.set(start, data);
+    return data;
+  }
+
+  function prefetchAround(start){
+    [-7, 7].forEach((n)=> fetchWeek(addDays(start, n)).catch(()=>{}));
+  }
+
+  async function goToWeek(start, link){
+    try{
+      renderWeek(await fetchWeek(start));
+    }catch(err){
+      window.location.href = link.href;  // fallback : rechargement classique
+      return;
+    }
+    weekStart = start;
+    grid.setAttribute("data-week-start", start);
+    label.textContent = `Semaine du ${frDate(start)}`;
+
+    const params = new URLSearchParams(filters);
+    params.set("view", "week");
+    params.set("week_start", start);
+    history.pushState({ weekStart: start }, "", `?${params}`);
+    prefetchAround(start);
+  }
+
+  document.addEventListener("click", (e)=>{
+    const link = e.target.closest("[data-week-nav]");
+    if(!link) return;
+    e.preventDefault();
+    const delta = link.getAttribute("data-week-nav") === "prev" ? -7 : 7;
+    goToWeek(addDays(weekStart, delta), link);
+  });
+
+  window.addEventListener("popstate", ()=> window.location.reload());
+
+  // ----- Drag & drop
+  document.addEventListener("dragstart", (e)=>{
+    const card = e.target.closest(".task-card[draggable='true']");
+    if(!card) return;
+    draggedTaskId = card.getAttribute("data-task-id");
+    card.classList.add("dragging");
+  });
+
+  document.addEventListener("dragend", (e)=>{
+    const card = e.target.closest(".task-card[draggable='true']");
+    if(card) card.classList.remove("dragging");
+    draggedTaskId = null;
+  });
+
+  document.addEventListener("dragover", (e)=>{
+    const col = e.target.closest("[data-drop-date]");
+    if(!col) return;
+    e.preventDefault();
+    col.classList.add("drag-over");
+  });
+
+  document.addEventListener("dragleave", (e)=>{
+    const col = e.target.closest("[data-drop-date]");
+    if(!col) return;
+    col.classList.remove("drag-over");
+  });
+
+  document.addEventListener("drop", async (e)=>{
+    const col = e.target.closest("[data-drop-date]");
+    if(!col || !draggedTaskId) return;
+    e.preventDefault();
+    col.classList.remove("drag-over");
+
+    const taskId = draggedTaskId;
+    const newDate = col.getAttribute("data-drop-date");
+
+    const res = await fetch(`/task/${taskId}/move_date`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ due_date: newDate })
+    });
+
+    if(res.ok){
+      // Déplacement local de la carte, sans recharger la page
+      const card = grid.querySelector(`.task-card[data-task-id="${taskId}"]`);
+      const from = card && card.closest("[data-drop-date]");
+      if(card && from !== col){
+        col.appendChild(card);
+        refreshCount(from);
+        refreshCount(col);
+      }
+      weekCache.clear();
+    }else{
+      alert("Impossible de déplacer la tâche.");
+    }
+  });
+
+  prefetchAround(weekStart);
+})();
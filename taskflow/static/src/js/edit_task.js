@@ -0,0 +1,21 @@
+// Affiche / masque les options "créateur" selon le type sélectionné
+document.addEventListener("DOMContentLoaded", function () {
+  const typeSelect = document.getElementById("task_type");
+  const contentOptions = document.getElementById("content-options");
+
+  function toggleContentOptions() {
+    if (!typeSelect || !contentOptions) return;
+
+    if (typeSelect.value === "content") {
+      contentOptions.style.display = "block";
+    } else {
+      contentOptions.style.display = "none";
+    }
+  }
+
+  if (typeSelect) {
+    typeSelect.addEventListener("change", toggleContentOptions);
+    // Init en fonction de la valeur actuelle (si tâche déjà "content")
+    toggleContentOptions();
+  }
+});
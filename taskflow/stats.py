@@ -0,0 +1,109 @@
+# taskflow/stats.py
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+
+from sqlalchemy import case, func
+
+from . import db
+from .models import Task
+
+
+@dataclass(frozen=True)
+class TaskStats:
+    """Tous les compteurs de tâches d'un utilisateur, calculés en une seule requête."""
+
+    # Tâches ouvertes (status != done)
+    open_total: int = 0
+    open_general: int = 0
+    open_content: int = 0
+
+    # Contenus (toutes étapes / tous statuts)
+    content_total: int = 0
+    content_to_film: int = 0
+    content_to_edit: int = 0
+    content_scheduled: int = 0
+    content_scheduled_today: int = 0
+
+    # Contenus ouverts par étape
+    content_open_today: int = 0
+    content_open_to_film: int = 0
+    content_open_to_edit: int = 0
+    content_open_scheduled: int = 0
+
+    # Tâches terminées (par Task.completed_at, comme le rollup des analytics)
+    done_week: int = 0
+    done_month: int = 0
+
+
+def _count_if(condition):
+    """
+    COUNT conditionnel : FILTER (WHERE …) sur Postgres,
+    SUM(CASE …) ailleurs (SQLite, etc.).
+    """
+    if db.engine.dialect.name == "postgresql":
+        return func.count().filter(condition)
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def stats_query(user_id: int, today: date = None):
+    """Requête agrégée unique (une ligne, une colonne par compteur de TaskStats)."""
+    today = today or date.today()
+    start_today = datetime.combine(today, datetime.min.time())
+    end_today = datetime.combine(today, datetime.max.time())
+
+    # Lundi de la semaine / 1er du mois
+    start_week = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time())
+    start_month = datetime.combine(today.replace(day=1), datetime.min.time())
+
+    is_open = Task.status != "done"
+    is_done = Task.status == "done"
+    is_content = Task.task_type == "content"
+    is_general = Task.task_type != "content"
+    due_today = Task.due_date.between(start_today, end_today)
+    done_this_week = is_done & Task.completed_at.between(start_week, end_today)
+    done_this_month = is_done & Task.completed_at.between(start_month, end_today)
+
+    counters = {
+        "open_total": is_open,
+        "open_general": is_open & is_general,
+        "open_content": is_open & is_content,
+        "content_total": is_content,
+        "content_to_film": is_content & (Task.creator_stage == "to_film"),
+        "content_to_edit": is_content & (Task.creator_stage == "to_edit"),
+        "content_scheduled": is_content & (Task.creator_stage == "scheduled"),
+        "content_scheduled_today": (
+            is_content & (Task.creator_stage == "scheduled") & due_today
+        ),
+        "content_open_today": is_content & is_open & due_today,
+        "content_open_to_film": is_content & is_open & (Task.creator_stage == "to_film"),
+        "content_open_to_edit": is_content & is_open & (Task.creator_stage == "to_edit"),
+        "content_open_scheduled": (
+            is_content & is_open & (Task.creator_stage == "scheduled")
+        ),
+        "done_week": done_this_week,
+        "done_month": done_this_month,
+    }
+
+    return (
+        db.session.query(*[_count_if(cond).label(name) for name, cond in counters.items()])
+        .select_from(Task)
+        .filter(Task.owner_id == user_id)
+    )
+
+
+def get_task_stats(user_id: int, today: date = None) -> TaskStats:
+    row = stats_query(user_id, today).one()
+    return TaskStats(**{name: int(value or 0) for name, value in row._mapping.items()})
+
+
+def open_counts_query(user_id: int):
+    return (
+        db.session.query(Task.project_id, func.count())
+        .filter(Task.owner_id == user_id, Task.status != "done")
+        .group_by(Task.project_id)
+    )
+
+
+def open_counts_by_project(user_id: int):
+    """{project_id: tâches ouvertes} en une requête groupée (cartes projet du dashboard)."""
+    return dict(open_counts_query(user_id).all())
@@ -0,0 +1,70 @@
+# taskflow/templating.py
+import os
+import tempfile
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+
+def _html_templates(env):
+    return env.list_templates(filter_func=lambda name: name.endswith(".html"))
+
+
+def configure_templates(app):
+    """
+    Cache de bytecode Jinja sur disque (partagé entre workers et redémarrages :
+    un template déjà compilé n'est plus re-parsé), puis warm-up optionnel.
+    """
+    directory = app.config.get("TEMPLATE_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), "taskflow-jinja-cache"
+    )
+    if directory != "none":
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    if app.config.get("TEMPLATE_WARMUP", True):
+        started = time.perf_counter()
+        count = len(warm_templates(app.jinja_env))
+        app.logger.info(
+            "%d templates précompilés en %.1f ms", count, (time.perf_counter() - started) * 1000
+        )
+
+
+def warm_templates(env):
+    """
+    Charge tous les templates .html dans le cache de l'environnement.
+    Avec gunicorn --preload, fait une fois dans le master : les workers héritent
+    des templates compilés au fork. Retourne {template: secondes}.
+    """
+    timings = {}
+    for name in _html_templates(env):
+        started = time.perf_counter()
+        env.get_template(name)
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def compile_report(env):
+    """
+    Coût par template : compilation depuis la source (parse + génération + compile Python)
+    et chargement depuis le cache de bytecode. [(template, octets, compile_ms, bytecode_ms)]
+    """
+    rows = []
+    for name in _html_templates(env):
+        source, filename, _ = env.loader.get_source(env, name)
+
+        started = time.perf_counter()
+        env.compile(source, name, filename)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        bytecode_ms = None
+        if env.bytecode_cache is not None:
+            env.cache.clear()
+            env.get_template(name)  # écrit le bytecode s'il manque
+            env.cache.clear()
+            started = time.perf_counter()
+            env.get_template(name)
+            bytecode_ms = (time.perf_counter() - started) * 1000
+
+        rows.append((name, len(source.encode("utf-8")), compile_ms, bytecode_ms))
+    return rows
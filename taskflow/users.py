@@ -0,0 +1,57 @@
+# taskflow/users.py
+from flask import current_app
+from flask_login import UserMixin
+
+from . import db, login_manager
+from .cache import MemoryCache, NullCache, view_cache
+from .models import User
+
+# Snapshots des users connectés, propres au worker (TTL court en plus de la version)
+_snapshots = MemoryCache(max_entries=4096)
+
+
+class UserSnapshot(UserMixin):
+    """
+    Copie en lecture seule de l'utilisateur connecté (sans session SQLAlchemy).
+    Pour modifier le compte : db.session.get(User, current_user.id), puis forget_user().
+    """
+
+    FIELDS = ("id", "email", "name", "created_at", "user_type", "onboarding_done", "feed_token")
+
+    def __init__(self, user: User):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(user, field))
+
+    @property
+    def is_creator(self) -> bool:
+        return self.user_type == "creator"
+
+
+@login_manager.user_loader
+def load_user(user_id: str):
+    user_id = int(user_id)
+
+    # Cache de vues désactivé : pas de version partagée, on relit la base
+    if isinstance(view_cache.backend, NullCache):
+        return db.session.get(User, user_id)
+
+    # La version du compte (partagée entre workers, bumpée par forget_user seulement)
+    # invalide le snapshot ; les écritures de tâches/projets ne le touchent pas
+    version = view_cache.account_version(user_id)
+    cached = _snapshots.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    snapshot = UserSnapshot(user)
+    _snapshots.set(user_id, (version, snapshot), ttl=current_app.config["USER_CACHE_TTL"])
+    return snapshot
+
+
+def forget_user(user_id: int):
+    """À appeler après toute modification du compte (profil, mot de passe, type…)."""
+    view_cache.bump_account(user_id)
+    # les pages affichent aussi le compte (nom, type)
+    view_cache.bump(user_id)
@@ -0,0 +1,68 @@
+# tests/conftest.py
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# Avant l'import de taskflow : Config lit l'environnement à l'import
+os.environ.setdefault("VIEW_CACHE_BACKEND", "none")
+os.environ.setdefault("TEMPLATE_CACHE_DIR", "none")
+os.environ.setdefault("TEMPLATE_WARMUP", "0")
+
+from flask_migrate import upgrade  # noqa: E402
+
+from taskflow import create_app, db  # noqa: E402
+from taskflow.config import Config  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    App sur une base SQLite neuve, schéma créé par les migrations (comme en prod).
+    Pas de contexte poussé : chaque requête du client a le sien (g, session), comme en prod ;
+    les tests ouvrent `with app.app_context():` pour lire la base.
+    """
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        upgrade()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def logged_in(client):
+    """Client connecté avec un compte créateur tout neuf."""
+    client.post("/register", data={"name": "Test", "email": "test@example.test", "password": "secret1"})
+    client.post("/onboarding", data={"user_type": "creator"})
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """with count_queries() as queries: … → len(queries) = requêtes SQL exécutées."""
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counter
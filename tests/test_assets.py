@@ -0,0 +1,59 @@
+# tests/test_assets.py
+import gzip
+import json
+import re
+
+from flask import render_template_string
+
+from taskflow.assets import IMMUTABLE_MAX_AGE, assets, build_assets
+
+
+def test_asset_url_uses_the_manifest(app):
+    hashed = assets.manifest["css/app.css"]
+    with app.test_request_context():
+        assert render_template_string("{{ asset_url('css/app.css') }}") == f"/assets/{hashed}"
+        # pas dans le manifest : la source, sans hash
+        assert render_template_string("{{ asset_url('css/inconnu.css') }}") == "/static/src/css/inconnu.css"
+
+
+def test_hashed_asset_is_immutable(client):
+    hashed = assets.manifest["css/app.css"]
+    response = client.get(f"/assets/{hashed}")
+    assert response.status_code == 200
+    assert response.mimetype == "text/css"
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == IMMUTABLE_MAX_AGE
+    response.close()
+
+
+def test_unknown_hashed_names_are_404(client):
+    stem = assets.manifest["css/app.css"].rsplit(".", 2)[0]
+    assert client.get(f"/assets/{stem}.0000000000.css").status_code == 404
+    assert client.get("/assets/css/app.css").status_code == 404  # nom source, pas hashé
+    assert client.get("/assets/manifest.json").status_code == 404
+
+
+def test_build_fingerprints_by_content(tmp_path):
+    (tmp_path / "src" / "css").mkdir(parents=True)
+    source = tmp_path / "src" / "css" / "app.css"
+    source.write_text("body { color: red }", encoding="utf-8")
+
+    first = build_assets(str(tmp_path), echo=lambda *_: None)
+    gz = (tmp_path / "dist" / (first["css/app.css"] + ".gz")).read_bytes()
+    assert gzip.decompress(gz) == source.read_bytes()
+    assert json.loads((tmp_path / "dist" / "manifest.json").read_text()) == first
+
+    assert build_assets(str(tmp_path), echo=lambda *_: None) == first  # même contenu, même nom
+    assert (tmp_path / "dist" / (first["css/app.css"] + ".gz")).read_bytes() == gz
+
+    source.write_text("body { color: blue }", encoding="utf-8")
+    second = build_assets(str(tmp_path), echo=lambda *_: None)
+    assert second["css/app.css"] != first["css/app.css"]
+    assert not (tmp_path / "dist" / first["css/app.css"]).exists()  # ancien build retiré
+
+
+def test_pages_have_no_inline_css_or_js(logged_in):
+    for url in ("/creator", "/dashboard", "/today", "/calendar", "/calendar?view=month", "/analytics"):
+        page = logged_in.get(url).get_data(as_text=True)
+        assert "<style" not in page, url
+        assert re.findall(r"<script(?![^>]*\bsrc=)[^>]*>", page) == [], url
@@ -0,0 +1,52 @@
+# tests/test_bench.py
+from sqlalchemy import func
+
+from taskflow import db
+from taskflow.bench import BENCH_EMAIL, compare_to_baseline, generate_dataset, run_benchmark
+from taskflow.models import Task, TaskEvent, UserDailyStats
+
+
+def _tasks_of(user_id):
+    return [
+        (t.title, t.status, t.task_type, t.creator_stage, t.due_date)
+        for t in Task.query.filter_by(owner_id=user_id).order_by(Task.id)
+    ]
+
+
+def test_dataset_is_reproducible_and_derived_tables_match(app):
+    with app.app_context():
+        first, total = generate_dataset(1, 2, 30, seed=7, batch=25, echo=lambda *_: None)
+        second, _ = generate_dataset(1, 2, 30, seed=7, echo=lambda *_: None)
+        other, _ = generate_dataset(1, 2, 30, seed=8, echo=lambda *_: None)
+
+        assert total == 60
+        assert _tasks_of(first[0]) == _tasks_of(second[0])  # même seed → mêmes tâches
+        assert _tasks_of(first[0]) != _tasks_of(other[0])
+
+        done = Task.query.filter_by(status="done").count()
+        assert TaskEvent.query.count() == done
+        rollup = db.session.scalar(func.sum(UserDailyStats.done_general + UserDailyStats.done_content).select())
+        assert rollup == done
+
+
+def test_every_benchmarked_route_answers(app):
+    with app.app_context():
+        generate_dataset(1, 2, 20, echo=lambda *_: None)
+        results = run_benchmark(app, BENCH_EMAIL.format(n=1), iterations=2)
+
+    assert {"main.dashboard", "main.calendar_range", "main.search", "main.project_detail"} <= set(results)
+    # login / register / onboarding redirigent un user déjà connecté
+    assert {endpoint: r["status"] for endpoint, r in results.items() if r["status"] >= 400} == {}
+    assert all(r["queries"] >= 0 and r["p50_ms"] <= r["p99_ms"] for r in results.values())
+
+
+def test_regressions_need_both_tolerance_and_floor():
+    baseline = {"main.dashboard": {"p50_ms": 10.0, "queries": 4}}
+
+    assert compare_to_baseline({"main.dashboard": {"p50_ms": 14.0, "queries": 4}}, baseline) == []
+    assert compare_to_baseline({"main.dashboard": {"p50_ms": 16.0, "queries": 4}}, baseline) == [
+        ("main.dashboard", "p50 10.0 → 16.0 ms"),
+    ]
+    assert compare_to_baseline({"main.dashboard": {"p50_ms": 9.0, "queries": 5}}, baseline) == [
+        ("main.dashboard", "requêtes 4 → 5"),
+    ]
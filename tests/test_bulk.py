@@ -0,0 +1,122 @@
+# tests/test_bulk.py
+from sqlalchemy import func
+
+from taskflow import db
+from taskflow.bulk import MAX_BULK_OPS
+from taskflow.models import Project, Task, TaskEvent, UserDailyStats
+
+
+def _add_tasks(app, client, titles, **fields):
+    """Projet + une tâche par titre ; retourne {titre: id}."""
+    client.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.order_by(Project.id.desc()).first().id
+    for title in titles:
+        client.post(f"/project/{project_id}/task/add", data={"title": title})
+    with app.app_context():
+        tasks = Task.query.filter_by(project_id=project_id).all()
+        for task in tasks:
+            for name, value in fields.items():
+                setattr(task, name, value)
+        db.session.commit()
+        return {t.title: t.id for t in tasks}
+
+
+def _bulk(client, ops):
+    return client.post("/api/tasks/bulk", json={"ops": ops})
+
+
+def _done_total(app):
+    with app.app_context():
+        return db.session.scalar(
+            func.coalesce(func.sum(UserDailyStats.done_general + UserDailyStats.done_content), 0).select()
+        )
+
+
+def test_foreign_task_is_404_and_nothing_is_written(app, logged_in):
+    mine = _add_tasks(app, logged_in, ["à moi"])
+
+    other = app.test_client()
+    other.post("/register", data={"name": "Autre", "email": "autre@example.test", "password": "secret1"})
+    other.post("/onboarding", data={"user_type": "creator"})
+    theirs = _add_tasks(app, other, ["pas à moi"])
+
+    response = _bulk(logged_in, [
+        {"id": mine["à moi"], "op": "status", "value": "done"},
+        {"id": theirs["pas à moi"], "op": "delete"},
+    ])
+
+    assert response.status_code == 404
+    with app.app_context():
+        assert db.session.get(Task, mine["à moi"]).status == "todo"
+        assert db.session.get(Task, theirs["pas à moi"]) is not None
+        assert TaskEvent.query.count() == 0
+
+
+def test_invalid_op_rolls_back_the_whole_batch(app, logged_in):
+    ids = _add_tasks(app, logged_in, ["a", "b"])
+
+    response = _bulk(logged_in, [
+        {"id": ids["a"], "op": "status", "value": "done"},
+        {"id": ids["b"], "op": "creator_stage", "value": "to_film"},  # tâche générale
+    ])
+
+    assert response.status_code == 400
+    assert response.get_json()["index"] == 1
+    with app.app_context():
+        assert db.session.get(Task, ids["a"]).status == "todo"
+        assert TaskEvent.query.count() == 0
+    assert _done_total(app) == 0
+
+
+def test_status_and_stage_changes_are_logged(app, logged_in):
+    ids = _add_tasks(app, logged_in, ["vidéo"], task_type="content", creator_stage="idea")
+
+    response = _bulk(logged_in, [
+        {"id": ids["vidéo"], "op": "creator_stage", "value": "to_film"},
+        {"id": ids["vidéo"], "op": "status", "value": "done"},
+    ])
+
+    assert response.get_json() == {"ok": True, "updated": 1, "deleted": 0}
+    with app.app_context():
+        events = [(e.kind, e.from_status, e.to_status) for e in TaskEvent.query.order_by(TaskEvent.id)]
+    assert events == [("stage", "idea", "to_film"), ("status", "todo", "done")]
+    assert _done_total(app) == 1
+
+
+def test_rollup_is_decremented_when_done_tasks_are_reopened_or_deleted(app, logged_in):
+    ids = _add_tasks(app, logged_in, ["rouverte", "supprimée", "gardée"])
+    _bulk(logged_in, [{"id": task_id, "op": "status", "value": "done"} for task_id in ids.values()])
+    assert _done_total(app) == 3
+
+    response = _bulk(logged_in, [
+        {"id": ids["rouverte"], "op": "status", "value": "todo"},
+        {"id": ids["supprimée"], "op": "delete"},
+    ])
+
+    assert response.get_json() == {"ok": True, "updated": 1, "deleted": 1}
+    assert _done_total(app) == 1
+    with app.app_context():
+        assert db.session.get(Task, ids["supprimée"]) is None
+
+
+def test_query_count_does_not_grow_with_batch_size(app, logged_in, count_queries):
+    ids = list(_add_tasks(app, logged_in, [f"t{i}" for i in range(10)]).values())
+
+    def run(batch):
+        with count_queries() as queries:
+            response = _bulk(logged_in, [{"id": i, "op": "priority", "value": "high"} for i in batch])
+        assert response.status_code == 200
+        return len(queries)
+
+    assert run(ids[:2]) == run(ids)
+
+
+def test_batch_is_capped(app, logged_in):
+    ids = _add_tasks(app, logged_in, ["a"])
+
+    response = _bulk(logged_in, [{"id": ids["a"], "op": "priority", "value": "low"}] * (MAX_BULK_OPS + 1))
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert db.session.get(Task, ids["a"]).priority == "medium"
@@ -0,0 +1,63 @@
+# tests/test_cache.py
+import threading
+
+import pytest
+from flask import Flask
+
+from taskflow import cache
+from taskflow.cache import SQLiteCache, build_id, default_cache_path, view_cache
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_sqlite_incr_gives_each_caller_its_own_value(tmp_path, monkeypatch, returning):
+    monkeypatch.setattr(cache, "_SQLITE_RETURNING", returning)
+    backend = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    results = []
+
+    def bump():
+        results.extend(backend.incr("v:1") for _ in range(50))
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(results)) == len(results) == 400
+    assert max(results) == backend.get("v:1")
+
+
+def test_default_path_is_one_file_per_database():
+    prod = default_cache_path("postgresql://u@prod/taskflow")
+    assert prod == default_cache_path("postgresql://u@prod/taskflow")
+    assert prod != default_cache_path("postgresql://u@staging/taskflow")
+    assert prod != default_cache_path("sqlite:///instance/taskflow.db")
+
+
+@pytest.mark.parametrize("args", [["rollup-backfill"], ["rollup-backfill", "--user-id", "1"]])
+def test_rollup_backfill_moves_cached_versions(app, tmp_path, monkeypatch, args):
+    monkeypatch.setattr(view_cache, "backend", SQLiteCache(str(tmp_path / "cache.sqlite")))
+    before = view_cache.user_version(1)
+
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=args)
+
+    assert result.exit_code == 0, result.output
+    assert view_cache.user_version(1) > before
+
+
+def test_build_id_is_stable_and_follows_templates(tmp_path, monkeypatch):
+    monkeypatch.delenv("RENDER_GIT_COMMIT", raising=False)
+    (tmp_path / "templates").mkdir()
+    page = tmp_path / "templates" / "page.html"
+    page.write_text("<p>v1</p>", encoding="utf-8")
+    app = Flask("build", root_path=str(tmp_path))
+
+    first = build_id(app)
+    assert build_id(app) == first  # redémarrage / autre worker : mêmes ETags
+
+    page.write_text("<p>v2</p>", encoding="utf-8")
+    assert build_id(app) != first
+
+    monkeypatch.setenv("RENDER_GIT_COMMIT", "abc123")
+    assert build_id(app) == "abc123"
@@ -0,0 +1,57 @@
+# tests/test_calendar.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from taskflow import db
+from taskflow.agenda import MAX_RANGE_DAYS
+from taskflow.models import Project, Task
+
+
+def _add_due(app, client, due_dates):
+    """Projet + une tâche par échéance (titre = date ISO)."""
+    client.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project = Project.query.one()
+        for due in due_dates:
+            db.session.add(Task(
+                project_id=project.id, owner_id=project.owner_id, title=due.isoformat(),
+                due_date=datetime.combine(due, datetime.min.time()) + timedelta(hours=9),
+            ))
+        db.session.commit()
+
+
+def _range(client, start, end):
+    return client.get(f"/calendar/range?start={start.isoformat()}&end={end.isoformat()}")
+
+
+def test_range_returns_only_the_window_bucketed_by_day(app, logged_in):
+    start = date(2026, 3, 2)
+    _add_due(app, logged_in, [start - timedelta(days=1), start, start + timedelta(days=6), start + timedelta(days=7)])
+
+    response = _range(logged_in, start, start + timedelta(days=7))
+
+    assert response.status_code == 200
+    days = response.get_json()["days"]
+    assert [d["date"] for d in days] == [(start + timedelta(days=i)).isoformat() for i in range(7)]
+    titles = [t["title"] for d in days for t in d["tasks"]]
+    assert titles == [start.isoformat(), (start + timedelta(days=6)).isoformat()]  # [start, end[
+
+
+@pytest.mark.parametrize("days", [MAX_RANGE_DAYS + 1, 0, -7])
+def test_range_rejects_windows_outside_the_limit(logged_in, days):
+    start = date(2026, 1, 1)
+    response = _range(logged_in, start, start + timedelta(days=days))
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "bad range"}
+
+
+def test_range_accepts_the_maximum_window(logged_in):
+    start = date(2026, 1, 1)
+    response = _range(logged_in, start, start + timedelta(days=MAX_RANGE_DAYS))
+    assert response.status_code == 200
+    assert len(response.get_json()["days"]) == MAX_RANGE_DAYS
+
+
+def test_range_rejects_bad_dates(logged_in):
+    assert logged_in.get("/calendar/range?start=2026-01-01&end=demain").status_code == 400
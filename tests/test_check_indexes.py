@@ -0,0 +1,42 @@
+# tests/test_check_indexes.py
+from sqlalchemy import text
+
+from taskflow import db
+from taskflow.cli import explain_plan, hot_queries, is_paginated
+
+
+def _check_indexes(app):
+    with app.app_context():  # comme `flask check-indexes`
+        return app.test_cli_runner().invoke(args=["check-indexes", "--user-id", "1", "-v"])
+
+
+def _plans(app):
+    with app.app_context():
+        return {name: (explain_plan(q), is_paginated(q)) for name, q in hot_queries(1).items()}
+
+
+def test_hot_queries_use_indexes(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+
+    result = _check_indexes(app)
+    assert result.exit_code == 0, result.output
+
+    plans = _plans(app)
+    assert {"creator.backlog", "creator.pipeline_more", "project_detail.tasks"} <= {
+        name for name, (_, paginated) in plans.items() if paginated
+    }
+    for name, (plan, paginated) in plans.items():
+        assert not any(line.startswith("SCAN task") for line in plan), (name, plan)
+        if paginated:
+            assert not any("TEMP B-TREE" in line for line in plan), (name, plan)
+
+
+def test_check_fails_when_a_page_has_to_sort(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        db.session.execute(text("DROP INDEX ix_task_project_status_created"))
+        db.session.commit()
+
+    result = _check_indexes(app)
+    assert result.exit_code == 1
+    assert "project_detail.tasks     SORT" in result.output
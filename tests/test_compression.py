@@ -0,0 +1,159 @@
+# tests/test_compression.py
+import gzip
+import zlib
+
+import pytest
+from flask import Response, stream_with_context
+
+from taskflow import compression
+from taskflow.assets import assets
+from taskflow.compression import compress_stream
+from taskflow.models import Project, Task
+
+PAGE = "<p>" + "tâche " * 200 + "</p>"  # bien au-dessus de COMPRESSION_MIN_SIZE
+
+
+@pytest.fixture
+def routes(app):
+    """Routes de test, ajoutées avant la première requête."""
+
+    @app.route("/_t/page")
+    def page():
+        return PAGE
+
+    @app.route("/_t/small")
+    def small():
+        return "<p>ok</p>"
+
+    @app.route("/_t/encoded")
+    def encoded():
+        return Response(gzip.compress(PAGE.encode()), mimetype="text/html", headers={"Content-Encoding": "gzip"})
+
+    @app.route("/_t/etag")
+    def etag():
+        response = Response(PAGE, mimetype="text/html")
+        response.set_etag("v1")
+        return response
+
+    @app.route("/_t/not-modified")
+    def not_modified():
+        response = Response(status=304, mimetype="text/html")
+        response.set_etag("v1")
+        return response
+
+    @app.route("/_t/stream")
+    def stream():
+        return Response(stream_with_context(f"ligne {i}\n" for i in range(3)), mimetype="text/plain")
+
+    return app.test_client()
+
+
+def _get(client, path, accept="gzip", **kwargs):
+    return client.get(path, headers={"Accept-Encoding": accept, **kwargs.pop("headers", {})}, **kwargs)
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="module brotli absent")
+def test_brotli_is_preferred_when_accepted(routes):
+    response = _get(routes, "/_t/page", "gzip, deflate, br")
+    assert response.headers["Content-Encoding"] == "br"
+    assert compression.brotli.decompress(response.data).decode() == PAGE
+
+
+def test_gzip_without_brotli(routes, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = _get(routes, "/_t/page", "gzip, br")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).decode() == PAGE
+    assert "Accept-Encoding" in response.vary
+
+
+def test_identity_when_nothing_is_accepted(routes):
+    response = _get(routes, "/_t/page", "identity")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == PAGE
+    assert "Accept-Encoding" in response.vary  # un cache ne doit pas la resservir à un client gzip
+
+
+def test_small_bodies_are_sent_as_is(routes):
+    response = _get(routes, "/_t/small")
+    assert "Content-Encoding" not in response.headers
+    assert response.data == b"<p>ok</p>"
+
+
+def test_already_encoded_response_is_not_compressed_twice(routes):
+    response = _get(routes, "/_t/encoded")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).decode() == PAGE
+
+
+def test_assets_are_served_precompressed_not_recompressed(app, routes):
+    name = assets.manifest["css/app.css"]
+    response = _get(routes, f"/assets/{name}", "gzip")
+    with open(f"{app.static_folder}/dist/{name}.gz", "rb") as f:
+        assert response.data == f.read()
+    assert response.headers["Content-Encoding"] == "gzip"
+    response.close()
+
+
+def test_strong_etag_is_weakened_on_200_and_304(routes):
+    response = _get(routes, "/_t/etag")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.get_etag() == ("v1", True)
+
+    response = _get(routes, "/_t/not-modified")
+    assert response.get_etag() == ("v1", True)
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streamed_response_is_compressed_on_the_fly(routes):
+    response = _get(routes, "/_t/stream")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == b"ligne 0\nligne 1\nligne 2\n"
+
+
+def test_compress_stream_flushes_each_chunk():
+    chunks = ["en-tête\n", "ligne 1\n", "ligne 2\n"]
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    received = []
+    for data in compress_stream(iter(chunks), "gzip", 6):
+        received.append(decoder.decompress(data).decode())
+    # chaque chunk est lisible dès son arrivée, sans attendre la fin du flux
+    assert received[:3] == chunks
+    assert decoder.eof
+
+
+def test_streamed_export_is_compressed(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    logged_in.post(f"/project/{project_id}/task/add", data={"title": "Tourner l'intro"})
+
+    response = _get(logged_in, "/export/tasks.csv")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Tourner l'intro" in gzip.decompress(response.data).decode()
+
+    # ?gzip=1 : fichier .gz déjà compressé → pas de seconde couche
+    response = _get(logged_in, "/export/tasks.csv?gzip=1")
+    assert "Content-Encoding" not in response.headers
+    assert "Tourner l'intro" in gzip.decompress(response.data).decode()
+
+
+def test_not_modified_drawer_passes_through(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    logged_in.post(f"/project/{project_id}/task/add", data={"title": "T"})
+    with app.app_context():
+        task_id = Task.query.one().id
+    with logged_in.session_transaction() as session:
+        session.pop("_flashes", None)  # pas d'ETag tant que des flash attendent
+
+    first = _get(logged_in, f"/task/{task_id}/drawer")
+    assert first.status_code == 200
+
+    response = _get(logged_in, f"/task/{task_id}/drawer", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == first.headers["ETag"]
@@ -0,0 +1,37 @@
+# tests/test_dashboard.py
+from taskflow.models import Project, Task
+
+
+def _add_projects(app, client, count):
+    """`count` projets avec une tâche ouverte et une tâche terminée chacun."""
+    with app.app_context():
+        existing = {p.id for p in Project.query.all()}
+    for i in range(count):
+        client.post("/project/new", data={"name": f"P{len(existing) + i}", "description": ""})
+    with app.app_context():
+        new_ids = [p.id for p in Project.query.filter(Project.id.notin_(existing))]
+    for project_id in new_ids:
+        for title in ("ouverte", "terminée"):
+            client.post(f"/project/{project_id}/task/add", data={"title": title})
+        with app.app_context():
+            done_id = Task.query.filter_by(project_id=project_id, title="terminée").one().id
+        client.post(f"/task/{done_id}/status/done")
+
+
+def _dashboard_queries(client, count_queries):
+    with count_queries() as queries:
+        response = client.get("/dashboard")
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_dashboard_query_count_does_not_grow_with_projects(app, logged_in, count_queries):
+    _add_projects(app, logged_in, 2)
+    _, few = _dashboard_queries(logged_in, count_queries)
+
+    _add_projects(app, logged_in, 8)
+    response, many = _dashboard_queries(logged_in, count_queries)
+
+    assert many == few
+    # 1 tâche ouverte par projet (l'autre est terminée)
+    assert response.get_data(as_text=True).count("1 tâche ouverte") == 10
@@ -0,0 +1,73 @@
+# tests/test_export.py
+import csv
+import gzip
+import io
+import json
+
+from taskflow.export import TASK_EXPORT_COLUMNS, encode_csv
+from taskflow.models import Project
+
+
+def _seed(app, client):
+    client.post("/project/new", data={"name": "Chaîne", "description": "vidéos, \"shorts\""})
+    client.post("/project/new", data={"name": "Vide", "description": ""})
+    with app.app_context():
+        project_id = Project.query.filter_by(name="Chaîne").one().id
+    for title in ("Script", "Tournage, prise 2"):
+        client.post(f"/project/{project_id}/task/add", data={"title": title})
+
+
+def test_csv_export_is_streamed_with_a_header_row(app, logged_in):
+    _seed(app, logged_in)
+
+    response = logged_in.get("/export/tasks.csv")
+
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"].startswith('attachment; filename="taskflow-')
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == TASK_EXPORT_COLUMNS
+    by_title = {r[TASK_EXPORT_COLUMNS.index("title")]: r for r in rows[1:]}
+    assert set(by_title) == {"Script", "Tournage, prise 2", ""}  # projet vide : une ligne sans tâche
+    assert by_title["Script"][TASK_EXPORT_COLUMNS.index("project_description")] == 'vidéos, "shorts"'
+
+
+def test_jsonl_export_has_one_object_per_line(app, logged_in):
+    _seed(app, logged_in)
+
+    response = logged_in.get("/export/tasks.jsonl")
+
+    assert response.mimetype == "application/x-ndjson"
+    objects = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(objects) == 3
+    assert all(list(o) == TASK_EXPORT_COLUMNS for o in objects)
+    assert {o["title"] for o in objects} == {"Script", "Tournage, prise 2", None}
+
+
+def test_gzip_export_matches_the_plain_one(app, logged_in):
+    _seed(app, logged_in)
+
+    plain = logged_in.get("/export/tasks.csv").data
+    packed = logged_in.get("/export/tasks.csv?gzip=1")
+
+    assert packed.mimetype == "application/gzip"
+    assert packed.headers["Content-Disposition"].endswith('.csv.gz"')
+    assert gzip.decompress(packed.data) == plain
+
+
+def test_export_only_contains_the_users_rows(app, logged_in):
+    _seed(app, logged_in)
+    other = app.test_client()
+    other.post("/register", data={"name": "Autre", "email": "autre@example.test", "password": "secret1"})
+    other.post("/onboarding", data={"user_type": "creator"})
+
+    assert other.get("/export/tasks.csv").get_data(as_text=True).splitlines() == [",".join(TASK_EXPORT_COLUMNS)]
+    assert logged_in.get("/export/tasks.xml").status_code == 404
+
+
+def test_csv_is_yielded_in_chunks():
+    rows = [{"a": i, "b": None} for i in range(5)]
+    chunks = list(encode_csv(["a", "b"], rows, chunk_rows=2))
+    assert len(chunks) == 3
+    assert chunks[0] == "a,b\r\n0,\r\n1,\r\n"
+    assert "".join(chunks).count("\r\n") == 6
@@ -0,0 +1,27 @@
+# tests/test_feeds.py
+import pytest
+
+from taskflow.models import User
+
+
+@pytest.fixture
+def feed_url(app, logged_in):
+    logged_in.post("/profile/calendar-feed", data={"action": "rotate"})
+    with app.app_context():
+        token = User.query.one().feed_token
+    return f"/calendar/feed/{token}.ics"
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+def test_feed_304_repeats_the_200_validator(client, feed_url, accept_encoding):
+    headers = {"Accept-Encoding": accept_encoding}
+    with client.get(feed_url, headers=headers) as first:
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        first.get_data()
+
+    second = client.get(feed_url, headers={**headers, "If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert etag.startswith('W/"')
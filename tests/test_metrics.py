@@ -0,0 +1,79 @@
+# tests/test_metrics.py
+import threading
+
+import pytest
+
+from taskflow.pool import PoolStats, engine_options, set_statement_timeout, statement_timeout
+
+
+@pytest.fixture
+def metrics_client(app, client):
+    app.config["METRICS_TOKEN"] = "s3cret"
+    return client
+
+
+def test_pool_metrics_with_token(metrics_client):
+    response = metrics_client.get("/metrics/pool", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "checkouts" in response.get_json()
+
+
+@pytest.mark.parametrize("header", ["Bearer wrong", "Bearer sécret", "Bearer 🔑", ""])
+def test_pool_metrics_rejects_bad_tokens_with_404(metrics_client, header):
+    response = metrics_client.get("/metrics/pool", headers={"Authorization": header})
+    assert response.status_code == 404
+
+
+def test_pool_counters_are_thread_safe():
+    stats = PoolStats()
+
+    def checkout():
+        for _ in range(10000):
+            stats.incr("checkouts")
+
+    threads = [threading.Thread(target=checkout) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert stats.checkouts == 80000
+
+
+NEON_DIRECT = "postgresql://u:p@ep-calm-lab-123456.eu-central-1.aws.neon.tech/db"
+NEON_POOLED = "postgresql://u:p@ep-calm-lab-123456-pooler.eu-central-1.aws.neon.tech/db"
+
+
+@pytest.mark.parametrize("uri", [NEON_DIRECT, NEON_POOLED])
+def test_no_startup_options_for_poolers(uri):
+    assert "options" not in engine_options(uri)["connect_args"]
+
+
+def test_statement_timeout_per_endpoint():
+    assert statement_timeout(NEON_DIRECT) == 15000
+    assert statement_timeout(NEON_DIRECT, "dedicated", 5000) == 5000
+    assert statement_timeout(NEON_DIRECT, None, 0) is None
+    assert statement_timeout(NEON_POOLED) is None
+    assert statement_timeout(NEON_DIRECT, "pgbouncer-transaction") is None
+    assert statement_timeout("sqlite:///x.db") is None
+
+
+def test_statement_timeout_is_committed_on_the_connection():
+    statements = []
+
+    class Cursor:
+        def execute(self, sql):
+            statements.append(sql)
+
+        def close(self):
+            pass
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+        def commit(self):
+            statements.append("COMMIT")
+
+    set_statement_timeout(Connection(), 15000)
+    assert statements[-2:] == ["SET statement_timeout = 15000", "COMMIT"]
@@ -0,0 +1,26 @@
+# tests/test_migrations.py
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+
+from taskflow import db
+from taskflow.models import Task
+
+
+def test_owner_id_is_backfilled_from_the_project(app):
+    with app.app_context():
+        downgrade(revision="3ffbeffb5656")  # avant task.owner_id
+        db.session.execute(text(
+            "INSERT INTO user (id, email, name, password_hash, user_type) VALUES "
+            "(1, 'a@example.test', 'A', 'x', 'creator'), (2, 'b@example.test', 'B', 'x', 'general')"
+        ))
+        db.session.execute(text("INSERT INTO project (id, name, owner_id) VALUES (10, 'A1', 1), (20, 'B1', 2)"))
+        db.session.execute(text(
+            "INSERT INTO task (id, project_id, title, created_at) VALUES "
+            "(1, 10, 'a', '2026-01-01 10:00:00'), (2, 20, 'b', '2026-01-02 10:00:00'), (3, 10, 'c', NULL)"
+        ))
+        db.session.commit()
+
+        upgrade()
+
+        owners = dict(db.session.execute(db.select(Task.id, Task.owner_id)).all())
+        assert owners == {1: 1, 2: 2, 3: 1}
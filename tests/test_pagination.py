@@ -0,0 +1,82 @@
+# tests/test_pagination.py
+import base64
+import json
+import re
+from datetime import datetime
+
+import pytest
+
+from taskflow import db
+from taskflow.models import Project, Task
+from taskflow.pagination import PAGE_SIZE, decode_cursor, encode_cursor
+
+
+def _forge(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+COLUMNS = (Task.created_at, Task.priority, Task.id)
+
+
+def test_cursor_round_trip():
+    values = [datetime(2026, 10, 18, 9, 30), "high", 42]
+    assert decode_cursor(encode_cursor(values), COLUMNS) == values
+
+
+@pytest.mark.parametrize("values", [
+    ["2026-10-18T09:30:00", "high", "42"],        # id en texte
+    ["2026-10-18T09:30:00", "high", {"id": 1}],   # objet
+    ["2026-10-18T09:30:00", 3, 42],               # priorité numérique
+    [1700000000, "high", 42],                     # date en entier
+    ["2026-10-18T09:30:00", "high", True],        # booléen
+    ["pas une date", "high", 42],
+])
+def test_forged_cursor_is_rejected(values):
+    assert decode_cursor(_forge(values), COLUMNS) is None
+
+
+def test_forged_cursor_falls_back_to_first_page(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    logged_in.post(f"/project/{project_id}/task/add", data={"title": "première"})
+
+    forged = _forge(["2026-10-18T09:30:00", "'; DROP TABLE task; --"])
+    response = logged_in.get(f"/project/{project_id}/tasks?status=todo&cursor={forged}")
+
+    assert response.status_code == 200
+    assert "première" in response.get_json()["html"]
+
+
+def _add_content(app, stages):
+    """Contenus du compte de test : une tâche par étape de `stages` (dates distinctes)."""
+    with app.app_context():
+        project = Project.query.one()
+        base = datetime(2026, 1, 1)
+        for i, stage in enumerate(stages):
+            db.session.add(Task(
+                project_id=project.id, owner_id=project.owner_id, title=f"{stage}-{i}",
+                task_type="content", creator_stage=stage, created_at=base.replace(minute=i % 60, hour=i // 60),
+            ))
+        db.session.commit()
+
+
+def test_pipeline_first_pages_come_from_one_query(app, logged_in, count_queries):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    _add_content(app, ["to_film"] * (PAGE_SIZE + 5) + ["idea"] * 3 + [None] * 2 + ["oops"])
+
+    with count_queries() as queries:
+        response = logged_in.get("/creator/pipeline")
+    assert response.status_code == 200
+    assert sum(bool(re.search(r"\bFROM task\b", q)) for q in queries) == 1
+
+    html = response.get_data(as_text=True)
+    more = re.search(r'data-url="([^"]*stage=to_film[^"]*)"', html)
+    assert more and html.count('class="task-card"') == PAGE_SIZE + 3 + 3
+    assert "stage=idea" not in html
+
+    rest = logged_in.get(more.group(1).replace("&amp;", "&")).get_json()
+    assert rest["next_url"] is None
+    first = set(re.findall(r"to_film-\d+", html))
+    second = set(re.findall(r"to_film-\d+", rest["html"]))
+    assert len(first) == PAGE_SIZE and len(second) == 5 and not first & second
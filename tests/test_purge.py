@@ -0,0 +1,69 @@
+# tests/test_purge.py
+from sqlalchemy import inspect, text
+
+from taskflow import db
+from taskflow.models import Project, Task, TaskEvent, UserDailyStats
+from taskflow.rollup import backfill
+
+
+def _project_with_tasks(app, client, name, done, todo):
+    client.post("/project/new", data={"name": name, "description": ""})
+    with app.app_context():
+        project_id = Project.query.filter_by(name=name).one().id
+    for i in range(done + todo):
+        client.post(f"/project/{project_id}/task/add", data={"title": f"{name}mot{i}"})
+    with app.app_context():
+        ids = [t.id for t in Task.query.filter_by(project_id=project_id).order_by(Task.id)]
+    for task_id in ids[:done]:
+        client.post(f"/task/{task_id}/status/done")
+    return project_id, ids
+
+
+def _rollup():
+    return {
+        (r.user_id, r.day): (r.done_general, r.done_content)
+        for r in UserDailyStats.query
+        if r.done_general or r.done_content
+    }
+
+
+def _fts_hits(word):
+    if not inspect(db.engine).has_table("task_fts"):
+        return 0
+    db.session.execute(text("INSERT INTO task_fts(task_fts) VALUES ('integrity-check')"))
+    return db.session.execute(
+        text("SELECT count(*) FROM task_fts WHERE task_fts MATCH :w"), {"w": word}
+    ).scalar()
+
+
+def test_delete_project_leaves_no_orphans_and_a_consistent_rollup(app, logged_in):
+    gone, gone_ids = _project_with_tasks(app, logged_in, "alpha", done=3, todo=2)
+    _project_with_tasks(app, logged_in, "beta", done=2, todo=1)
+
+    logged_in.post(f"/project/{gone}/delete")
+
+    with app.app_context():
+        assert Task.query.filter(Task.id.in_(gone_ids)).count() == 0
+        assert TaskEvent.query.filter(TaskEvent.task_id.in_(gone_ids)).count() == 0
+        assert _fts_hits("alphamot0") == 0
+        assert _fts_hits("betamot0") == 1
+
+        rollup = _rollup()
+        assert sum(g + c for g, c in rollup.values()) == 2
+        backfill()
+        assert _rollup() == rollup
+
+
+def test_delete_account_leaves_no_orphans(app, logged_in):
+    _project_with_tasks(app, logged_in, "alpha", done=2, todo=2)
+    with app.app_context():
+        assert TaskEvent.query.count() and UserDailyStats.query.count()
+
+    logged_in.post("/profile/delete", data={"password": "secret1"})
+
+    with app.app_context():
+        assert Project.query.count() == 0
+        assert Task.query.count() == 0
+        assert TaskEvent.query.count() == 0
+        assert UserDailyStats.query.count() == 0
+        assert _fts_hits("alphamot0") == 0
@@ -0,0 +1,58 @@
+# tests/test_readmodels.py
+import re
+
+from taskflow import db
+from taskflow.models import Project, Task
+from taskflow.readmodels import EXCERPT_LENGTH, card_query, to_cards
+
+LONG = "Brief détaillé du client. " * 400  # ~10 Ko
+
+
+def _seed(app, client):
+    client.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project = Project.query.one()
+        db.session.add(Task(project_id=project.id, owner_id=project.owner_id, title="long", description=LONG))
+        db.session.add(Task(project_id=project.id, owner_id=project.owner_id, title="court", description="ok"))
+        db.session.commit()
+        return project.id
+
+
+def _bare_description(statements):
+    """Requêtes qui lisent task.description en entier (hors substr())."""
+    return [s for s in statements if re.search(r"(?<!substr\()\btask\.description\b", s)]
+
+
+def test_cards_carry_a_truncated_excerpt(app, logged_in):
+    _seed(app, logged_in)
+
+    with app.app_context():
+        cards = {c.title: c for c in to_cards(card_query().filter(Task.title.in_(["long", "court"])))}
+
+    assert cards["court"].excerpt == "ok"
+    assert cards["long"].excerpt.endswith("…")
+    assert len(cards["long"].excerpt) <= EXCERPT_LENGTH + 1
+
+
+def test_list_pages_never_load_full_descriptions(app, logged_in, count_queries):
+    project_id = _seed(app, logged_in)
+
+    for url in (f"/project/{project_id}", "/search?q=long", "/today", "/creator"):
+        with count_queries() as queries:
+            page = logged_in.get(url).get_data(as_text=True)
+        assert LONG not in page, url
+        assert _bare_description(queries) == [], url
+
+    with count_queries() as queries:
+        page = logged_in.get(f"/project/{project_id}").get_data(as_text=True)
+    assert "Brief détaillé du client." in page  # l'aperçu est bien affiché
+    assert any("substr(task.description" in q for q in queries)
+
+
+def test_description_is_deferred_on_the_model(app, logged_in):
+    _seed(app, logged_in)
+
+    with app.app_context():
+        task = Task.query.filter_by(title="long").one()
+        assert "description" not in task.__dict__
+        assert task.description == LONG  # chargé à la demande (détail, édition)
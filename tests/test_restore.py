@@ -0,0 +1,94 @@
+# tests/test_restore.py
+from datetime import datetime, timedelta
+
+from taskflow.cache import SQLiteCache, view_cache
+from taskflow.events import completion_histogram
+from taskflow.models import Task, TaskEvent, UserDailyStats
+from taskflow.restore import restore
+
+# Format de backup_taskflow.sql : pas de task.owner_id / completed_at, pas de task_event
+USER_COLUMNS = "id, email, name, password_hash, created_at, user_type, onboarding_done"
+TASK_COLUMNS = (
+    "id, project_id, title, description, status, priority, task_type, platform, "
+    "creator_stage, assigned_to, due_date, created_at, updated_at"
+)
+
+
+def _old_dump(path, done, todo):
+    now = datetime.utcnow().replace(microsecond=0)
+    lines = [
+        f'COPY public."user" ({USER_COLUMNS}) FROM stdin;',
+        f"1\tu@example.test\tU\tx\t{now - timedelta(days=90)}\tcreator\tt",
+        "\\.",
+        "COPY public.project (id, name, description, created_at, owner_id) FROM stdin;",
+        f"1\tP\t\\N\t{now - timedelta(days=90)}\t1",
+        "\\.",
+        f"COPY public.task ({TASK_COLUMNS}) FROM stdin;",
+    ]
+    for i in range(done + todo):
+        status = "done" if i < done else "todo"
+        updated = now - timedelta(days=i % 60, hours=i % 24)
+        lines.append(
+            f"{i + 1}\t1\tT{i}\t\\N\t{status}\tmedium\tgeneral\t\\N\t\\N\t\\N\t\\N\t"
+            f"{updated - timedelta(days=1)}\t{updated}"
+        )
+    lines.append("\\.")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_restore_of_old_dump_seeds_task_event(app, tmp_path):
+    dump = _old_dump(tmp_path / "old.sql", done=529, todo=40)
+
+    with app.app_context():
+        loaded = restore(str(dump), echo=lambda *_: None)
+        assert loaded["task"] == 569
+
+        events = TaskEvent.query.all()
+        assert len(events) == 529
+        done_at = {t.id: t.completed_at for t in Task.query.filter_by(status="done")}
+        assert all(e.to_status == "done" and e.at == done_at[e.task_id] for e in events)
+        assert UserDailyStats.query.count() > 0
+
+        by_day, by_hour = completion_histogram(1, datetime.utcnow() - timedelta(days=365))
+        assert sum(by_day.values()) == sum(by_hour.values()) == 529
+
+
+def test_restore_replace_twice_does_not_duplicate_events(app, tmp_path):
+    dump = _old_dump(tmp_path / "old.sql", done=10, todo=5)
+
+    with app.app_context():
+        restore(str(dump), echo=lambda *_: None)
+        restore(str(dump), replace=True, echo=lambda *_: None)
+
+        assert TaskEvent.query.count() == 10
+        by_day, _ = completion_histogram(1, datetime.utcnow() - timedelta(days=365))
+        assert sum(by_day.values()) == 10
+
+
+def test_restore_fills_null_created_at_from_updated_at(app, tmp_path):
+    dump = _old_dump(tmp_path / "old.sql", done=0, todo=2)
+    lines = dump.read_text(encoding="utf-8").splitlines()
+    row = next(i for i, line in enumerate(lines) if line.startswith("1\t1\tT0\t"))
+    fields = lines[row].split("\t")
+    fields[11] = "\\N"
+    lines[row] = "\t".join(fields)
+    dump.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with app.app_context():
+        restore(str(dump), echo=lambda *_: None)
+        task = Task.query.get(1)
+        assert task.created_at == task.updated_at
+
+
+def test_restore_command_invalidates_cached_pages(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(view_cache, "backend", SQLiteCache(str(tmp_path / "cache.sqlite")))
+    before = view_cache.user_version(1), view_cache.account_version(1)
+    dump = _old_dump(tmp_path / "old.sql", done=3, todo=2)
+
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=["restore", str(dump)])
+
+    assert result.exit_code == 0, result.output
+    assert view_cache.user_version(1) > before[0]
+    assert view_cache.account_version(1) > before[1]
@@ -0,0 +1,84 @@
+# tests/test_search.py
+import html
+import re
+
+from flask_migrate import downgrade, upgrade
+
+from taskflow import db
+from taskflow.models import Project, Task
+from taskflow.search import SEARCH_PER_PAGE, search_backend, search_tasks
+
+
+def _seed(app, client, tasks=(), projects=()):
+    """Projet "Base" + tâches (titre, description) + projets supplémentaires ; retourne owner_id."""
+    client.post("/project/new", data={"name": "Base", "description": ""})
+    with app.app_context():
+        base = Project.query.filter_by(name="Base").one()
+        owner_id = base.owner_id
+        for title, description in tasks:
+            db.session.add(Task(project_id=base.id, owner_id=owner_id, title=title, description=description))
+        for name in projects:
+            db.session.add(Project(name=name, owner_id=owner_id))
+        db.session.commit()
+    return owner_id
+
+
+def _more_url(page, path):
+    match = re.search(rf'data-url="({re.escape(path)}[^"]*)"', page)
+    return html.unescape(match.group(1)) if match else None
+
+
+def test_title_match_ranks_above_description_match(app, logged_in):
+    owner_id = _seed(app, logged_in, tasks=[
+        ("Notes", "montage, montage et re-montage"),
+        ("Montage de la vidéo de présentation du produit pour le client", None),
+    ])
+
+    with app.app_context():
+        assert search_backend() == "fts5"
+        cards, total, _ = search_tasks(owner_id, "montage")
+    assert total == 2
+    assert cards[0].title.startswith("Montage")
+
+
+def test_like_fallback_matches_inside_words(app, logged_in, monkeypatch):
+    owner_id = _seed(app, logged_in, tasks=[("Tournage plage", None), ("Courses", None)])
+    monkeypatch.setattr("taskflow.search.search_backend", lambda: "like")
+
+    with app.app_context():
+        cards, total, _ = search_tasks(owner_id, "ournag")
+    assert total == 1 and cards[0].title == "Tournage plage"
+
+
+def test_backend_switches_to_fts_once_migrated_without_restart(app):
+    with app.app_context():
+        downgrade(revision="4d78e3146141")
+        assert search_backend() == "like"
+        upgrade()
+        assert search_backend() == "fts5"
+
+
+def test_search_pages_tasks_and_projects_with_cursors(app, logged_in):
+    extra = 5
+    _seed(
+        app, logged_in,
+        tasks=[(f"clip {i}", None) for i in range(SEARCH_PER_PAGE + extra)],
+        projects=[f"clip projet {i}" for i in range(SEARCH_PER_PAGE + extra)],
+    )
+
+    page = logged_in.get("/search?q=clip").get_data(as_text=True)
+    assert f"{SEARCH_PER_PAGE + extra} tâches" in page
+    assert f"{SEARCH_PER_PAGE + extra} projets" in page
+    first_tasks = set(re.findall(r"clip \d+\b", page))
+    first_projects = set(re.findall(r"clip projet \d+", page))
+    assert len(first_projects) == SEARCH_PER_PAGE
+
+    tasks_more = logged_in.get(_more_url(page, "/search/more")).get_json()
+    assert tasks_more["next_url"] is None
+    more_tasks = set(re.findall(r"clip \d+\b", "".join(tasks_more["html"].values())))
+    assert len(more_tasks) == extra and not more_tasks & first_tasks
+
+    projects_more = logged_in.get(_more_url(page, "/search/projects/more")).get_json()
+    assert projects_more["next_url"] is None
+    more_projects = set(re.findall(r"clip projet \d+", projects_more["html"]))
+    assert len(more_projects) == extra and not more_projects & first_projects
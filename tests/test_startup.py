@@ -0,0 +1,41 @@
+# tests/test_startup.py
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+from taskflow import create_app
+from taskflow.config import Config
+
+
+def test_create_app_opens_no_connection_and_leaves_the_schema_alone(tmp_path, monkeypatch):
+    path = tmp_path / "fresh.db"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{path}")
+    connects = []
+
+    def record(dbapi_conn, record):
+        connects.append(dbapi_conn)
+
+    event.listen(Pool, "connect", record)
+    try:
+        create_app()
+    finally:
+        event.remove(Pool, "connect", record)
+
+    # pas de db upgrade caché : c'est `flask db upgrade` qui crée le schéma
+    assert connects == []
+    assert not path.exists() or sqlite3.connect(path).execute(
+        "SELECT count(*) FROM sqlite_master"
+    ).fetchone()[0] == 0
+
+
+def test_startup_bench_measures_fresh_workers(app, tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=["startup-bench", "--workers", "1"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].split() == ["worker", "import_ms", "create_app_ms", "first_request_ms"]
+    assert lines[1].split()[0] == "1" and "HTTP" not in lines[1]
+    assert lines[-1].startswith("médiane")
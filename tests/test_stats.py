@@ -0,0 +1,124 @@
+# tests/test_stats.py
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from taskflow import db
+from taskflow.events import completion_histogram
+from taskflow.models import Project, Task, TaskEvent, UserDailyStats
+from taskflow.rollup import backfill, set_task_type
+from taskflow.stats import get_task_stats
+
+
+def test_done_counters_follow_completed_at_not_updated_at(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    logged_in.post(f"/project/{project_id}/task/add", data={"title": "vieille tâche"})
+    with app.app_context():
+        task = Task.query.one()
+        task_id, owner_id = task.id, task.owner_id
+    logged_in.post(f"/task/{task_id}/status/done")
+
+    # terminée il y a 40 jours, puis retouchée aujourd'hui (updated_at bouge, pas completed_at)
+    with app.app_context():
+        db.session.get(Task, task_id).completed_at = datetime.utcnow() - timedelta(days=40)
+        db.session.commit()
+    logged_in.post(f"/task/{task_id}/edit", data={"title": "titre corrigé"})
+
+    with app.app_context():
+        stats = get_task_stats(owner_id, date.today())
+    assert stats.done_week == 0
+    assert stats.done_month == 0
+
+
+def test_histogram_counts_tasks_still_done_once(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    for title in ("deux fois", "rouverte", "supprimée", "terminée"):
+        logged_in.post(f"/project/{project_id}/task/add", data={"title": title})
+    with app.app_context():
+        ids = {t.title: t.id for t in Task.query.all()}
+        owner_id = Task.query.first().owner_id
+
+    for title in ids:
+        logged_in.post(f"/task/{ids[title]}/status/done")
+    logged_in.post(f"/task/{ids['deux fois']}/status/todo")
+    logged_in.post(f"/task/{ids['deux fois']}/status/done")
+    logged_in.post(f"/task/{ids['rouverte']}/status/todo")
+    logged_in.post(f"/task/{ids['supprimée']}/delete")
+
+    with app.app_context():
+        by_day, by_hour = completion_histogram(owner_id, datetime.utcnow() - timedelta(days=365))
+        stats = get_task_stats(owner_id, date.today())
+    assert sum(by_day.values()) == sum(by_hour.values()) == 2
+    assert stats.done_week == 2
+
+
+def _rollup(owner_id):
+    return {(r.day, r.done_general, r.done_content) for r in UserDailyStats.query.filter_by(user_id=owner_id)}
+
+
+def test_rollup_upserts_on_status_toggle_and_matches_backfill(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    for title in ("a", "b"):
+        logged_in.post(f"/project/{project_id}/task/add", data={"title": title})
+    with app.app_context():
+        ids = {t.title: t.id for t in Task.query.all()}
+        owner_id = Task.query.first().owner_id
+    today = date.today()
+
+    logged_in.post(f"/task/{ids['a']}/status/done")
+    logged_in.post(f"/task/{ids['b']}/status/done")
+    with app.app_context():
+        assert _rollup(owner_id) == {(today, 2, 0)}  # une ligne par jour, mise à jour en place
+
+    logged_in.post(f"/task/{ids['a']}/status/todo")
+    logged_in.post(f"/task/{ids['a']}/status/done")
+    logged_in.post(f"/task/{ids['b']}/status/todo")
+    with app.app_context():
+        assert _rollup(owner_id) == {(today, 1, 0)}
+
+        set_task_type(db.session.get(Task, ids["a"]), "content")
+        db.session.commit()
+        assert _rollup(owner_id) == {(today, 0, 1)}
+
+        incremental = _rollup(owner_id)
+        backfill(owner_id)
+        db.session.commit()
+        assert _rollup(owner_id) == incremental
+
+
+def test_histogram_groups_by_weekday_and_hour_in_sql(app, logged_in):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    monday = date.today() - timedelta(days=date.today().weekday() + 21)
+    done_at = [
+        datetime.combine(monday, datetime.min.time()) + offset
+        for offset in (
+            timedelta(days=-1, hours=10),            # dimanche 10h
+            timedelta(hours=10, minutes=30),         # lundi 10h
+            timedelta(days=2, hours=8),              # mercredi 8h
+            timedelta(days=7, hours=23, minutes=59),  # lundi 23h
+        )
+    ]
+    with app.app_context():
+        project = Project.query.one()
+        for n, at in enumerate(done_at):
+            task = Task(project_id=project.id, owner_id=project.owner_id, title=f"t{n}", status="done", completed_at=at)
+            db.session.add(task)
+            db.session.flush()
+            db.session.add(TaskEvent(task_id=task.id, owner_id=task.owner_id, kind="status",
+                                     from_status="todo", to_status="done", at=at))
+        db.session.commit()
+
+        by_day, by_hour = completion_histogram(project.owner_id, datetime.utcnow() - timedelta(days=365))
+
+    assert by_day == Counter(at.weekday() for at in done_at) == {6: 1, 0: 2, 2: 1}
+    assert list(by_day) == [6, 0, 2]  # ordre de 1re occurrence : départage des ex aequo
+    assert by_hour == Counter(at.hour for at in done_at)
+
+    page = logged_in.get("/analytics").get_data(as_text=True)
+    assert "le lundi (2 tâche(s)" in page
+    assert "entre 10h et 11h" in page
@@ -0,0 +1,35 @@
+# tests/test_templating.py
+from taskflow import create_app
+from taskflow.config import Config
+from taskflow.templating import compile_report
+
+
+def _app(tmp_path, monkeypatch, warmup):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, "TEMPLATE_CACHE_DIR", str(tmp_path / "jinja"))
+    monkeypatch.setattr(Config, "TEMPLATE_WARMUP", warmup)
+    return create_app()
+
+
+def test_warmup_compiles_every_template_into_the_bytecode_cache(tmp_path, monkeypatch):
+    app = _app(tmp_path, monkeypatch, warmup=True)
+
+    html = app.jinja_env.list_templates(filter_func=lambda name: name.endswith(".html"))
+    assert {"base.html", "dashboard.html", "partials/task_drawer.html"} <= set(html)
+    assert len(app.jinja_env.cache) >= len(html)  # déjà en mémoire avant la 1re requête
+    assert len(list((tmp_path / "jinja").iterdir())) >= len(html)
+
+
+def test_no_warmup_compiles_lazily(tmp_path, monkeypatch):
+    app = _app(tmp_path, monkeypatch, warmup=False)
+    assert len(app.jinja_env.cache) == 0
+    assert list((tmp_path / "jinja").iterdir()) == []
+
+
+def test_compile_report_measures_source_and_bytecode(tmp_path, monkeypatch):
+    app = _app(tmp_path, monkeypatch, warmup=False)
+
+    rows = {name: (size, compile_ms, bytecode_ms) for name, size, compile_ms, bytecode_ms in compile_report(app.jinja_env)}
+
+    size, compile_ms, bytecode_ms = rows["base.html"]
+    assert size > 0 and compile_ms > 0 and bytecode_ms is not None
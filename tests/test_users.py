@@ -0,0 +1,69 @@
+# tests/test_users.py
+import pytest
+
+from taskflow import db, users
+from taskflow.cache import MemoryCache, view_cache
+from taskflow.models import Project, Task, User
+from taskflow.users import forget_user
+
+
+@pytest.fixture
+def memory_cache(app, monkeypatch):
+    monkeypatch.setattr(view_cache, "backend", MemoryCache())
+    monkeypatch.setattr(users, "_snapshots", MemoryCache())
+
+
+def _user_selects(queries):
+    return [q for q in queries if 'FROM user' in q.replace('"', "")]
+
+
+def test_task_writes_keep_the_user_snapshot(app, memory_cache, logged_in, count_queries):
+    logged_in.post("/project/new", data={"name": "P", "description": ""})
+    with app.app_context():
+        project_id = Project.query.one().id
+    logged_in.post(f"/project/{project_id}/task/add", data={"title": "à déplacer"})
+    with app.app_context():
+        task_id = Task.query.one().id
+    logged_in.get("/dashboard")
+
+    for day in ("2026-10-20", "2026-10-21", "2026-10-22"):
+        with count_queries() as queries:
+            response = logged_in.post(f"/task/{task_id}/move_date", json={"due_date": day})
+        assert response.status_code == 200
+        assert _user_selects(queries) == []
+
+
+def test_account_change_reloads_the_user(memory_cache, logged_in, count_queries):
+    logged_in.get("/dashboard")
+    logged_in.post("/profile", data={"name": "Nouveau nom", "email": "test@example.test"})
+
+    with count_queries() as queries:
+        response = logged_in.get("/dashboard")
+    assert len(_user_selects(queries)) == 1
+    assert "Nouveau nom" in response.get_data(as_text=True)
+
+
+def test_account_change_from_another_worker_invalidates_the_snapshot(app, memory_cache, logged_in):
+    logged_in.get("/dashboard")  # snapshot en cache dans ce worker
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.test").one()
+        user.name = "Renommé ailleurs"
+        db.session.commit()
+        user_id = user.id
+
+    # sans bump de la version du compte, ce worker garde son snapshot
+    assert "Renommé ailleurs" not in logged_in.get("/dashboard").get_data(as_text=True)
+
+    # l'autre worker ne vide que son propre _snapshots, mais la version est partagée
+    with app.app_context():
+        forget_user(user_id)
+    assert "Renommé ailleurs" in logged_in.get("/dashboard").get_data(as_text=True)
+
+
+def test_deleted_account_is_logged_out(memory_cache, logged_in):
+    logged_in.get("/dashboard")
+    logged_in.post("/profile/delete", data={"password": "secret1"})
+
+    response = logged_in.get("/dashboard")
+    assert response.status_code == 302
+    assert "/login" in response.headers["Location"]